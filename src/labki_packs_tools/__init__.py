@@ -1,7 +1,19 @@
-from .utils import UniqueKeyLoader, load_json, load_yaml
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .utils import UniqueKeyLoader, load_json, load_yaml
 
 __all__ = [
     "UniqueKeyLoader",
     "load_json",
     "load_yaml",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # imported on first use, so the CLI starts without loading yaml
+    if name in __all__:
+        from . import utils
+
+        return getattr(utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
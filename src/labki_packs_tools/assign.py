@@ -0,0 +1,176 @@
+"""
+Rule-based assignment of pages to packs.
+
+Rules are read from a YAML file and evaluated in order; the first matching
+rule decides the target pack. Each rule has a ``pack`` and exactly one selector:
+
+.. code-block:: yaml
+
+    rules:
+      - pack: publication
+        title: "Template:Publication*"   # fnmatch-style glob on the full title
+      - pack: help
+        regex: "^Help:(Getting|Using)"   # regular expression, matched from the start
+      - pack: forms
+        namespace: Form                  # namespace prefix ("Main" for no prefix)
+      - pack: meeting_notes
+        category: Meeting                # [[Category:...]] link in the page content
+
+All rules are compiled into a single `PackMatcher`: namespace and category
+rules become dictionary lookups, and title/regex rules are merged into one
+alternation per literal namespace prefix, so matching a page costs a few
+hash lookups and at most two regex searches regardless of the number of rules.
+Patterns with groups (whose numbers and names would clash in the alternation)
+or global inline flags such as ``(?i)`` are matched on their own, in rule order.
+"""
+
+from __future__ import annotations
+
+import re
+from fnmatch import translate
+from pathlib import Path
+from typing import Iterable
+
+from pydantic import BaseModel, Field, model_validator
+
+from labki_packs_tools.utils import load_yaml
+
+CATEGORY_LINK_RE = re.compile(r"\[\[\s*Category\s*:\s*([^\]|#]+)", re.IGNORECASE)
+_GLOB_CHARS = re.compile(r"[*?\[]")
+_SELECTORS = ("title", "regex", "namespace", "category")
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def page_namespace(title: str) -> str:
+    """Namespace of a page title, ``"Main"`` for titles without a prefix."""
+    return title.split(":", 1)[0] if ":" in title else "Main"
+
+
+def _normalize_category(name: str) -> str:
+    return " ".join(name.replace("_", " ").split())
+
+
+def page_categories(content: str | None) -> list[str]:
+    """Category names linked from wikitext content, normalized, in order of appearance."""
+    if not content:
+        return []
+    return [_normalize_category(m) for m in CATEGORY_LINK_RE.findall(content)]
+
+
+class AssignmentRule(BaseModel):
+    pack: str
+    title: str | None = None
+    regex: str | None = None
+    namespace: str | None = None
+    category: str | None = None
+
+    @model_validator(mode="after")
+    def _one_selector(self) -> AssignmentRule:
+        given = [s for s in _SELECTORS if getattr(self, s) is not None]
+        if len(given) != 1:
+            raise ValueError(
+                f"Rule for pack '{self.pack}' must have exactly one of "
+                f"{', '.join(_SELECTORS)} (got {', '.join(given) or 'none'})"
+            )
+        return self
+
+
+class AssignmentRules(BaseModel):
+    rules: list[AssignmentRule] = Field(default_factory=list)
+
+    @classmethod
+    def from_yaml(cls, path: Path | str) -> AssignmentRules:
+        data = load_yaml(Path(path))
+        if isinstance(data, list):
+            data = {"rules": data}
+        return cls(**(data or {}))
+
+    def compile(self) -> PackMatcher:
+        return PackMatcher(self.rules)
+
+
+class PackMatcher:
+    """
+    Compiled form of an ordered list of `AssignmentRule` objects.
+
+    ``match`` returns the pack of the first rule (in file order) that applies.
+    """
+
+    def __init__(self, rules: Iterable[AssignmentRule]):
+        self.rules: list[AssignmentRule] = list(rules)
+        self._by_namespace: dict[str, int] = {}
+        self._by_category: dict[str, int] = {}
+        bucketed: dict[str | None, list[tuple[int, str]]] = {}
+        # patterns that cannot be merged into an alternation, by rule index
+        self._separate: list[tuple[int, re.Pattern]] = []
+
+        for idx, rule in enumerate(self.rules):
+            if rule.namespace is not None:
+                self._by_namespace.setdefault(rule.namespace, idx)
+                continue
+            if rule.category is not None:
+                self._by_category.setdefault(_normalize_category(rule.category), idx)
+                continue
+            if rule.title is not None:
+                bucket, pattern = _literal_namespace(rule.title), translate(rule.title)
+            else:
+                bucket, pattern = None, rule.regex
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regex for pack '{rule.pack}': {e}") from e
+            if compiled.groups or compiled.flags != _DEFAULT_FLAGS:
+                self._separate.append((idx, compiled))
+            else:
+                bucketed.setdefault(bucket, []).append((idx, f"(?:{pattern})"))
+
+        # one alternation per namespace bucket; the wrapper group of each rule
+        # closes last, so ``lastgroup`` names the first rule that matched
+        self._title_res: dict[str | None, re.Pattern] = {
+            ns: re.compile("|".join(f"(?P<r{idx}>{pattern})" for idx, pattern in entries))
+            for ns, entries in bucketed.items()
+        }
+
+    @property
+    def packs(self) -> set[str]:
+        """All packs targeted by at least one rule."""
+        return {rule.pack for rule in self.rules}
+
+    def match(self, title: str, content: str | None = None) -> str | None:
+        """Return the target pack for a page, or ``None`` if no rule applies."""
+        namespace = page_namespace(title)
+        candidates: list[int] = []
+
+        if namespace in self._by_namespace:
+            candidates.append(self._by_namespace[namespace])
+        if self._by_category:
+            candidates.extend(
+                self._by_category[c] for c in page_categories(content) if c in self._by_category
+            )
+        for bucket in (namespace, None):
+            pattern = self._title_res.get(bucket)
+            if pattern is None:
+                continue
+            m = pattern.match(title)
+            if m is not None:
+                candidates.append(int(m.lastgroup[1:]))
+
+        first = min(candidates, default=len(self.rules))
+        for idx, pattern in self._separate:
+            if idx >= first:
+                break
+            if pattern.match(title):
+                first = idx
+                break
+
+        if first == len(self.rules):
+            return None
+        return self.rules[first].pack
+
+
+def _literal_namespace(glob: str) -> str | None:
+    """The namespace of a title glob if it is spelled out literally, e.g. ``Template:*``."""
+    if ":" not in glob:
+        return None
+    prefix = glob.split(":", 1)[0]
+    return None if _GLOB_CHARS.search(prefix) else prefix
@@ -0,0 +1,213 @@
+"""
+Build one distributable archive per pack.
+
+Each bundle is a zip file holding the pack's page files (at their
+repository-relative paths) and a ``manifest.yml`` sub-manifest restricted to
+that pack and its pages.
+
+Bundles are:
+
+- reproducible: entries are sorted and written with fixed timestamps and
+  permissions, so the same inputs always give the same bytes
+- content-addressed: the file name contains a digest of the sub-manifest and
+  page contents, and bundles whose file already exists are not rebuilt
+- built in parallel: archives are compressed in a process pool; every page
+  file is hashed once in the parent, even if several packs share it, and
+  read again by the worker that writes it, so only paths are sent to workers
+
+Page files must be relative paths inside the repository: they become archive
+member names, so ``..`` or absolute paths would escape the extraction directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Iterable
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+import yaml
+
+from labki_packs_tools.checksum import CHECKSUM_PREFIX, file_checksum
+from labki_packs_tools.utils import load_yaml
+
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+"""Timestamp used for every archive member (the earliest one zip supports)"""
+
+DIGEST_LENGTH = 16
+
+Member = tuple[str, bytes | Path]
+"""Archive member name and its data, or the file to read it from"""
+
+
+@dataclass
+class BundleResult:
+    pack: str
+    path: Path
+    digest: str
+    built: bool
+    """False if an identical bundle already existed and was kept"""
+
+
+@dataclass
+class _BundlePlan:
+    pack: str
+    path: Path
+    digest: str
+    members: list[Member]
+
+
+def sub_manifest(manifest: dict, pack_id: str) -> dict:
+    """
+    The manifest restricted to one pack and the pages it lists.
+
+    The top-level ``last_updated`` is left out: every ingest sets it, and it
+    would change the digest of every bundle (the pages keep their own).
+    """
+    pack = manifest["packs"][pack_id]
+    pages = manifest.get("pages") or {}
+    sub = {k: v for k, v in manifest.items() if k not in ("pages", "packs", "last_updated")}
+    sub["pages"] = {title: pages[title] for title in pack.get("pages") or []}
+    sub["packs"] = {pack_id: pack}
+    return sub
+
+
+def plan_bundles(
+    manifest_path: Path, out_dir: Path, pack_ids: Iterable[str] | None = None
+) -> list[_BundlePlan]:
+    """
+    Hash page files (once each) and compute the archive contents and name for every pack.
+
+    Raises:
+        KeyError: For unknown packs or pages.
+        FileNotFoundError: If a page file is missing.
+        ValueError: If a page file is not a relative path inside the repository.
+    """
+    manifest = load_yaml(manifest_path)
+    repo_dir = manifest_path.parent
+    packs = manifest.get("packs") or {}
+    pages = manifest.get("pages") or {}
+    pack_ids = list(packs) if pack_ids is None else list(pack_ids)
+
+    hashes: dict[str, str] = {}
+    plans = []
+    for pack_id in pack_ids:
+        if pack_id not in packs:
+            raise KeyError(f"Unknown pack: {pack_id}")
+        sub = sub_manifest(manifest, pack_id)
+        manifest_bytes = yaml.safe_dump(sub, sort_keys=False, allow_unicode=True).encode("utf-8")
+
+        files = []
+        for title in packs[pack_id].get("pages") or []:
+            if title not in pages:
+                raise KeyError(f"Pack '{pack_id}' references unknown page title: {title}")
+            rel = _member_name(repo_dir, pages[title].get("file"), title)
+            if rel not in hashes:
+                path = repo_dir / rel
+                if not path.is_file():
+                    raise FileNotFoundError(f"Page file not found: {rel} (for {title})")
+                hashes[rel] = file_checksum(path).removeprefix(CHECKSUM_PREFIX)
+            files.append(rel)
+
+        members: list[Member] = [("manifest.yml", manifest_bytes)]
+        members += [(rel, repo_dir / rel) for rel in files]
+        members.sort(key=lambda member: member[0])
+        digest = hashlib.sha256(manifest_bytes)
+        for rel in sorted(set(files)):
+            digest.update(f"\0{rel}\0{hashes[rel]}".encode())
+        digest_hex = digest.hexdigest()[:DIGEST_LENGTH]
+
+        version = packs[pack_id].get("version", "0.0.0")
+        path = out_dir / f"{pack_id}-{version}-{digest_hex}.zip"
+        plans.append(_BundlePlan(pack_id, path, digest_hex, _dedupe(members)))
+    return plans
+
+
+def _member_name(repo_dir: Path, file: object, title: str) -> str:
+    """The page file as a normalized archive member name, if it stays inside the repository."""
+    if not isinstance(file, str) or not file:
+        raise ValueError(f"Page '{title}' has no file")
+    posix, windows = PurePosixPath(file), PureWindowsPath(file)
+    if posix.is_absolute() or windows.anchor or ".." in posix.parts + windows.parts:
+        raise ValueError(f"Page file of '{title}' is not a path inside the repository: {file}")
+    # symlinks may point anywhere
+    root = repo_dir.resolve()
+    if not (root / posix).resolve().is_relative_to(root):
+        raise ValueError(f"Page file of '{title}' is outside the repository: {file}")
+    return posix.as_posix()
+
+
+def _dedupe(members: list[Member]) -> list[Member]:
+    seen: set[str] = set()
+    unique = []
+    for name, data in members:
+        if name not in seen:
+            seen.add(name)
+            unique.append((name, data))
+    return unique
+
+
+def write_bundle(path: Path, members: list[Member]) -> Path:
+    """
+    Write a reproducible zip archive, atomically replacing ``path``.
+
+    Members given as a `Path` are read here, so worker processes read their own files.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with ZipFile(tmp, "w") as zf:
+        for name, data in members:
+            info = ZipInfo(name, date_time=ZIP_EPOCH)
+            info.compress_type = ZIP_DEFLATED
+            info.create_system = 3
+            info.external_attr = 0o100644 << 16
+            if isinstance(data, Path):
+                data = data.read_bytes()
+            zf.writestr(info, data, compresslevel=9)
+    os.replace(tmp, path)
+    return path
+
+
+def build_bundles(
+    manifest_path: Path | str,
+    out_dir: Path | str,
+    pack_ids: Iterable[str] | None = None,
+    *,
+    jobs: int | None = None,
+    force: bool = False,
+) -> list[BundleResult]:
+    """
+    Build bundles for the given packs (default: all packs).
+
+    Args:
+        manifest_path: Path to ``manifest.yml``.
+        out_dir: Directory the archives are written to.
+        pack_ids: Packs to bundle, in manifest order by default.
+        jobs: Number of worker processes (default: CPU count, ``1`` builds in-process).
+        force: Rebuild bundles even if an identical archive already exists.
+
+    Returns:
+        One `BundleResult` per pack, in the order requested.
+    """
+    manifest_path = Path(manifest_path)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    plans = plan_bundles(manifest_path, out_dir, pack_ids)
+    todo = [plan for plan in plans if force or not plan.path.exists()]
+
+    if todo:
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1 or len(todo) == 1:
+            for plan in todo:
+                write_bundle(plan.path, plan.members)
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+                futures = [pool.submit(write_bundle, p.path, p.members) for p in todo]
+                for future in futures:
+                    future.result()
+
+    rebuilt = {plan.pack for plan in todo}
+    return [BundleResult(p.pack, p.path, p.digest, p.pack in rebuilt) for p in plans]
@@ -0,0 +1,131 @@
+"""
+Content checksums of page files.
+
+A page's optional ``checksum`` in the manifest (``sha256:`` followed by the
+hex digest of its file) records the content the manifest was last updated
+for, so a file edited without updating the manifest can be detected (see
+`PageChecksumValidator`). Checksums are written by ``labki ingest`` and
+``labki hash``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from labki_packs_tools.utils import update_yaml
+
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.cache import ValidationCache
+
+CHECKSUM_PREFIX = "sha256:"
+
+CACHE_NAMESPACE = "checksum"
+
+CHUNK_SIZE = 1 << 20
+"""Bytes read (and hashed) at a time"""
+
+
+@dataclass
+class ChecksumUpdate:
+    title: str
+    file: str
+    old: str | None
+    new: str
+
+
+def file_checksum(path: Path | str) -> str:
+    """
+    Checksum of a file's content, as recorded in the manifest.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return CHECKSUM_PREFIX + digest.hexdigest()
+
+
+def cached_checksum(path: Path, signature: list[int], cache: ValidationCache | None) -> str:
+    """
+    `file_checksum`, kept in the validation cache by path and stat signature
+    (``[mtime_ns, size]``), so files that did not change are not read again.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if cache is None:
+        return file_checksum(path)
+    return cache.memoize(CACHE_NAMESPACE, [str(path), signature], lambda: file_checksum(path))
+
+
+def _checksum_or_none(path: Path) -> str | None:
+    try:
+        return file_checksum(path)
+    except OSError:
+        return None
+
+
+def hash_files(paths: Iterable[Path], *, jobs: int | None = None) -> dict[Path, str | None]:
+    """
+    Checksums of many files (``None`` for files that cannot be read).
+
+    Files are hashed on ``jobs`` threads (default: number of CPUs); hashlib
+    releases the GIL while hashing, so threads run in parallel without the
+    cost of sending file contents to other processes.
+    """
+    paths = list(dict.fromkeys(paths))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        return {path: _checksum_or_none(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return dict(zip(paths, pool.map(_checksum_or_none, paths)))
+
+
+def update_checksums(
+    manifest_path: Path | str, *, jobs: int | None = None, write: bool = True
+) -> list[ChecksumUpdate]:
+    """
+    Record the checksum of every page file in a manifest.
+
+    Args:
+        manifest_path: Path to ``manifest.yml``.
+        jobs: Number of threads hashing files (default: number of CPUs).
+        write: Write the updated manifest; if False, only report what would change.
+
+    Returns:
+        The pages whose checksum was missing or out of date, in manifest order.
+
+    Raises:
+        FileNotFoundError: If a page file is missing.
+    """
+    from labki_packs_tools.manifest import Manifest
+
+    manifest_path = Path(manifest_path)
+    repo_dir = manifest_path.parent
+    manifest = Manifest.from_yaml(manifest_path)
+
+    paths = {title: repo_dir / page.file for title, page in manifest.pages.items()}
+    checksums = hash_files(paths.values(), jobs=jobs)
+
+    updates = []
+    for title, page in manifest.pages.items():
+        checksum = checksums[paths[title]]
+        if checksum is None:
+            raise FileNotFoundError(f"Page file not found: {page.file} (for {title})")
+        if checksum != page.checksum:
+            updates.append(ChecksumUpdate(title, page.file, page.checksum, checksum))
+
+    if updates and write:
+        # edit the checksums in place: the model would drop unknown fields (e.g. $schema),
+        # comments and key order
+        update_yaml(
+            manifest_path, {("pages", update.title, "checksum"): update.new for update in updates}
+        )
+    return updates
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import click
+
+
+@click.command("bundle")
+@click.argument("packs", nargs=-1)
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.Path(exists=True, path_type=Path),
+    default="manifest.yml",
+    show_default=True,
+    help="Path to the manifest.yml file",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default="dist",
+    show_default=True,
+    help="Directory to write bundles to",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes (default: number of CPUs)",
+)
+@click.option("--force", is_flag=True, help="Rebuild bundles even if they are up to date")
+def bundle(
+    packs: tuple[str, ...], manifest: Path, output: Path, jobs: int | None, force: bool
+) -> None:
+    """
+    Build one reproducible .zip archive per pack (default: every pack).
+
+    Each archive contains the pack's page files and a sub-manifest.
+    Archive names include a content digest, so unchanged packs are skipped on rebuild.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from labki_packs_tools.bundle import build_bundles
+
+    try:
+        results = build_bundles(manifest, output, packs or None, jobs=jobs, force=force)
+    except (KeyError, ValueError, OSError) as e:
+        raise click.ClickException(str(e.args[0] if isinstance(e, KeyError) else e)) from e
+
+    table = Table(title="Pack bundles")
+    table.add_column("Pack")
+    table.add_column("Status")
+    table.add_column("File")
+    for result in results:
+        table.add_row(result.pack, "built" if result.built else "unchanged", str(result.path))
+
+    console = Console()
+    console.print(table)
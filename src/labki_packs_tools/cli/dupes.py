@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+
+import click
+
+
+@click.command("dupes")
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.Path(exists=True, path_type=Path),
+    default="manifest.yml",
+    show_default=True,
+    help="Path to the manifest.yml file",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=None,
+    help="Lowest estimated similarity of near-duplicates (1: identical pages only) [default: 0.8]",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes reading page files",
+)
+@click.option("--json", "as_json", is_flag=True, help="Emit the groups as JSON")
+@click.option("--no-cache", is_flag=True, help="Read every page file, ignoring cached signatures")
+def dupes_command(
+    manifest: Path, threshold: float | None, jobs: int, as_json: bool, no_cache: bool
+) -> None:
+    """
+    Find pages with identical or nearly identical content, grouped by pack.
+
+    Similarity is estimated with MinHash signatures of the pages' content, and
+    only pages that share part of their signature are compared, so large
+    repositories are searched in about linear time.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from labki_packs_tools.dupes import DEFAULT_THRESHOLD, find_duplicates
+    from labki_packs_tools.validation.cache import ValidationCache
+    from labki_packs_tools.validation.snapshot import FileSnapshot
+
+    repo_dir = manifest.parent
+    cache = None if no_cache else ValidationCache.for_manifest(manifest)
+    signatures = None
+    if cache is not None:
+        snapshot = FileSnapshot.scan(repo_dir)
+        signatures = {repo_dir / rel: info.signature for rel, info in snapshot.files.items()}
+    groups = find_duplicates(
+        manifest,
+        threshold=DEFAULT_THRESHOLD if threshold is None else threshold,
+        cache=cache,
+        signatures=signatures,
+        jobs=jobs,
+    )
+    if cache is not None:
+        cache.save()
+
+    if as_json:
+        payload = [
+            {
+                "pages": group.pages,
+                "packs": group.packs,
+                "similarity": round(group.similarity, 3),
+                "identical": group.identical,
+            }
+            for group in groups
+        ]
+        click.echo(json.dumps({"groups": payload}, indent=2))
+        return
+    if not groups:
+        click.echo("No duplicate pages found")
+        return
+
+    by_packs: dict[tuple[str, ...], list] = {}
+    for group in groups:
+        by_packs.setdefault(tuple(group.packs), []).append(group)
+
+    console = Console()
+    for packs, pack_groups in sorted(by_packs.items()):
+        if not packs:
+            title = "Pages in no pack"
+        elif len(packs) == 1:
+            title = f"Pack '{packs[0]}'"
+        else:
+            title = "Packs " + ", ".join(f"'{pack}'" for pack in packs)
+        table = Table(title=title)
+        table.add_column("Similarity")
+        table.add_column("Pages")
+        for group in pack_groups:
+            similarity = "identical" if group.identical else f"{group.similarity:.0%}"
+            table.add_row(similarity, "\n".join(group.pages))
+        console.print(table)
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import click
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def _parse_size(ctx: click.Context, param: click.Parameter, value: str | None) -> int | None:
+    if value is None:
+        return None
+    text = value.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    try:
+        size = int(float(text[: len(text) - len(unit)]) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise click.BadParameter(f"Invalid size '{value}', use e.g. 2M, 512K or 1048576") from None
+    if size <= 0:
+        raise click.BadParameter("Size must be positive")
+    return size
+
+
+@click.command("export")
+@click.argument("pack")
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.Path(exists=True, path_type=Path),
+    default="manifest.yml",
+    show_default=True,
+    help="Path to the manifest.yml file",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    default="-",
+    help="Output file path (use '-' for stdout)",
+)
+@click.option(
+    "--max-size",
+    callback=_parse_size,
+    help=(
+        "Split output into numbered files no larger than this (e.g. 2M), "
+        "to stay under the wiki's import upload limit"
+    ),
+)
+@click.option(
+    "--no-deps",
+    is_flag=True,
+    help="Only export the pack itself, not the packs it depends on",
+)
+def export_command(
+    pack: str, manifest: Path, output: Path, max_size: int | None, no_deps: bool
+) -> None:
+    """
+    Export a pack as MediaWiki XML (export-0.11) for Special:Import.
+
+    Includes every pack the pack transitively depends on, dependencies first.
+    """
+    from labki_packs_tools.export import export_pack
+
+    try:
+        paths = export_pack(
+            manifest,
+            pack,
+            None if str(output) == "-" else output,
+            max_bytes=max_size,
+            include_dependencies=not no_deps,
+        )
+    except (KeyError, ValueError, FileNotFoundError) as e:
+        raise click.ClickException(str(e.args[0] if isinstance(e, KeyError) else e)) from e
+
+    for path in paths:
+        click.echo(f"Wrote {path}", err=True)
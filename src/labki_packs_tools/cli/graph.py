@@ -2,8 +2,6 @@ from pathlib import Path
 
 import click
 
-from labki_packs_tools.graph_repo import graph
-
 
 @click.command("graph")
 @click.argument(
@@ -31,5 +29,7 @@ def graph_command(manifest: Path, fmt: str, output: Path) -> None:
     Creates a visual representation of the pack dependencies and page relationships.
     Supports multiple output formats: DOT (Graphviz), Mermaid, and JSON.
     """
+    from labki_packs_tools.graph_repo import graph
+
     rc = graph(manifest, fmt=fmt, output=str(output))
     raise SystemExit(rc)
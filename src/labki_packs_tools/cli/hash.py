@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import click
+
+
+@click.command("hash")
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.Path(exists=True, path_type=Path),
+    default="manifest.yml",
+    show_default=True,
+    help="Path to the manifest.yml file",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of threads hashing files (default: number of CPUs)",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Do not write the manifest; exit with 1 if any checksum is missing or out of date",
+)
+def hash_command(manifest: Path, jobs: int | None, check: bool) -> None:
+    """
+    Record the checksum of every page file in the manifest.
+
+    Pages whose checksum is missing or does not match their file are updated;
+    `labki validate` then reports files edited without updating the manifest.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from labki_packs_tools.checksum import update_checksums
+
+    try:
+        updates = update_checksums(manifest, jobs=jobs, write=not check)
+    except FileNotFoundError as e:
+        raise click.ClickException(str(e)) from e
+
+    if not updates:
+        click.echo("All checksums up to date")
+        return
+
+    table = Table(title="Checksums out of date" if check else "Checksums updated")
+    table.add_column("Title")
+    table.add_column("File")
+    table.add_column("Checksum")
+    for update in updates:
+        table.add_row(update.title, update.file, update.new)
+
+    console = Console()
+    console.print(table)
+    if check:
+        raise SystemExit(1)
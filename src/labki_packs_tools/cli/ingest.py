@@ -1,11 +1,6 @@
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.table import Table
-
-from labki_packs_tools.ingest import update_manifest
-from labki_packs_tools.manifest import Manifest
 
 
 @click.command("ingest")
@@ -19,7 +14,13 @@ from labki_packs_tools.manifest import Manifest
     type=click.Path(),
     help="Path to a manifest.yml file, if none is passed, look in cwd.",
 )
-def ingest(export: Path, manifest: Path | None = None) -> None:
+@click.option(
+    "-r",
+    "--rules",
+    type=click.Path(exists=True, path_type=Path),
+    help="Path to a pack assignment rules file; new pages are added to the matching pack.",
+)
+def ingest(export: Path, manifest: Path | None = None, rules: Path | None = None) -> None:
     """
     Ingest pages from a mediawiki XML export to a manifest
     (created from `Special:Export`, see: https://www.mediawiki.org/wiki/Help:Export)
@@ -27,7 +28,14 @@ def ingest(export: Path, manifest: Path | None = None) -> None:
     Updates any pages with a more recent timestamp than in the manifest,
     adds any pages that are missing,
     and writes the content of the pages when updated or added.
+    With --rules, new pages are also added to packs, bumping the pack versions.
     """
+    from rich.console import Console
+    from rich.table import Table
+
+    from labki_packs_tools.ingest import update_manifest
+    from labki_packs_tools.manifest import Manifest
+
     if not export:
         return
     else:
@@ -43,7 +51,11 @@ def ingest(export: Path, manifest: Path | None = None) -> None:
     else:
         manifest = Path(manifest)
 
-    updated = update_manifest(manifest, export)
+    try:
+        updated = update_manifest(manifest, export, rules_path=rules)
+    except ValueError as e:
+        # invalid rules files, and rules for packs the manifest does not define
+        raise click.ClickException(str(e)) from e
     if not updated:
         click.echo("No pages updated")
         return
@@ -53,8 +65,16 @@ def ingest(export: Path, manifest: Path | None = None) -> None:
     table.add_column("Title")
     table.add_column("Last Updated")
     table.add_column("File")
+    if rules:
+        table.add_column("Pack")
+    owners = {
+        title: pack_id for pack_id, pack in new_manifest.packs.items() for title in pack.pages
+    }
     for page in updated:
-        table.add_row(page.name, page.last_updated.isoformat(), new_manifest.pages[page.name].file)
+        row = [page.name, page.last_updated.isoformat(), new_manifest.pages[page.name].file]
+        if rules:
+            row.append(owners.get(page.name, "-"))
+        table.add_row(*row)
 
     console = Console()
     console.print(table)
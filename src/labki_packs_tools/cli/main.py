@@ -1,15 +1,47 @@
+from importlib import import_module
+from typing import Any
+
 import click
 
-from labki_packs_tools.cli.graph import graph_command
-from labki_packs_tools.cli.ingest import ingest
-from labki_packs_tools.cli.validate import validate
 
+class LazyGroup(click.Group):
+    """
+    A group whose subcommands are imported when they are first looked up.
 
-@click.group("labki")
-def main() -> None:
-    """Labki CLI - Tools for validating and visualizing Labki content packs"""
+    `lazy_commands` maps command names to ``"module:attribute"``. Running one
+    command only imports its module, and command modules import their heavy
+    dependencies (validators, jsonschema, pydantic, rich) inside the command,
+    so `labki --help` stays fast.
+    """
+
+    def __init__(self, *args: Any, lazy_commands: dict[str, str] | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
 
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
 
-main.add_command(ingest)
-main.add_command(validate)
-main.add_command(graph_command)
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module, attr = self.lazy_commands[cmd_name].split(":")
+            self.add_command(getattr(import_module(module), attr), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(
+    "labki",
+    cls=LazyGroup,
+    lazy_commands={
+        "bundle": "labki_packs_tools.cli.bundle:bundle",
+        "dupes": "labki_packs_tools.cli.dupes:dupes_command",
+        "export": "labki_packs_tools.cli.export:export_command",
+        "graph": "labki_packs_tools.cli.graph:graph_command",
+        "hash": "labki_packs_tools.cli.hash:hash_command",
+        "ingest": "labki_packs_tools.cli.ingest:ingest",
+        "resolve": "labki_packs_tools.cli.resolve:resolve_command",
+        "serve": "labki_packs_tools.cli.serve:serve",
+        "validate": "labki_packs_tools.cli.validate:validate",
+    },
+)
+def main() -> None:
+    """Labki CLI - Tools for validating and visualizing Labki content packs"""
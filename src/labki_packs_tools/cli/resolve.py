@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import click
+
+
+@click.command("resolve")
+@click.argument("packs", nargs=-1)
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.Path(exists=True, path_type=Path),
+    default="manifest.yml",
+    show_default=True,
+    help="Path to the manifest.yml file",
+)
+@click.option(
+    "--each",
+    is_flag=True,
+    help="Resolve every pack on its own rather than all of them together",
+)
+@click.option("--json", "as_json", is_flag=True, help="Emit the resolution as JSON")
+def resolve_command(packs: tuple[str, ...], manifest: Path, each: bool, as_json: bool) -> None:
+    """
+    Show what installing PACKS takes: the packs they transitively depend on,
+    in waves that can be imported concurrently, and the pages of all of them.
+
+    Without PACKS, every pack of the manifest is resolved.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from labki_packs_tools.resolve import PackResolver
+
+    resolver = PackResolver.from_manifest(manifest)
+    pack_ids = list(packs) or resolver.graph.pack_ids
+    try:
+        if each:
+            resolutions = [resolver.resolve([pack_id]) for pack_id in pack_ids]
+        else:
+            resolutions = [resolver.resolve(pack_ids)]
+    except (KeyError, ValueError) as e:
+        raise click.ClickException(str(e.args[0] if isinstance(e, KeyError) else e)) from e
+
+    if as_json:
+        payload = [
+            {
+                "packs": r.packs,
+                "waves": r.waves,
+                "pages": r.pages,
+                "unknown_deps": [list(edge) for edge in r.unknown_deps],
+            }
+            for r in resolutions
+        ]
+        click.echo(json.dumps({"resolutions": payload}, indent=2))
+        return
+
+    console = Console()
+    for resolution in resolutions:
+        for pack, dep in resolution.unknown_deps:
+            console.print(f"[yellow]Pack '{pack}' depends_on unknown pack id: {dep}[/]")
+        table = Table(title=f"Install {', '.join(resolution.packs) or 'nothing'}")
+        table.add_column("Wave", justify="right")
+        table.add_column("Packs")
+        for i, wave in enumerate(resolution.waves, 1):
+            table.add_row(str(i), ", ".join(wave))
+        console.print(table)
+        console.print(
+            f"{len(resolution.order)} packs in {len(resolution.waves)} waves, "
+            f"{len(resolution.pages)} pages"
+        )
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import click
+
+from labki_packs_tools.validation.daemon import (
+    DEFAULT_MAX_SESSIONS,
+    SOCKET_ENV,
+    ValidationServer,
+    default_socket_path,
+    serve_stdio,
+    serve_unix,
+)
+
+
+@click.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help=f"Unix socket to listen on (default: ${SOCKET_ENV} or daemon.sock in the cache directory)",
+)
+@click.option(
+    "--stdio",
+    is_flag=True,
+    help="Read requests from standard input and answer on standard output instead",
+)
+@click.option(
+    "--max-sessions",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_SESSIONS,
+    show_default=True,
+    help="Number of manifests kept in memory",
+)
+def serve(socket_path: Path | None, stdio: bool, max_sessions: int) -> None:
+    """
+    Run a validation server that keeps manifests and schemas in memory.
+
+    While it runs, `labki validate` sends its requests to the server instead of
+    validating in a new process, and only what changed since the previous
+    request is re-checked. Requests are JSON-RPC 2.0, one per line.
+    Stop it with Ctrl+C or a "shutdown" request.
+    """
+    server = ValidationServer(max_sessions=max_sessions)
+    if stdio:
+        serve_stdio(sys.stdin.buffer, sys.stdout.buffer, server=server)
+        return
+
+    path = socket_path or default_socket_path()
+    click.echo(f"Listening on {path} (Ctrl+C to stop)", err=True)
+    try:
+        serve_unix(path, server=server)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        raise click.ClickException(str(e)) from e
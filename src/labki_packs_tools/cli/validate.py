@@ -1,33 +1,469 @@
+import contextlib
+import os
+import sys
 from pathlib import Path
+from typing import Iterator, NamedTuple, TextIO
 
 import click
+from click.core import ParameterSource
 
-from labki_packs_tools.validation.repo_validator import validate_repo
+# Only modules that are cheap to import are imported here: the validators (and
+# jsonschema) are imported when a manifest is validated in this process, not
+# for --help or when a `labki serve` server answers.
+from labki_packs_tools.validation.cache import DEFAULT_MAX_ENTRIES, ValidationCache
+from labki_packs_tools.validation.daemon import DaemonError, validate_with_daemon
+from labki_packs_tools.validation.result_formatter import (
+    DEFAULT_EXAMPLES,
+    get_console,
+    print_batch_results,
+    print_batch_results_json,
+)
+from labki_packs_tools.validation.result_types import ValidationResults
+from labki_packs_tools.validation.sinks import NdjsonSink, ResultSink, SarifSink
+from labki_packs_tools.validation.snapshot import IGNORE_FILE, FileSnapshot, read_ignore_file
+
+FORMATS = ["text", "json", "ndjson", "sarif"]
+SINKS = ("ndjson", "sarif")
+"""Formats written item by item while validating"""
 
 
 @click.command("validate")
-@click.argument(
-    "manifest",
-    type=click.Path(exists=True, path_type=Path),
-)
+@click.argument("paths", metavar="MANIFEST... [SCHEMA]", nargs=-1, required=True)
 @click.option(
     "--json",
     is_flag=True,
-    help="Output results as JSON instead of colored text",
+    help="Output results as JSON instead of colored text (same as --format json)",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(FORMATS),
+    default=None,
+    help=(
+        "Output format (default: text). ndjson (one JSON object per item) and sarif are "
+        "written while validators run"
+    ),
+)
+@click.option(
+    "--max-examples",
+    type=click.IntRange(min=0),
+    default=DEFAULT_EXAMPLES,
+    show_default=True,
+    help="Text output: show this many items per code and level, and count the rest (0: all)",
+)
+@click.option(
+    "--full-report",
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=Path),
+    default=None,
+    help="Text output: also write every item as plain text to this file ('-' for stdout)",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help=(
+        "Validate entries while the manifest is parsed and print each item as soon as it "
+        "is found (one JSON object per line with --json)"
+    ),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Run validators concurrently on this many worker threads",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Re-check everything instead of reusing results of previous runs",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Where to keep the validation cache (default: $LABKI_CACHE_DIR or ~/.cache)",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ENTRIES,
+    show_default=True,
+    help="Maximum number of cached results kept; least recently used are dropped first",
+)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    default=None,
+    help=(
+        "Only report problems in pages, packs and files changed since git revision REF "
+        "(and the packs they affect)"
+    ),
+)
+@click.option(
+    "--ignore",
+    "ignore",
+    metavar="PATTERN",
+    multiple=True,
+    help=f"Skip files and directories in pages/ matching this glob (added to {IGNORE_FILE})",
+)
+@click.option(
+    "--scan-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="List this many directories of pages/ concurrently (for high-latency filesystems)",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and re-validate whenever the manifest or page files change",
+)
+@click.option(
+    "--max-errors",
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        "Stop validating once N errors were found; checks that need a structurally valid "
+        "manifest are skipped if it has schema errors"
+    ),
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop at the first error (same as --max-errors 1)",
 )
-def validate(manifest: Path, json: bool) -> None:
+@click.option(
+    "--fix",
+    is_flag=True,
+    help="Remove depends_on entries that other dependencies already imply before validating",
+)
+@click.option(
+    "--dupes",
+    is_flag=True,
+    help="Also warn about pages with identical or near-duplicate content (reads every page)",
+)
+@click.option(
+    "--fetch-schemas",
+    is_flag=True,
+    help=(
+        "Download $schema URLs (and the documents they reference) that are not in the "
+        "schema cache, instead of failing"
+    ),
+)
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    help="Validate in this process even if a `labki serve` server is running",
+)
+@click.option(
+    "-p",
+    "--processes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Validate this many repositories at once (default: one per CPU)",
+)
+def validate(
+    paths: tuple[str, ...],
+    json: bool,
+    fmt: str | None,
+    max_examples: int,
+    full_report: Path | None,
+    stream: bool,
+    jobs: int,
+    no_cache: bool,
+    cache_dir: Path | None,
+    cache_size: int,
+    changed_since: str | None,
+    ignore: tuple[str, ...],
+    scan_jobs: int,
+    watch: bool,
+    max_errors: int | None,
+    fail_fast: bool,
+    fix: bool,
+    dupes: bool,
+    fetch_schemas: bool,
+    no_daemon: bool,
+    processes: int | None,
+) -> None:
     """
-    Validate a Labki content repository manifest.
+    Validate Labki content repository manifests.
 
-    Validates the manifest against JSON Schema and repository rules.
-    Returns non-zero exit code on validation errors (suitable for CI).
-    Warnings do not change the exit code.
+    Validates each manifest against JSON Schema and repository rules.
+    The schema is selected by the manifest's schema_version unless SCHEMA
+    (a .json file) is given. A MANIFEST may also be a repository directory
+    or a glob pattern; several repositories are validated in parallel and
+    summarized together. A single manifest is validated by the `labki serve`
+    server if one is running.
+    Returns non-zero exit code on validation errors in any repository
+    (suitable for CI). Warnings do not change the exit code.
     """
-    rc, results = validate_repo(manifest)
-    if json:
-        results.print_json()
+    if json and fmt not in (None, "json"):
+        raise click.UsageError("--json cannot be combined with --format " + fmt)
+    fmt = fmt or ("json" if json else "text")
+    if full_report is not None and (fmt != "text" or stream):
+        raise click.UsageError("--full-report only applies to text output without --stream")
+    report = _ReportOptions(max_examples or None, full_report)
+    if stream and changed_since:
+        raise click.UsageError("--changed-since cannot be combined with --stream")
+    if watch and (stream or changed_since):
+        raise click.UsageError("--watch cannot be combined with --stream or --changed-since")
+
+    if fail_fast:
+        max_errors = 1
+    if watch and max_errors is not None:
+        raise click.UsageError("--watch cannot be combined with --max-errors or --fail-fast")
+    if watch and fmt in SINKS:
+        raise click.UsageError(f"--watch cannot be combined with --format {fmt}")
+
+    if dupes and (stream or watch):
+        raise click.UsageError("--dupes cannot be combined with --stream or --watch")
+    checks = ("page-dupes",) if dupes else ()
+
+    if fetch_schemas:
+        from labki_packs_tools.validation.schema_resolver import FETCH_ENV
+
+        # in the environment, so worker processes download as well
+        os.environ[FETCH_ENV] = "1"
+        no_daemon = True
+
+    manifests, schema = _split_paths(paths)
+    if fix:
+        for manifest in manifests:
+            _fix(manifest)
+    if len(manifests) > 1:
+        if stream or watch:
+            raise click.UsageError(
+                "--stream and --watch cannot be used with more than one manifest"
+            )
+        if fmt in SINKS:
+            raise click.UsageError(f"--format {fmt} cannot be used with more than one manifest")
+        from labki_packs_tools.validation.batch import validate_repos
+
+        repos = validate_repos(
+            manifests,
+            schema,
+            processes=processes,
+            jobs=jobs,
+            use_cache=not no_cache,
+            cache_dir=cache_dir,
+            cache_size=cache_size,
+            changed_since=changed_since,
+            ignore=ignore,
+            scan_jobs=scan_jobs,
+            max_errors=max_errors,
+            checks=checks,
+        )
+        for repo in repos:
+            for note in repo.notes:
+                click.echo(f"Warning: {repo.manifest_path}: {note}", err=True)
+        if fmt == "json":
+            print_batch_results_json(repos)
+        else:
+            with _report_stream(report.path) as stream_to:
+                print_batch_results(repos, max_examples=report.max_examples, full_report=stream_to)
+        raise SystemExit(max(repo.rc for repo in repos))
+
+    manifest = manifests[0]
+    repo_dir = manifest.parent
+    ignore = (*read_ignore_file(repo_dir.resolve() / IGNORE_FILE), *ignore)
+    # the server validates with its own jobs and cache settings
+    local = _given("jobs", "cache_dir", "cache_size", "scan_jobs")
+    if not (stream or watch or no_cache or no_daemon or max_errors or checks or local):
+        try:
+            results = validate_with_daemon(
+                manifest, schema, ignore=ignore, changed_since=changed_since
+            )
+        except DaemonError as e:
+            raise click.ClickException(str(e)) from e
+        if results is not None:
+            if fmt in SINKS:
+                sinked = ValidationResults(sinks=[_sink(fmt, manifest)], keep_items=False)
+                sinked.extend(results)
+                sinked.close()
+            else:
+                _print(results, fmt, report)
+            raise SystemExit(results.rc)
+
+    snapshot = FileSnapshot.scan(repo_dir, ignore=ignore, jobs=scan_jobs)
+    if stream:
+        raise SystemExit(_validate_streaming(manifest, schema, fmt, snapshot, max_errors))
+    if watch:
+        raise SystemExit(_watch(manifest, schema, fmt, report, snapshot))
+
+    scope = None
+    if changed_since:
+        from labki_packs_tools.validation.scope import changed_scope
+
+        try:
+            scope = changed_scope(manifest, changed_since)
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+
+    cache = None
+    if not no_cache:
+        cache = ValidationCache.for_manifest(manifest, cache_dir, max_entries=cache_size)
+
+    from labki_packs_tools.validation.repo_validator import validate_repo
+
+    results = None
+    if fmt in SINKS:
+        results = ValidationResults(sinks=[_sink(fmt, manifest)], keep_items=False)
+    rc, results = validate_repo(
+        manifest,
+        schema,
+        jobs=jobs,
+        cache=cache,
+        scope=scope,
+        snapshot=snapshot,
+        results=results,
+        max_errors=max_errors,
+        checks=checks,
+    )
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            click.echo(f"Warning: could not save validation cache: {e}", err=True)
+    if fmt in SINKS:
+        results.close()
     else:
-        results.print(title="Validation results")
+        _print(results, fmt, report)
 
     # Exit with the return code from validation
     raise SystemExit(rc)
+
+
+def _given(*names: str) -> bool:
+    """Whether any of these options was set, rather than left at its default."""
+    ctx = click.get_current_context()
+    return any(ctx.get_parameter_source(name) != ParameterSource.DEFAULT for name in names)
+
+
+def _fix(manifest: Path) -> None:
+    """Remove redundant ``depends_on`` entries; a manifest that cannot be loaded is left as is."""
+    from yaml import YAMLError
+
+    from labki_packs_tools.resolve import remove_redundant_dependencies
+
+    try:
+        removed = remove_redundant_dependencies(manifest)
+    except (OSError, YAMLError, ValueError) as e:
+        click.echo(f"Warning: {manifest}: could not fix dependencies: {e}", err=True)
+        return
+    for entry in removed:
+        click.echo(
+            f"{manifest}: removed '{entry.dependency}' from the depends_on of '{entry.pack}' "
+            f"(implied by '{entry.via}')",
+            err=True,
+        )
+
+
+class _ReportOptions(NamedTuple):
+    max_examples: int | None
+    path: Path | None
+
+
+def _print(results: ValidationResults, fmt: str, report: _ReportOptions) -> None:
+    if fmt == "json":
+        results.print_json()
+        return
+    with _report_stream(report.path) as stream:
+        results.print(
+            title="Validation results", max_examples=report.max_examples, full_report=stream
+        )
+
+
+@contextlib.contextmanager
+def _report_stream(path: Path | None) -> Iterator[TextIO | None]:
+    if path is None:
+        yield None
+    elif str(path) == "-":
+        yield sys.stdout
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            yield f
+
+
+def _split_paths(paths: tuple[str, ...]) -> tuple[list[Path], Path | None]:
+    """Separate the SCHEMA argument (a .json file) from manifests, directories and globs."""
+    schemas = [p for p in paths if p.endswith(".json")]
+    if len(schemas) > 1:
+        raise click.BadParameter("at most one SCHEMA may be given", param_hint="SCHEMA")
+    schema = None
+    if schemas:
+        schema = Path(schemas[0])
+        if not schema.is_file():
+            raise click.BadParameter(f"File '{schema}' does not exist.", param_hint="SCHEMA")
+    from labki_packs_tools.validation.batch import expand_manifest_paths
+
+    try:
+        manifests = expand_manifest_paths(p for p in paths if not p.endswith(".json"))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="MANIFEST") from e
+    if not manifests:
+        raise click.BadParameter("no manifest given", param_hint="MANIFEST")
+    return manifests, schema
+
+
+def _sink(fmt: str, manifest: Path) -> ResultSink:
+    stdout = sys.stdout
+    if fmt == "sarif":
+        return SarifSink(stdout, manifest_uri=manifest.name)
+    return NdjsonSink(stdout)
+
+
+def _validate_streaming(
+    manifest: Path,
+    schema: Path | None,
+    fmt: str,
+    snapshot: FileSnapshot,
+    max_errors: int | None = None,
+) -> int:
+    from labki_packs_tools.validation.streaming import iter_validate_repo
+
+    # streamed JSON is one object per line
+    sinks = [] if fmt == "text" else [_sink("ndjson" if fmt == "json" else fmt, manifest)]
+    results = ValidationResults(sinks=sinks, keep_items=False)
+    for item in iter_validate_repo(manifest, schema, snapshot=snapshot):
+        results.add(item)
+        if fmt == "text":
+            click.echo(str(item))
+        if max_errors is not None and results.count("error") >= max_errors:
+            results.truncated = True
+            break
+    results.close()
+
+    if fmt == "text":
+        click.echo(f"Validation completed: {results.summary()}")
+    return results.rc
+
+
+def _watch(
+    manifest: Path,
+    schema: Path | None,
+    fmt: str,
+    report: _ReportOptions,
+    snapshot: FileSnapshot,
+) -> int:
+    from labki_packs_tools.validation.watch import watch as watch_repo
+
+    console = get_console()
+    rc = 0
+
+    def show(results: ValidationResults, elapsed: float) -> None:
+        nonlocal rc
+        rc = results.rc
+        if fmt == "json":
+            results.print_json()
+            return
+        console.clear()
+        _print(results, fmt, report)
+        console.print(
+            f"[dim]Validated in {elapsed * 1000:.0f} ms. "
+            f"Watching {manifest.parent} for changes (Ctrl+C to stop)...[/dim]"
+        )
+
+    with contextlib.suppress(KeyboardInterrupt):
+        watch_repo(manifest, schema, snapshot=snapshot, on_results=show)
+    return rc
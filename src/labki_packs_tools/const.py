@@ -6,6 +6,7 @@ This version safely handles both editable installs and direct source runs.
 from __future__ import annotations
 
 import json
+from functools import cache
 from pathlib import Path
 
 # ---------------------------------------------------------------------
@@ -13,6 +14,7 @@ from pathlib import Path
 # ---------------------------------------------------------------------
 
 
+@cache
 def _get_schema_dir() -> Path:
     """
     Resolve the location of the `schema` directory.
@@ -58,8 +60,18 @@ def _get_schema_dir() -> Path:
 # ---------------------------------------------------------------------
 # Public constants
 # ---------------------------------------------------------------------
-
-SCHEMA_DIR = _get_schema_dir()
-SCHEMA_INDEX = SCHEMA_DIR / "index.json"
+# Resolved on first access rather than at import, so commands that never
+# read a schema (and `--help`) don't pay for the site-packages scan.
 
 __all__ = ["SCHEMA_DIR", "SCHEMA_INDEX"]
+
+SCHEMA_DIR: Path
+SCHEMA_INDEX: Path
+
+
+def __getattr__(name: str) -> Path:
+    if name == "SCHEMA_DIR":
+        return _get_schema_dir()
+    if name == "SCHEMA_INDEX":
+        return _get_schema_dir() / "index.json"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,339 @@
+"""
+Find pages with identical or nearly identical content.
+
+Comparing every pair of pages is quadratic, so near-duplicates are found
+with MinHash and locality-sensitive hashing (LSH) instead:
+
+- a page's content is split into tokens (words and single punctuation
+  characters, case-folded), and every run of `SHINGLE_SIZE` consecutive
+  tokens is a *shingle*; the similarity of two pages is the Jaccard
+  similarity of their sets of shingles
+- each shingle is hashed once, and one-permutation hashing spreads the hashes
+  over `NUM_HASHES` buckets, keeping the smallest hash of each, so the
+  signature costs one hash per shingle rather than one per shingle and
+  signature slot. The fraction of slots two signatures share estimates the
+  Jaccard similarity of the pages
+- signatures are cut into `BANDS` bands; pages sharing any band are
+  candidates, and only candidates are compared. Pages that are at least 80%
+  similar are found with near certainty, while dissimilar pages rarely share a
+  band, so the work stays close to linear in the number of pages
+
+Pages with the same content (same checksum) are grouped before LSH runs, so
+copies of one page do not blow up the candidate buckets.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import operator
+import re
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Hashable, Iterable, Mapping, Sequence, TypeVar
+
+from labki_packs_tools.checksum import CHECKSUM_PREFIX, cached_checksum
+from labki_packs_tools.utils import PackGraph, load_yaml
+
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.cache import ValidationCache
+
+K = TypeVar("K", bound=Hashable)
+
+SHINGLE_SIZE = 5
+"""Tokens per shingle"""
+
+NUM_HASHES = 64
+"""Slots of a MinHash signature"""
+
+BANDS = 16
+"""LSH bands, of ``NUM_HASHES // BANDS`` slots each"""
+
+DEFAULT_THRESHOLD = 0.8
+"""Lowest estimated similarity for two pages to be reported as near-duplicates"""
+
+MIN_POOL_FILES = 256
+"""Fewest files to sign that are worth starting worker processes for"""
+
+MEMO_SIZE = 1 << 16
+"""Signatures of files kept in memory (by path and stat signature) between calls"""
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+_SIGNATURE_NAMESPACE = "minhash"
+
+Signature = bytes
+"""`NUM_HASHES` signed 64-bit slots, in native byte order"""
+
+Signed = tuple[str, "Signature | None"]
+"""Checksum and signature of a file"""
+
+_memo: OrderedDict[tuple[str, tuple[int, ...]], Signed] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+@dataclass
+class DuplicateGroup:
+    pages: list[str]
+    """Page titles, in manifest order"""
+    packs: list[str]
+    """Packs listing any of the pages, in manifest order"""
+    similarity: float
+    """Lowest estimated similarity of a page to the first one"""
+    identical: bool
+    """True if all pages have the same content"""
+
+
+# ────────────────────────────────────────────────
+# Signatures
+# ────────────────────────────────────────────────
+def signature(text: str) -> Signature | None:
+    """MinHash signature of a text, or ``None`` if it has no tokens."""
+    tokens = _TOKEN.findall(text.casefold())
+    if not tokens:
+        return None
+    ids = list(map(zlib.crc32, map(str.encode, tokens)))
+    if len(ids) <= SHINGLE_SIZE:
+        hashes = [hash(tuple(ids))]
+    else:
+        # hashing tuples of ints is deterministic (unlike str), and runs in C
+        hashes = list(map(hash, zip(*(ids[i:] for i in range(SHINGLE_SIZE)))))
+
+    # smallest hash per slot: iterate in descending order, so the smallest is written last
+    mins = {h % NUM_HASHES: h // NUM_HASHES for h in sorted(hashes, reverse=True)}
+    if len(mins) < NUM_HASHES:
+        # densify: an empty slot borrows the next filled one, mixed with the distance to it
+        filled = sorted(mins)
+        for slot in range(NUM_HASHES):
+            if slot not in mins:
+                nearest = next((f for f in filled if f > slot), filled[0] + NUM_HASHES)
+                mins[slot] = hash((mins[nearest % NUM_HASHES], nearest - slot))
+    return array("q", [mins[slot] for slot in range(NUM_HASHES)]).tobytes()
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the shingles of two texts."""
+    same = sum(map(operator.eq, memoryview(a).cast("q"), memoryview(b).cast("q")))
+    return same / NUM_HASHES
+
+
+def _sign_file(path: Path) -> Signed | None:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    checksum = CHECKSUM_PREFIX + hashlib.sha256(data).hexdigest()
+    return checksum, signature(data.decode("utf-8", "replace"))
+
+
+def _remember(key: tuple[str, tuple[int, ...]], signed: Signed) -> None:
+    with _memo_lock:
+        _memo[key] = signed
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def sign_files(
+    paths: Sequence[Path],
+    *,
+    cache: ValidationCache | None = None,
+    signatures: Mapping[Path, list[int] | None] | None = None,
+    jobs: int = 1,
+) -> dict[Path, Signed]:
+    """
+    Checksum and MinHash signature of each readable file.
+
+    Args:
+        cache: Reuse signatures of content signed in earlier runs (and
+            checksums of files whose stat signature did not change). Without
+            a cache, files signed earlier in this process are reused instead
+            (e.g. by ``--watch`` and ``serve``), by path and stat signature.
+        signatures: Stat signatures of the files (e.g. from a `FileSnapshot`);
+            files without one are always read.
+        jobs: Sign in this many worker processes, if there are at least
+            `MIN_POOL_FILES` files to sign.
+    """
+    found: dict[Path, Signed] = {}
+    todo: list[Path] = []
+    for path in dict.fromkeys(paths):
+        stat = signatures.get(path) if signatures is not None else None
+        if stat is None:
+            todo.append(path)
+        elif cache is None:
+            with _memo_lock:
+                signed = _memo.get((str(path), tuple(stat)))
+            if signed is None:
+                todo.append(path)
+            else:
+                found[path] = signed
+        else:
+            try:
+                checksum = cached_checksum(path, stat, cache)
+            except OSError:
+                continue
+            cached = cache.get(cache.key(_SIGNATURE_NAMESPACE, checksum))
+            if cached is None:
+                todo.append(path)
+            else:
+                found[path] = (checksum, bytes.fromhex(cached) if cached else None)
+
+    for path, signed in zip(todo, _sign_all(todo, jobs)):
+        if signed is None:
+            continue
+        found[path] = signed
+        stat = signatures.get(path) if signatures is not None else None
+        if cache is not None:
+            checksum, sig = signed
+            cache.put(cache.key(_SIGNATURE_NAMESPACE, checksum), sig.hex() if sig else "")
+        elif stat is not None:
+            _remember((str(path), tuple(stat)), signed)
+    return found
+
+
+def clear_signatures() -> None:
+    """Forget the signatures kept in memory."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _sign_all(paths: list[Path], jobs: int) -> list[Signed | None]:
+    if jobs <= 1 or len(paths) < MIN_POOL_FILES:
+        return [_sign_file(path) for path in paths]
+    # validators may run on threads, and forking a multi-threaded process can deadlock
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        return list(pool.map(_sign_file, paths, chunksize=chunksize))
+
+
+# ────────────────────────────────────────────────
+# Grouping
+# ────────────────────────────────────────────────
+def similar_groups(
+    signatures: Mapping[K, Signature], threshold: float = DEFAULT_THRESHOLD
+) -> list[list[K]]:
+    """
+    Groups of keys whose signatures are at least ``threshold`` similar to
+    another member of the group, in order of their first key (in ``signatures`` order).
+    """
+    keys = list(signatures)
+    parent = list(range(len(keys)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: dict[tuple[int, bytes], list[int]] = {}
+    for i, key in enumerate(keys):
+        sig = signatures[key]
+        width = len(sig) // BANDS
+        for band in range(0, len(sig), width):
+            buckets.setdefault((band, sig[band : band + width]), []).append(i)
+
+    for members in buckets.values():
+        # compare each member with the dissimilar ones seen before, rather than every pair
+        leaders: list[int] = []
+        for i in members:
+            for leader in leaders:
+                if find(i) == find(leader):
+                    break
+                if similarity(signatures[keys[i]], signatures[keys[leader]]) >= threshold:
+                    parent[find(i)] = find(leader)
+                    break
+            else:
+                leaders.append(i)
+
+    groups: dict[int, list[K]] = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(find(i), []).append(key)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(
+    manifest_path: Path | str,
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    pages: Mapping | None = None,
+    packs: Mapping | None = None,
+    graph: PackGraph | None = None,
+    cache: ValidationCache | None = None,
+    signatures: Mapping[Path, list[int] | None] | None = None,
+    jobs: int = 1,
+) -> list[DuplicateGroup]:
+    """
+    Groups of pages of a manifest with identical or near-duplicate content.
+
+    Args:
+        manifest_path: Path to ``manifest.yml``; read unless ``pages`` and ``packs`` are given.
+        threshold: Lowest estimated similarity of near-duplicates (``1`` for identical only).
+        cache: Reuse checksums and signatures of files seen before.
+        signatures: Stat signatures of page files by path (needed to use ``cache``).
+        jobs: Worker processes signing page files.
+
+    Returns:
+        Groups in manifest order of their first page. Identical pages form one
+        group; near-duplicates of any of them join it. Empty and unreadable
+        files are not compared.
+    """
+    manifest_path = Path(manifest_path)
+    if pages is None or packs is None:
+        manifest = load_yaml(manifest_path)
+        pages, packs = manifest.get("pages") or {}, manifest.get("packs") or {}
+    graph = graph or PackGraph.from_packs(packs, pages)
+
+    files: dict[str, Path] = {}
+    for title, meta in pages.items():
+        file_rel = meta.get("file") if isinstance(meta, dict) else None
+        if isinstance(file_rel, str) and file_rel:
+            files[title] = manifest_path.parent / file_rel
+    signed = sign_files(list(files.values()), cache=cache, signatures=signatures, jobs=jobs)
+
+    by_checksum: dict[str, list[str]] = {}
+    unique: dict[str, Signature] = {}
+    for title, path in files.items():
+        if signed.get(path, (None, None))[1] is None:
+            continue
+        checksum, sig = signed[path]
+        if checksum not in by_checksum:
+            unique[checksum] = sig
+        by_checksum.setdefault(checksum, []).append(title)
+
+    near = similar_groups(unique, threshold) if threshold < 1 else []
+    grouped = {checksum for group in near for checksum in group}
+    groups = near + [[checksum] for checksum in by_checksum if checksum not in grouped]
+
+    order = {title: i for i, title in enumerate(pages)}
+    duplicates = []
+    for group in groups:
+        titles = [title for checksum in group for title in by_checksum[checksum]]
+        if len(titles) < 2:
+            continue
+        first = unique[group[0]]
+        duplicates.append(
+            DuplicateGroup(
+                pages=sorted(titles, key=order.__getitem__),
+                packs=_packs_of(graph, titles),
+                similarity=min(similarity(first, unique[checksum]) for checksum in group),
+                identical=len(group) == 1,
+            )
+        )
+    return sorted(duplicates, key=lambda d: order[d.pages[0]])
+
+
+def _packs_of(graph: PackGraph, titles: Iterable[str]) -> list[str]:
+    owners = {
+        pack
+        for title in titles
+        if title in graph.page_index
+        for pack in graph.packs_of(graph.page_index[title])
+    }
+    return [graph.pack_ids[pack] for pack in sorted(owners)]
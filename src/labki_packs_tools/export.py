@@ -0,0 +1,307 @@
+"""
+Stream packs out as MediaWiki XML exports (export-0.11).
+
+The inverse of `labki_packs_tools.ingest`: pages of a pack and of every pack
+it transitively ``depends_on`` are written straight from the page files into
+XML that `Special:Import` / ``importDump.php`` accept.
+
+Nothing is buffered beyond the page currently being written, and the output
+can be split into several complete XML documents that each stay under a byte
+limit, e.g. the wiki's upload size limit.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+from xml.sax.saxutils import escape
+
+from labki_packs_tools.manifest import Manifest
+from labki_packs_tools.utils import PackGraph
+
+EXPORT_NS = "http://www.mediawiki.org/xml/export-0.11/"
+
+NAMESPACES: dict[str, int] = {
+    "Media": -2,
+    "Special": -1,
+    "Main": 0,
+    "Talk": 1,
+    "User": 2,
+    "User talk": 3,
+    "Project": 4,
+    "File": 6,
+    "MediaWiki": 8,
+    "Template": 10,
+    "Help": 12,
+    "Category": 14,
+    "Property": 102,
+    "Form": 106,
+    "Concept": 108,
+    "Module": 828,
+}
+"""Namespace ids for the prefixes used in content packs (core, SMW, PageForms, Scribunto)"""
+
+_CONTENT_MODELS = {
+    ".lua": ("Scribunto", "text/plain"),
+    ".css": ("css", "text/css"),
+    ".js": ("javascript", "text/javascript"),
+}
+_WIKITEXT = ("wikitext", "text/x-wiki")
+
+
+@dataclass
+class ExportSource:
+    """A page to export, read lazily from its file."""
+
+    title: str
+    file: Path
+    timestamp: str
+
+    @property
+    def namespace(self) -> int:
+        prefix = self.title.split(":", 1)[0] if ":" in self.title else "Main"
+        return NAMESPACES.get(prefix, 0)
+
+    @property
+    def content_model(self) -> tuple[str, str]:
+        if self.namespace == NAMESPACES["MediaWiki"]:
+            suffix = Path(self.title).suffix
+        else:
+            suffix = self.file.suffix
+        return _CONTENT_MODELS.get(suffix, _WIKITEXT)
+
+    def to_xml(self, comment: str | None = None) -> str:
+        """Render the ``<page>`` element; reads the page file."""
+        raw = self.file.read_bytes()
+        model, fmt = self.content_model
+        lines = [
+            "  <page>",
+            f"    <title>{escape(self.title)}</title>",
+            f"    <ns>{self.namespace}</ns>",
+            "    <revision>",
+            f"      <timestamp>{self.timestamp}</timestamp>",
+            "      <contributor>",
+            "        <username>labki</username>",
+            "      </contributor>",
+        ]
+        if comment:
+            lines.append(f"      <comment>{escape(comment)}</comment>")
+        lines += [
+            f"      <model>{model}</model>",
+            f"      <format>{fmt}</format>",
+            f'      <text bytes="{len(raw)}" xml:space="preserve">'
+            f"{escape(raw.decode('utf-8'))}</text>",
+            "    </revision>",
+            "  </page>",
+            "",
+        ]
+        return "\n".join(lines)
+
+
+def pack_closure(graph: PackGraph, pack_id: str) -> list[str]:
+    """
+    A pack and everything it transitively ``depends_on``, dependencies first.
+
+    Raises:
+        KeyError: If the pack is not in the graph.
+    """
+    if pack_id not in graph.pack_index:
+        raise KeyError(f"Unknown pack: {pack_id}")
+    members = set(graph.reachable([graph.pack_index[pack_id]]))
+    ordered = [i for i in graph.topological_order() if i in members]
+    # packs on a dependency cycle never enter the topological order
+    ordered += sorted(members.difference(ordered))
+    return [graph.pack_ids[i] for i in ordered]
+
+
+def iter_pack_sources(
+    manifest: Manifest, repo_dir: Path, pack_ids: Iterable[str]
+) -> Iterator[ExportSource]:
+    """Yield each page of the given packs once, in pack and then page order."""
+    seen: set[str] = set()
+    for pack_id in pack_ids:
+        for title in manifest.packs[pack_id].pages:
+            if title in seen:
+                continue
+            seen.add(title)
+            page = manifest.pages.get(title)
+            if page is None:
+                raise KeyError(f"Pack '{pack_id}' references unknown page title: {title}")
+            file = repo_dir / page.file
+            if not file.exists():
+                raise FileNotFoundError(f"Page file not found: {page.file} (for {title})")
+            yield ExportSource(
+                title=title,
+                file=file,
+                timestamp=page.last_updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            )
+
+
+class ExportWriter:
+    """
+    Write export XML to one stream, or to size-capped numbered files.
+
+    With ``max_bytes`` set, a new document is started whenever the next page
+    would push the current one over the limit. A single page larger than the
+    limit is written to a document of its own.
+    Used as a context manager, an exception discards the output (see `abort`).
+    """
+
+    def __init__(
+        self,
+        output: Path | None,
+        *,
+        site_name: str = "labki",
+        max_bytes: int | None = None,
+    ):
+        self.output = output
+        self.site_name = site_name
+        self.max_bytes = max_bytes
+        self.paths: list[Path] = []
+        self._stream: IO[str] | None = None
+        self._size = 0
+        self._pages_in_doc = 0
+        self._documents = 0
+        self._header = self._render_header()
+        self._footer = "</mediawiki>\n"
+        self._overhead = len(self._header.encode("utf-8")) + len(self._footer.encode("utf-8"))
+
+    def _render_header(self) -> str:
+        namespaces = "\n".join(
+            (
+                f'      <namespace key="{key}" case="first-letter">{escape(name)}</namespace>'
+                if key
+                else f'      <namespace key="{key}" case="first-letter" />'
+            )
+            for name, key in sorted(NAMESPACES.items(), key=lambda kv: kv[1])
+        )
+        return (
+            f'<mediawiki xmlns="{EXPORT_NS}" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            f'xsi:schemaLocation="{EXPORT_NS} http://www.mediawiki.org/xml/export-0.11.xsd" '
+            'version="0.11" xml:lang="en">\n'
+            "  <siteinfo>\n"
+            f"    <sitename>{escape(self.site_name)}</sitename>\n"
+            "    <generator>labki-packs-tools</generator>\n"
+            "    <case>first-letter</case>\n"
+            "    <namespaces>\n"
+            f"{namespaces}\n"
+            "    </namespaces>\n"
+            "  </siteinfo>\n"
+        )
+
+    def _open(self) -> None:
+        if self.output is None:
+            self._stream = sys.stdout
+        else:
+            if self.max_bytes is None:
+                path = self.output
+            else:
+                n = len(self.paths) + 1
+                path = self.output.with_name(f"{self.output.stem}-{n:03d}{self.output.suffix}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._stream = path.open("w", encoding="utf-8", newline="")
+            self.paths.append(path)
+        self._stream.write(self._header)
+        self._documents += 1
+        self._size = self._overhead
+        self._pages_in_doc = 0
+
+    def _close(self) -> None:
+        if self._stream is None:
+            return
+        self._stream.write(self._footer)
+        if self._stream is not sys.stdout:
+            self._stream.close()
+        self._stream = None
+
+    def write_page(self, page_xml: str) -> None:
+        size = len(page_xml.encode("utf-8"))
+        if (
+            self._stream is not None
+            and self.max_bytes is not None
+            and self._pages_in_doc
+            and self._size + size > self.max_bytes
+        ):
+            self._close()
+        if self._stream is None:
+            self._open()
+        self._stream.write(page_xml)
+        self._size += size
+        self._pages_in_doc += 1
+
+    def close(self) -> None:
+        if self._documents == 0:
+            # nothing written: still emit an (empty) valid document
+            self._open()
+        self._close()
+
+    def abort(self) -> None:
+        """
+        Stop without finishing the output: written files are deleted, and a
+        document on stdout is left without its closing tag, so a partial
+        export cannot be imported by mistake.
+        """
+        stream, self._stream = self._stream, None
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+        for path in self.paths:
+            path.unlink(missing_ok=True)
+        self.paths = []
+
+    def __enter__(self) -> ExportWriter:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def export_pack(
+    manifest_path: Path | str,
+    pack_id: str,
+    output: Path | str | None = None,
+    *,
+    max_bytes: int | None = None,
+    include_dependencies: bool = True,
+) -> list[Path]:
+    """
+    Export a pack (and by default its ``depends_on`` closure) as MediaWiki XML.
+
+    Args:
+        manifest_path: Path to ``manifest.yml``; page files are resolved relative to it.
+        pack_id: The pack to export.
+        output: Output file, or ``None``/``"-"`` for stdout.
+        max_bytes: Split the output into numbered files of at most this size.
+        include_dependencies: Also export every pack the pack transitively depends on.
+
+    Returns:
+        The files written (empty when writing to stdout).
+    """
+    manifest_path = Path(manifest_path)
+    manifest = Manifest.from_yaml(manifest_path)
+    if output in (None, "-"):
+        if max_bytes is not None:
+            raise ValueError("Splitting output by size requires an output file")
+        output = None
+    else:
+        output = Path(output)
+
+    if include_dependencies:
+        packs = {pid: pack.model_dump() for pid, pack in manifest.packs.items()}
+        graph = PackGraph.from_packs(packs, manifest.pages)
+        pack_ids = pack_closure(graph, pack_id)
+    else:
+        if pack_id not in manifest.packs:
+            raise KeyError(f"Unknown pack: {pack_id}")
+        pack_ids = [pack_id]
+
+    comment = f"Imported from labki pack '{pack_id}'"
+    with ExportWriter(output, site_name=manifest.name, max_bytes=max_bytes) as writer:
+        for source in iter_pack_sources(manifest, manifest_path.parent, pack_ids):
+            writer.write_page(source.to_xml(comment=comment))
+    return writer.paths
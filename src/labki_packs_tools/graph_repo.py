@@ -3,8 +3,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from labki_packs_tools.utils import (
+    PackGraph,
     categorize_packs,
-    extract_graph,
     load_yaml,
     sanitize_id,
 )
@@ -12,7 +12,7 @@ from labki_packs_tools.utils import (
 
 def emit_dot(manifest: dict) -> str:
     """Emit a Graphviz DOT graph of packs and pages."""
-    pack_ids, page_titles, dep_edges, include_edges = extract_graph(manifest)
+    g = PackGraph.from_manifest(manifest)
     lines: list[str] = []
     lines.append("digraph Manifest {")
     lines.append("  rankdir=LR;")
@@ -31,7 +31,7 @@ def emit_dot(manifest: dict) -> str:
         "other": ("#ECEFF1", "#90A4AE"),
     }
     pack_kinds = categorize_packs(manifest)
-    for pid in pack_ids:
+    for pid in g.pack_ids:
         nid = sanitize_id(f"pack_{pid}")
         label = pid.replace('"', '\\"')
         kind = pack_kinds.get(pid, "other")
@@ -42,7 +42,7 @@ def emit_dot(manifest: dict) -> str:
     lines.append("  }")
     lines.append("  subgraph cluster_pages {")
     lines.append('    label="Pages"; style=rounded; color="#43A047";')
-    for title in page_titles:
+    for title in g.page_titles:
         nid = sanitize_id(f"page_{title}")
         label = title.replace('"', '\\"')
         # Color pages by namespace for better visual grouping
@@ -63,7 +63,7 @@ def emit_dot(manifest: dict) -> str:
         )
     lines.append("  }\n")
     # Edges: depends_on (dep -> pack)
-    for pack_id, dep in dep_edges:
+    for pack_id, dep in g.dep_edges():
         n_pack = sanitize_id(f"pack_{pack_id}")
         n_dep = sanitize_id(f"pack_{dep}")
         # draw from dependency into the dependent pack
@@ -72,7 +72,7 @@ def emit_dot(manifest: dict) -> str:
             '[color="#90A4AE", style=dashed, penwidth=1.2, label="depends_on", fontsize=10];'
         )
     # Edges: includes (page -> pack)
-    for pack_id, title in include_edges:
+    for pack_id, title in g.include_edges():
         n_pack = sanitize_id(f"pack_{pack_id}")
         n_page = sanitize_id(f"page_{title}")
         lines.append(f'  {n_page} -> {n_pack} [color="#64B5F6", penwidth=1.4];')
@@ -82,7 +82,7 @@ def emit_dot(manifest: dict) -> str:
 
 def emit_mermaid(manifest: dict) -> str:
     """Emit a Mermaid graph (for docs/readmes)."""
-    pack_ids, page_titles, dep_edges, include_edges = extract_graph(manifest)
+    g = PackGraph.from_manifest(manifest)
     lines: list[str] = []
     lines.append("graph LR")
     # Node style classes
@@ -102,13 +102,13 @@ def emit_mermaid(manifest: dict) -> str:
     lines.append("  classDef ns_Main fill:#F5F5F5,stroke:#9E9E9E,stroke-width:1px;")
     # Nodes
     pack_kinds = categorize_packs(manifest)
-    for pid in pack_ids:
+    for pid in g.pack_ids:
         nid = sanitize_id(f"pack_{pid}")
         label = pid.replace('"', '\\"')
         kind = pack_kinds.get(pid, "other")
         lines.append(f"  {nid}[{label}]")
         lines.append(f"  class {nid} pack_{kind}")
-    for title in page_titles:
+    for title in g.page_titles:
         nid = sanitize_id(f"page_{title}")
         label = title.replace('"', '\\"')
         ns = title.split(":", 1)[0] if ":" in title else "Main"
@@ -118,14 +118,14 @@ def emit_mermaid(manifest: dict) -> str:
     # Edges (depends_on: dep --> pack)
     edge_styles: list[tuple[int, str]] = []
     edge_index = 0
-    for pack_id, dep in dep_edges:
+    for pack_id, dep in g.dep_edges():
         n_pack = sanitize_id(f"pack_{pack_id}")
         n_dep = sanitize_id(f"pack_{dep}")
         lines.append(f"  {n_dep} --> {n_pack}")
         edge_styles.append((edge_index, "depends_on"))
         edge_index += 1
     # Edges (includes: page --> pack)
-    for pack_id, title in include_edges:
+    for pack_id, title in g.include_edges():
         n_pack = sanitize_id(f"pack_{pack_id}")
         n_page = sanitize_id(f"page_{title}")
         lines.append(f"  {n_page} --> {n_pack}")
@@ -144,7 +144,7 @@ def emit_mermaid(manifest: dict) -> str:
 
 def emit_json(manifest: dict) -> str:
     """Emit a JSON graph for programmatic consumption (e.g., MediaWiki extension)."""
-    pack_ids, page_titles, dep_edges, include_edges = extract_graph(manifest)
+    g = PackGraph.from_manifest(manifest)
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     nodes = []
     pack_styles = {
@@ -164,7 +164,7 @@ def emit_json(manifest: dict) -> str:
         "Main": ("#F5F5F5", "#9E9E9E"),
     }
     pack_kinds = categorize_packs(manifest)
-    for pid in pack_ids:
+    for pid in g.pack_ids:
         fill, border = pack_styles.get(pack_kinds.get(pid, "other"), pack_styles["other"])
         nodes.append(
             {
@@ -174,7 +174,7 @@ def emit_json(manifest: dict) -> str:
                 "style": {"fill": fill, "stroke": border},
             }
         )
-    for title in page_titles:
+    for title in g.page_titles:
         ns = title.split(":", 1)[0] if ":" in title else "Main"
         fill, border = ns_styles.get(ns, ns_styles["Main"])
         nodes.append(
@@ -187,7 +187,7 @@ def emit_json(manifest: dict) -> str:
             }
         )
     edges = []
-    for pack_id, dep in dep_edges:
+    for pack_id, dep in g.dep_edges():
         edges.append(
             {
                 "from": f"pack:{dep}",
@@ -196,7 +196,7 @@ def emit_json(manifest: dict) -> str:
                 "style": {"color": "#90A4AE", "dashed": True, "width": 1.2},
             }
         )
-    for pack_id, title in include_edges:
+    for pack_id, title in g.include_edges():
         edges.append(
             {
                 "from": f"page:{title}",
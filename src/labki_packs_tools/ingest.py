@@ -5,6 +5,7 @@ from pathlib import Path
 
 from pydantic import BaseModel
 
+from labki_packs_tools.assign import AssignmentRules
 from labki_packs_tools.manifest import Manifest
 from labki_packs_tools.types import UTCDateTime
 
@@ -61,12 +62,17 @@ def parse_export(path: Path) -> list[ExportPage]:
     return [ExportPage.from_xml(page) for page in pages]
 
 
-def update_manifest(manifest_path: Path, export_path: Path) -> list[ExportPage]:
+def update_manifest(
+    manifest_path: Path, export_path: Path, rules_path: Path | None = None
+) -> list[ExportPage]:
     """
     Update a manifest from a mediawiki export,
     writing new or updated files,
     and writing an updated copy of the manifest.
 
+    If ``rules_path`` is given, new pages are assigned to packs according to
+    the rules file (see `labki_packs_tools.assign`).
+
     Returns:
         The list of pages that were updated during the update operation
     """
@@ -74,7 +80,8 @@ def update_manifest(manifest_path: Path, export_path: Path) -> list[ExportPage]:
     export_path = Path(export_path)
     repo_dir = manifest_path.parent
     manifest = Manifest.from_yaml(manifest_path)
-    updated = manifest.update_from_export(export_path, repo_dir)
+    matcher = AssignmentRules.from_yaml(rules_path).compile() if rules_path else None
+    updated = manifest.update_from_export(export_path, repo_dir, matcher=matcher)
     if not updated:
         return []
     manifest.last_updated = datetime.now(UTC)
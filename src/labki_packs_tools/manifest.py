@@ -16,9 +16,12 @@ from typing import TYPE_CHECKING, Union
 import yaml
 from pydantic import BaseModel, Field
 
+from labki_packs_tools.checksum import file_checksum
 from labki_packs_tools.types import UTCDateTime
+from labki_packs_tools.utils import bump_version
 
 if TYPE_CHECKING:
+    from labki_packs_tools.assign import PackMatcher
     from labki_packs_tools.ingest import ExportPage
 
 
@@ -26,6 +29,7 @@ class ManifestPage(BaseModel):
     file: str
     last_updated: UTCDateTime
     description: str | None = None
+    checksum: str | None = None
 
 
 class ManifestPack(BaseModel):
@@ -56,7 +60,10 @@ class Manifest(BaseModel):
             yaml.safe_dump(dumped, f)
 
     def update_from_export(
-        self, export_path: Path | str, repo_dir: Path | str
+        self,
+        export_path: Path | str,
+        repo_dir: Path | str,
+        matcher: Union["PackMatcher", None] = None,
     ) -> list["ExportPage"]:
         """
         Update a manifest from a mediawiki export .xml file
@@ -64,6 +71,8 @@ class Manifest(BaseModel):
         Args:
             export_path (Path | str): Path to the export .xml file
             repo_dir (Path | str): Root directory that contains `manifest.yml` and `pages`
+            matcher (PackMatcher | None): If given, pages that are new to the manifest
+                are added to the pack selected by the matcher (see `assign_pages`)
 
         Returns:
             A list of `ExportPage` objects for which the entry in the manifest was updated
@@ -72,16 +81,53 @@ class Manifest(BaseModel):
 
         export_path = Path(export_path)
         repo_dir = Path(repo_dir)
+        if matcher is not None:
+            unknown = sorted(matcher.packs - set(self.packs))
+            if unknown:
+                raise ValueError(f"Assignment rules target unknown pack(s): {', '.join(unknown)}")
         repo_dir.mkdir(exist_ok=True, parents=True)
 
         pages = parse_export(export_path)
         updated = []
+        new_pages = []
         for page in pages:
+            is_new = page.name not in self.pages
             p = self._update_page(page, repo_dir)
             if p is not None:
                 updated.append(p)
+                if is_new:
+                    new_pages.append(p)
+
+        if matcher is not None:
+            self.assign_pages(new_pages, matcher)
         return updated
 
+    def assign_pages(
+        self, pages: list["ExportPage"], matcher: "PackMatcher"
+    ) -> dict[str, list[str]]:
+        """
+        Add pages to the packs selected by `matcher`, in a single pass.
+
+        Pages already listed in their target pack are left alone.
+        Every pack that gains pages has its minor version bumped once.
+
+        Returns:
+            Mapping of pack id to the page titles that were added to it
+        """
+        assigned: dict[str, list[str]] = {}
+        for page in pages:
+            pack_id = matcher.match(page.name, page.content)
+            if pack_id is None or page.name in self.packs[pack_id].pages:
+                continue
+            assigned.setdefault(pack_id, []).append(page.name)
+
+        for pack_id, titles in assigned.items():
+            pack = self.packs[pack_id]
+            # assign rather than mutate so the fields count as set when dumping
+            pack.pages = pack.pages + titles
+            pack.version = bump_version(pack.version)
+        return assigned
+
     def _update_page(self, page: "ExportPage", repo_dir: Path | str) -> Union["ExportPage", None]:
         """
         Update a single page from an exported .xml file page,
@@ -95,12 +141,14 @@ class Manifest(BaseModel):
             self.pages[page.name] = ManifestPage(
                 file=str(page_path.relative_to(repo_dir)),
                 last_updated=page.last_updated,
+                checksum=file_checksum(page_path),
             )
             return page
         elif page.last_updated > self.pages[page.name].last_updated:
             page_path = repo_dir / self.pages[page.name].file
             page.write(page_path)
             self.pages[page.name].last_updated = page.last_updated
+            self.pages[page.name].checksum = file_checksum(page_path)
             return page
         else:
             # no update performed
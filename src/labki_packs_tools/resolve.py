@@ -0,0 +1,238 @@
+"""
+Resolve what installing packs takes: their dependency closure, install waves and pages.
+
+`PackResolver` computes the transitive ``depends_on`` closure of every pack
+at once. Closures are bitsets (Python ints, bit ``i`` for pack id ``i`` of the
+`PackGraph`), computed once per strongly connected component with
+dependencies first, so each closure is the union of its direct dependencies'
+closures: a few big-int ORs per edge rather than one traversal per pack.
+
+Packs are installed in *waves*: a pack's wave is one more than the highest
+wave of its dependencies, so the packs of one wave only depend on earlier
+waves and can be imported concurrently. Waves come from the longest
+dependency chain below each pack, which gives the fewest waves possible.
+
+The same closures give the transitive reduction of the graph: a
+``depends_on`` entry is redundant if the pack already gets the dependency
+through another of its dependencies (`PackResolver.redundant_dependencies`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from labki_packs_tools.utils import PackGraph, load_yaml, update_yaml
+
+
+@dataclass
+class Resolution:
+    packs: list[str]
+    """Packs asked for"""
+    waves: list[list[str]] = field(default_factory=list)
+    """Packs of the closure by install wave, dependencies first; manifest order within a wave"""
+    pages: list[str] = field(default_factory=list)
+    """Pages of the closure's packs, each once, in install order"""
+    unknown_deps: list[tuple[str, str]] = field(default_factory=list)
+    """``(pack, dependency)`` pairs of the closure naming packs the manifest does not define"""
+
+    @property
+    def order(self) -> list[str]:
+        """Packs of the closure in a topological install order."""
+        return [pack for wave in self.waves for pack in wave]
+
+
+@dataclass
+class RedundantDependency:
+    pack: str
+    dependency: str
+    """Listed in the pack's ``depends_on``"""
+    via: str
+    """Another dependency of the pack that (transitively) depends on ``dependency``"""
+
+
+def _members(bits: int) -> list[int]:
+    """Positions of the set bits of ``bits``, ascending."""
+    return [i for i, bit in enumerate(reversed(bin(bits))) if bit == "1"]
+
+
+class PackResolver:
+    """
+    Dependency closures and install waves of every pack of a `PackGraph`.
+
+    All closures are computed when the resolver is created; `resolve` then
+    only combines bitsets and lists the result.
+    """
+
+    def __init__(self, graph: PackGraph):
+        self.graph = graph
+        n = graph.n_packs
+        self._closures: list[int] = [0] * n
+        self._waves: list[int] = [0] * n
+        # closure without the pack's own component: what it reaches through a dependency
+        self._below: list[int] = [0] * n
+        self._cyclic = 0
+        self._cycles: list[list[int]] = []
+
+        component_of = [0] * n
+        # dependencies come in earlier components, so their closures are complete
+        for c, component in enumerate(graph.strongly_connected_components()):
+            own = 0
+            for pack in component:
+                component_of[pack] = c
+                own |= 1 << pack
+            bits, wave = own, 0
+            for pack in component:
+                for dep in graph.dependencies(pack):
+                    bits |= self._closures[dep]
+                    if component_of[dep] != c:
+                        wave = max(wave, self._waves[dep] + 1)
+            if graph.cycle_path(component):
+                self._cyclic |= own
+                self._cycles.append(component)
+            for pack in component:
+                self._closures[pack] = bits
+                self._below[pack] = bits & ~own
+                self._waves[pack] = wave
+
+    @classmethod
+    def from_manifest(cls, manifest_path: Path | str) -> PackResolver:
+        manifest = load_yaml(Path(manifest_path))
+        packs = manifest.get("packs") or {}
+        return cls(PackGraph.from_packs(packs, manifest.get("pages") or {}))
+
+    def closure(self, pack_ids: Iterable[str]) -> list[str]:
+        """
+        The packs and everything they transitively ``depends_on``, in manifest order.
+
+        Raises:
+            KeyError: If a pack is not in the graph.
+        """
+        return [self.graph.pack_ids[i] for i in _members(self._closure_bits(pack_ids))]
+
+    def resolve(self, pack_ids: Iterable[str]) -> Resolution:
+        """
+        What installing the packs together takes.
+
+        Raises:
+            KeyError: If a pack is not in the graph.
+            ValueError: If the closure contains a dependency cycle, so no
+                install order exists.
+        """
+        pack_ids = list(dict.fromkeys(pack_ids))
+        bits = self._closure_bits(pack_ids)
+        if bits & self._cyclic:
+            component = next(c for c in self._cycles if bits >> c[0] & 1)
+            path = " -> ".join(self.graph.pack_ids[i] for i in self.graph.cycle_path(component))
+            raise ValueError(f"Cannot resolve {', '.join(pack_ids)}: dependency cycle {path}")
+
+        members = _members(bits)
+        # every wave up to the last is non-empty: a pack's wave is one past a dependency's
+        waves: list[list[str]] = [[] for _ in {self._waves[i] for i in members}]
+        for i in members:
+            waves[self._waves[i]].append(self.graph.pack_ids[i])
+
+        pages: dict[str, None] = {}
+        for wave in waves:
+            for pack in wave:
+                for page in self.graph.pages_of(self.graph.pack_index[pack]):
+                    pages.setdefault(self.graph.page_titles[page])
+        in_closure = {self.graph.pack_ids[i] for i in members}
+        return Resolution(
+            packs=pack_ids,
+            waves=waves,
+            pages=list(pages),
+            unknown_deps=[(p, dep) for p, dep in self.graph.unknown_deps if p in in_closure],
+        )
+
+    def redundant_dependencies(self) -> list[RedundantDependency]:
+        """
+        ``depends_on`` entries implied by the pack's other dependencies, in manifest order.
+
+        Removing all of them leaves the transitive reduction of the graph:
+        every closure stays the same. Dependencies of packs on a cycle, and
+        entries only implied through a cycle they are on, are kept (the cycle
+        is an error of its own). A pack without pages keeps at least two
+        ``depends_on`` entries, as the manifest schema requires.
+        """
+        graph = self.graph
+        # ``depends_on`` entries as listed, unknown packs included
+        listed = graph.dependency_counts()
+        for pid, _ in graph.unknown_deps:
+            listed[graph.pack_index[pid]] += 1
+        with_pages = {graph.pack_index[pid] for pid, _ in graph.unknown_pages}
+        redundant = []
+        for pack in range(graph.n_packs):
+            if self._cyclic >> pack & 1:
+                continue
+            entries = list(graph.dependencies(pack))
+            deps = list(dict.fromkeys(entries))
+            implied = 0
+            for dep in deps:
+                implied |= self._below[dep]
+            pageless = not graph.pages_of(pack) and pack not in with_pages
+            left = listed[pack]
+            for dep in deps:
+                if not implied >> dep & 1:
+                    continue
+                if pageless:
+                    if left - entries.count(dep) < 2:
+                        continue
+                    left -= entries.count(dep)
+                via = next(other for other in deps if self._below[other] >> dep & 1)
+                redundant.append(
+                    RedundantDependency(
+                        graph.pack_ids[pack], graph.pack_ids[dep], graph.pack_ids[via]
+                    )
+                )
+        return redundant
+
+    def _closure_bits(self, pack_ids: Iterable[str]) -> int:
+        bits = 0
+        for pack_id in pack_ids:
+            if pack_id not in self.graph.pack_index:
+                raise KeyError(f"Unknown pack: {pack_id}")
+            bits |= self._closures[self.graph.pack_index[pack_id]]
+        return bits
+
+
+def remove_redundant_dependencies(
+    manifest_path: Path | str, *, write: bool = True
+) -> list[RedundantDependency]:
+    """
+    Remove the ``depends_on`` entries of a manifest that other dependencies imply.
+
+    Args:
+        manifest_path: Path to ``manifest.yml``.
+        write: Write the updated manifest; if False, only report what would change.
+
+    Only the affected ``depends_on`` lists of the file are rewritten; the rest
+    of the manifest (other fields, comments, key order) is kept as is.
+
+    Returns:
+        The removed entries, in manifest order.
+
+    Raises:
+        ValueError: If the manifest is not a mapping with a ``packs`` mapping.
+    """
+    manifest_path = Path(manifest_path)
+    manifest = load_yaml(manifest_path)
+    packs = manifest.get("packs") if isinstance(manifest, dict) else None
+    if not isinstance(packs, dict):
+        raise ValueError(f"No packs mapping in {manifest_path}")
+    redundant = PackResolver(PackGraph.from_packs(packs)).redundant_dependencies()
+    if redundant and write:
+        removed: dict[str, set[str]] = {}
+        for entry in redundant:
+            removed.setdefault(entry.pack, set()).add(entry.dependency)
+        update_yaml(
+            manifest_path,
+            {
+                ("packs", pack, "depends_on"): [
+                    dep for dep in packs[pack]["depends_on"] if dep not in deps
+                ]
+                for pack, deps in removed.items()
+            },
+        )
+    return redundant
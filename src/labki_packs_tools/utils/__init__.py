@@ -1,21 +1,29 @@
 from .common import (
     SEMVER_RE,
     UniqueKeyLoader,
+    bump_version,
     categorize_packs,
+    edit_yaml,
     extract_graph,
     is_semver,
     load_json,
     load_yaml,
     sanitize_id,
+    update_yaml,
 )
+from .graph import PackGraph
 
 __all__ = [
+    "PackGraph",
     "SEMVER_RE",
     "UniqueKeyLoader",
+    "bump_version",
     "categorize_packs",
+    "edit_yaml",
     "extract_graph",
     "is_semver",
     "load_json",
     "load_yaml",
     "sanitize_id",
+    "update_yaml",
 ]
@@ -3,9 +3,12 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
+from typing import Any, Mapping
 
 import yaml
 
+from labki_packs_tools.utils.graph import PackGraph
+
 
 class UniqueKeyLoader(yaml.SafeLoader):
     """YAML loader that raises on duplicate mapping keys to prevent silent overrides."""
@@ -31,6 +34,107 @@ def load_yaml(path: Path) -> dict | list:
         return yaml.load(f, Loader=UniqueKeyLoader)
 
 
+def edit_yaml(text: str, values: Mapping[tuple[str, ...], Any]) -> str:
+    """
+    Set values in a YAML document by editing only their text.
+
+    Everything else (comments, key order, quoting, other fields) is kept, so a
+    rewritten file differs from the original only where values changed. Only
+    comments between the items of a replaced block sequence are lost.
+
+    Args:
+        text: The YAML document.
+        values: New values by key path from the root mapping, e.g.
+            ``("packs", "base", "depends_on")``. A missing last key is added
+            after the last entry of its mapping; the other keys must exist.
+
+    Raises:
+        KeyError: If a key of a path (other than the last) does not exist.
+        ValueError: If a path does not lead through mappings.
+    """
+    root = yaml.compose(text, Loader=yaml.SafeLoader)
+    edits: list[tuple[int, int, str]] = []
+    for path, value in values.items():
+        parent = root
+        for key in path[:-1]:
+            parent = _yaml_entry(parent, key, path)[1]
+        key_node, node = _yaml_entry(parent, path[-1], path, missing_ok=True)
+        if node is None:
+            # add the key after the mapping's last entry
+            if not parent.value:
+                end = parent.end_mark.index - 1  # before the closing brace of ``{}``
+                edits.append((end, end, f"{_yaml_scalar(path[-1])}: {_yaml_scalar(value)}"))
+                continue
+            first_key, last_value = parent.value[0][0], parent.value[-1][1]
+            end = _yaml_end(text, last_value)
+            if parent.flow_style:
+                entry = f", {_yaml_scalar(path[-1])}: {_yaml_scalar(value)}"
+            else:
+                indent = " " * first_key.start_mark.column
+                entry = f"\n{indent}{_yaml_scalar(path[-1])}: {_yaml_scalar(value)}"
+            edits.append((end, end, entry))
+        elif (
+            isinstance(node, yaml.SequenceNode)
+            and not node.flow_style
+            and node.value
+            and isinstance(value, list)
+            and value
+        ):
+            # keep a block sequence a block sequence
+            indent = "\n" + " " * node.start_mark.column
+            items = indent.join(f"- {_yaml_scalar(item)}" for item in value)
+            edits.append((node.start_mark.index, _yaml_end(text, node), items))
+        elif (isinstance(node, yaml.CollectionNode) and not node.flow_style) or not node.value:
+            # empty block collections and empty values: rewrite from the key's colon on
+            edits.append(
+                (key_node.end_mark.index, _yaml_end(text, node), f": {_yaml_scalar(value)}")
+            )
+        else:
+            edits.append((node.start_mark.index, _yaml_end(text, node), _yaml_scalar(value)))
+
+    for start, end, replacement in sorted(edits, reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def update_yaml(path: Path, values: Mapping[tuple[str, ...], Any]) -> None:
+    """Set values in a YAML file with `edit_yaml`."""
+    text = path.read_text(encoding="utf-8")
+    path.write_text(edit_yaml(text, values), encoding="utf-8")
+
+
+def _yaml_entry(
+    node: yaml.Node, key: str, path: tuple[str, ...], *, missing_ok: bool = False
+) -> tuple[yaml.Node | None, yaml.Node | None]:
+    if not isinstance(node, yaml.MappingNode):
+        raise ValueError(f"Not a mapping at {key!r} of {'.'.join(path)}")
+    for key_node, value_node in node.value:
+        if isinstance(key_node, yaml.ScalarNode) and key_node.value == key:
+            return key_node, value_node
+    if missing_ok:
+        return None, None
+    raise KeyError(key)
+
+
+def _yaml_end(text: str, node: yaml.Node) -> int:
+    """End of a node's text, without trailing whitespace or the comments after a block."""
+    if isinstance(node, yaml.CollectionNode) and not node.flow_style and node.value:
+        last = node.value[-1]
+        return _yaml_end(text, last[1] if isinstance(last, tuple) else last)
+    end = node.end_mark.index
+    while end > node.start_mark.index and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def _yaml_scalar(value: Any) -> str:
+    """A value in flow style, on one line."""
+    dumped = yaml.safe_dump(
+        value, default_flow_style=True, allow_unicode=True, sort_keys=False, width=float("inf")
+    )
+    return dumped.removesuffix("\n...\n").rstrip("\n")
+
+
 def load_json(path: Path) -> dict | list:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
@@ -45,6 +149,24 @@ def is_semver(value: object) -> bool:
     return isinstance(value, str) and bool(SEMVER_RE.match(value or ""))
 
 
+def bump_version(version: str, part: str = "minor") -> str:
+    """
+    Bump a MAJOR.MINOR.PATCH version, resetting the lower components.
+
+    Non-semver values are returned unchanged (the validator reports them).
+    """
+    if not is_semver(version):
+        return version
+    major, minor, patch = (int(x) for x in version.split("."))
+    if part == "major":
+        return f"{major + 1}.0.0"
+    elif part == "minor":
+        return f"{major}.{minor + 1}.0"
+    elif part == "patch":
+        return f"{major}.{minor}.{patch + 1}"
+    raise ValueError(f"Unknown version part '{part}', expected major, minor or patch")
+
+
 def sanitize_id(raw: str) -> str:
     """Sanitize a string into a DOT-safe identifier (letters, digits, underscore)."""
     return re.sub(r"[^A-Za-z0-9_]", "_", raw)
@@ -59,20 +181,13 @@ def extract_graph(
     - dep_edges: (from_pack, to_pack) as recorded in manifest (depends_on)
     - include_edges: (pack, page)
     """
-    packs_dict = manifest.get("packs") or {}
-    pages_dict = manifest.get("pages") or {}
-    pack_ids = list(packs_dict.keys())
-    page_titles = list(pages_dict.keys())
-    dep_edges: list[tuple[str, str]] = []
-    include_edges: list[tuple[str, str]] = []
-    for pid, meta in packs_dict.items():
-        for dep in meta.get("depends_on", []) or []:
-            if dep in packs_dict:
-                dep_edges.append((pid, dep))
-        for title in meta.get("pages", []) or []:
-            if title in pages_dict:
-                include_edges.append((pid, title))
-    return pack_ids, page_titles, dep_edges, include_edges
+    graph = PackGraph.from_manifest(manifest)
+    return (
+        graph.pack_ids,
+        graph.page_titles,
+        list(graph.dep_edges()),
+        list(graph.include_edges()),
+    )
 
 
 def categorize_packs(manifest: dict) -> dict[str, str]:
@@ -0,0 +1,315 @@
+"""
+Compact, integer-indexed representation of the pack/page graph.
+
+Pack ids and page titles are interned to dense integers, and the
+``depends_on`` and ``includes`` relations are stored as CSR
+(compressed sparse row) adjacency in ``array`` buffers, in both directions:
+
+- ``depends_on``:  pack -> packs it depends on, and the reverse (dependents)
+- ``includes``:    pack -> pages it lists, and the reverse (owning packs)
+
+Edges keep manifest order, so iterating a row yields the same sequence as
+the ``depends_on`` / ``pages`` lists in the manifest.
+Dependencies on unknown packs and references to unknown pages are not part of
+the graph; they are recorded in ``unknown_deps`` / ``unknown_pages`` instead.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, Mapping, Sequence
+
+
+def _csr(n_rows: int, src: array, dst: array) -> tuple[array, array]:
+    """Build CSR ``(offsets, targets)`` from parallel edge arrays, keeping edge order."""
+    offsets = array("i", bytes(4 * (n_rows + 1)))
+    for s in src:
+        offsets[s + 1] += 1
+    for i in range(n_rows):
+        offsets[i + 1] += offsets[i]
+    targets = array("i", bytes(4 * len(dst)))
+    cursor = offsets[:-1]
+    for s, d in zip(src, dst):
+        targets[cursor[s]] = d
+        cursor[s] += 1
+    return offsets, targets
+
+
+class PackGraph:
+    """
+    Integer-indexed pack/page graph with forward and reverse CSR adjacency.
+
+    Build with `PackGraph.from_manifest` or `PackGraph.from_packs`.
+    Node ids are positions in ``pack_ids`` / ``page_titles``.
+    """
+
+    __slots__ = (
+        "pack_ids",
+        "page_titles",
+        "pack_index",
+        "page_index",
+        "unknown_deps",
+        "unknown_pages",
+        "_deps",
+        "_dependents",
+        "_includes",
+        "_owners",
+    )
+
+    def __init__(
+        self,
+        pack_ids: Sequence[str],
+        page_titles: Sequence[str],
+        dep_edges: tuple[array, array],
+        include_edges: tuple[array, array],
+        unknown_deps: list[tuple[str, str]] | None = None,
+        unknown_pages: list[tuple[str, str]] | None = None,
+    ):
+        self.pack_ids: list[str] = list(pack_ids)
+        self.page_titles: list[str] = list(page_titles)
+        self.pack_index: dict[str, int] = {pid: i for i, pid in enumerate(self.pack_ids)}
+        self.page_index: dict[str, int] = {t: i for i, t in enumerate(self.page_titles)}
+        self.unknown_deps: list[tuple[str, str]] = unknown_deps or []
+        self.unknown_pages: list[tuple[str, str]] = unknown_pages or []
+
+        n_packs = len(self.pack_ids)
+        n_pages = len(self.page_titles)
+        dep_src, dep_dst = dep_edges
+        inc_src, inc_dst = include_edges
+        self._deps = _csr(n_packs, dep_src, dep_dst)
+        self._dependents = _csr(n_packs, dep_dst, dep_src)
+        self._includes = _csr(n_packs, inc_src, inc_dst)
+        self._owners = _csr(n_pages, inc_dst, inc_src)
+
+    # ─── Construction ────────────────────────────
+    @classmethod
+    def from_manifest(cls, manifest: Mapping) -> PackGraph:
+        """Build the graph from a loaded manifest dict."""
+        return cls.from_packs(manifest.get("packs") or {}, manifest.get("pages") or {})
+
+    @classmethod
+    def from_packs(cls, packs: Mapping, pages: Mapping | Sequence[str] = ()) -> PackGraph:
+        """
+        Build the graph from the ``packs`` mapping and the known page titles.
+
+        Args:
+            packs: Mapping of pack id to pack metadata (``depends_on``, ``pages``).
+            pages: Page registry (or any iterable of page titles).
+        """
+        pack_ids = list(packs or {})
+        page_titles = list(pages or ())
+        pack_index = {pid: i for i, pid in enumerate(pack_ids)}
+        page_index = {t: i for i, t in enumerate(page_titles)}
+
+        dep_src, dep_dst = array("i"), array("i")
+        inc_src, inc_dst = array("i"), array("i")
+        unknown_deps: list[tuple[str, str]] = []
+        unknown_pages: list[tuple[str, str]] = []
+        for i, pid in enumerate(pack_ids):
+            meta = packs[pid]
+            if not isinstance(meta, Mapping):
+                continue
+            for dep in meta.get("depends_on", []) or []:
+                j = pack_index.get(dep) if isinstance(dep, str) else None
+                if j is None:
+                    unknown_deps.append((pid, dep))
+                else:
+                    dep_src.append(i)
+                    dep_dst.append(j)
+            titles = meta.get("pages", []) or []
+            if not isinstance(titles, list):
+                continue
+            for title in titles:
+                k = page_index.get(title) if isinstance(title, str) else None
+                if k is None:
+                    unknown_pages.append((pid, title))
+                else:
+                    inc_src.append(i)
+                    inc_dst.append(k)
+
+        return cls(
+            pack_ids,
+            page_titles,
+            (dep_src, dep_dst),
+            (inc_src, inc_dst),
+            unknown_deps=unknown_deps,
+            unknown_pages=unknown_pages,
+        )
+
+    # ─── Sizes ───────────────────────────────────
+    @property
+    def n_packs(self) -> int:
+        return len(self.pack_ids)
+
+    @property
+    def n_pages(self) -> int:
+        return len(self.page_titles)
+
+    # ─── Adjacency (integer ids) ─────────────────
+    @staticmethod
+    def _row(csr: tuple[array, array], i: int) -> array:
+        offsets, targets = csr
+        return targets[offsets[i] : offsets[i + 1]]
+
+    def dependencies(self, pack: int) -> array:
+        """Packs that ``pack`` depends on (forward ``depends_on``)."""
+        return self._row(self._deps, pack)
+
+    def dependents(self, pack: int) -> array:
+        """Packs that depend on ``pack`` (reverse ``depends_on``)."""
+        return self._row(self._dependents, pack)
+
+    def pages_of(self, pack: int) -> array:
+        """Pages included by ``pack``."""
+        return self._row(self._includes, pack)
+
+    def packs_of(self, page: int) -> array:
+        """Packs that include ``page``."""
+        return self._row(self._owners, page)
+
+    def dependency_counts(self) -> array:
+        """Number of (known) dependencies of every pack, indexed by pack id."""
+        offsets = self._deps[0]
+        return array("i", (offsets[i + 1] - offsets[i] for i in range(self.n_packs)))
+
+    # ─── Traversal ───────────────────────────────
+    def reachable(self, starts: Sequence[int], *, reverse: bool = False) -> list[int]:
+        """
+        Packs reachable from ``starts`` through ``depends_on`` edges (including ``starts``).
+
+        With ``reverse=True`` follows dependents instead, i.e. everything that
+        (transitively) depends on ``starts``. Returned in discovery order.
+        """
+        offsets, targets = self._dependents if reverse else self._deps
+        seen = bytearray(self.n_packs)
+        order: list[int] = []
+        stack = list(dict.fromkeys(starts))
+        for s in stack:
+            seen[s] = 1
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for nxt in targets[offsets[node] : offsets[node + 1]]:
+                if not seen[nxt]:
+                    seen[nxt] = 1
+                    stack.append(nxt)
+        return order
+
+    def topological_order(self) -> list[int]:
+        """
+        Kahn's algorithm over ``depends_on``: dependencies come before dependents.
+
+        If the graph has a cycle, the packs on or behind it are missing from the
+        result, so ``len(order) < n_packs`` signals a cycle.
+        """
+        indeg = self.dependency_counts()
+        offsets, targets = self._dependents
+        queue = [i for i in range(self.n_packs) if indeg[i] == 0]
+        head = 0
+        while head < len(queue):
+            current = queue[head]
+            head += 1
+            for neighbor in targets[offsets[current] : offsets[current + 1]]:
+                indeg[neighbor] -= 1
+                if indeg[neighbor] == 0:
+                    queue.append(neighbor)
+        return queue
+
+    def strongly_connected_components(self) -> list[list[int]]:
+        """
+        Tarjan's algorithm over ``depends_on``, in linear time and without recursion.
+
+        Every pack is in exactly one component; a component of more than one
+        pack, or of a pack that depends on itself, is a dependency cycle.
+        Components come after the components they depend on, and list their
+        packs in manifest order.
+        """
+        offsets, targets = self._deps
+        n = self.n_packs
+        index = array("i", [-1]) * n
+        low = array("i", bytes(4 * n))
+        on_stack = bytearray(n)
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # (pack, position of its next dependency in ``targets``)
+            work = [(root, offsets[root])]
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    nxt = targets[edge]
+                    if index[nxt] == -1:
+                        index[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack[nxt] = 1
+                        work.append((nxt, offsets[nxt]))
+                    elif on_stack[nxt] and index[nxt] < low[node]:
+                        low[node] = index[nxt]
+                    continue
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+        return components
+
+    def cycle_path(self, component: Sequence[int]) -> list[int]:
+        """
+        A shortest dependency cycle through the first pack of a strongly connected component.
+
+        Returns the packs along the cycle, starting and ending with ``component[0]``
+        (``[a, a]`` for a pack that depends on itself), or ``[]`` if there is none.
+        """
+        if not component:
+            return []
+        start = component[0]
+        members = set(component)
+        offsets, targets = self._deps
+        previous: dict[int, int] = {}
+        frontier = [start]
+        while frontier:
+            following = []
+            for node in frontier:
+                for nxt in targets[offsets[node] : offsets[node + 1]]:
+                    if nxt == start:
+                        path = [start, node]
+                        while node != start:
+                            node = previous[node]
+                            path.append(node)
+                        return path[::-1]
+                    if nxt in members and nxt not in previous:
+                        previous[nxt] = node
+                        following.append(nxt)
+            frontier = following
+        return []
+
+    # ─── Edge views (string ids, manifest order) ─
+    def dep_edges(self) -> Iterator[tuple[str, str]]:
+        """``(pack, dependency)`` pairs as recorded in ``depends_on``."""
+        offsets, targets = self._deps
+        for i, pid in enumerate(self.pack_ids):
+            for j in targets[offsets[i] : offsets[i + 1]]:
+                yield pid, self.pack_ids[j]
+
+    def include_edges(self) -> Iterator[tuple[str, str]]:
+        """``(pack, page title)`` pairs as listed in each pack's ``pages``."""
+        offsets, targets = self._includes
+        for i, pid in enumerate(self.pack_ids):
+            for k in targets[offsets[i] : offsets[i + 1]]:
+                yield pid, self.page_titles[k]
@@ -1,7 +1,55 @@
 """Validation framework for Labki content repositories."""
 
-# Optional: expose only the high-level API
-from .repo_validator import validate_repo
-from .schema_resolver import resolve_schema
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["validate_repo", "resolve_schema"]
+if TYPE_CHECKING:
+    from .batch import RepoResult, validate_repos
+    from .repo_validator import validate_repo
+    from .schema_registry import CompiledSchema, compile_schema, load_schema
+    from .schema_resolver import resolve_schema
+    from .scope import ValidationScope, changed_scope
+    from .snapshot import FileSnapshot
+    from .streaming import iter_validate_repo, validate_repo_streaming
+    from .watch import WatchSession
+
+# Optional: expose only the high-level API.
+# Submodules are imported when a name is first used, so importing one light
+# module (e.g. `validation.cache`) doesn't load jsonschema and every validator.
+_EXPORTS = {
+    "validate_repo": "repo_validator",
+    "resolve_schema": "schema_resolver",
+    "load_schema": "schema_registry",
+    "compile_schema": "schema_registry",
+    "CompiledSchema": "schema_registry",
+    "iter_validate_repo": "streaming",
+    "validate_repo_streaming": "streaming",
+    "ValidationScope": "scope",
+    "changed_scope": "scope",
+    "FileSnapshot": "snapshot",
+    "WatchSession": "watch",
+    "validate_repos": "batch",
+    "RepoResult": "batch",
+}
+
+__all__ = [
+    "validate_repo",
+    "resolve_schema",
+    "load_schema",
+    "compile_schema",
+    "CompiledSchema",
+    "iter_validate_repo",
+    "validate_repo_streaming",
+    "ValidationScope",
+    "changed_scope",
+    "FileSnapshot",
+    "WatchSession",
+    "validate_repos",
+    "RepoResult",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
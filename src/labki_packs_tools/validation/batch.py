@@ -0,0 +1,199 @@
+"""
+Validate many content repositories in one invocation.
+
+Each repository is validated by `validate_repo` in a worker process of a
+process pool, so Python startup, imports and schema compilation are paid once
+per worker rather than once per repository. The packaged schemas (and a
+pinned one) are compiled before the pool starts: forked workers inherit them,
+and other start methods compile them once in each worker's initializer.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Iterable
+
+from labki_packs_tools.validation.cache import DEFAULT_MAX_ENTRIES, ValidationCache
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+from labki_packs_tools.validation.schema_registry import load_schema
+from labki_packs_tools.validation.schema_resolver import packaged_schemas
+from labki_packs_tools.validation.scope import changed_scope
+from labki_packs_tools.validation.snapshot import IGNORE_FILE, FileSnapshot, read_ignore_file
+
+MANIFEST_NAME = "manifest.yml"
+"""Manifest file looked for when a directory is given"""
+
+
+@dataclass
+class RepoResult:
+    manifest_path: Path
+    results: ValidationResults
+    notes: list[str] = field(default_factory=list)
+    """Problems that are not validation results (e.g. the cache could not be saved)"""
+
+    @property
+    def rc(self) -> int:
+        return self.results.rc
+
+
+def expand_manifest_paths(args: Iterable[str]) -> list[Path]:
+    """
+    Turn command-line arguments into manifest paths.
+
+    Directories stand for their ``manifest.yml``, and glob patterns (``*``, ``?``,
+    ``[...]``, ``**``) are expanded in sorted order. Each manifest is returned once,
+    in order of first appearance.
+
+    Raises:
+        ValueError: If a path does not exist or a pattern matches nothing.
+    """
+    found: list[Path] = []
+    seen: set[Path] = set()
+    for arg in args:
+        if os.path.exists(arg):
+            matches = [arg]
+        elif glob.has_magic(arg):
+            matches = sorted(glob.glob(arg, recursive=True))
+            if not matches:
+                raise ValueError(f"No manifests match '{arg}'")
+        else:
+            raise ValueError(f"Path '{arg}' does not exist")
+
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                path = path / MANIFEST_NAME
+                if not path.exists():
+                    raise ValueError(f"No {MANIFEST_NAME} in directory '{match}'")
+            key = path.resolve()
+            if key not in seen:
+                seen.add(key)
+                found.append(path)
+    return found
+
+
+def preload_schemas(schema_path: Path | str | None = None) -> None:
+    """Compile the packaged schemas, and ``schema_path``, into this process's registry."""
+    # a broken install or schema is reported by each repository's own validation
+    paths: list[Path | str] = [schema_path] if schema_path else []
+    with contextlib.suppress(RuntimeError):
+        paths = [*packaged_schemas(), *paths]
+    for path in paths:
+        with contextlib.suppress(OSError, ValueError):
+            load_schema(path)
+
+
+def validate_repos(
+    manifest_paths: Iterable[Path | str],
+    schema_path: Path | str | None = None,
+    *,
+    processes: int | None = None,
+    jobs: int = 1,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+    cache_size: int = DEFAULT_MAX_ENTRIES,
+    changed_since: str | None = None,
+    ignore: Iterable[str] = (),
+    scan_jobs: int = 1,
+    max_errors: int | None = None,
+    checks: Iterable[str] = (),
+) -> list[RepoResult]:
+    """
+    Validate several repositories, in parallel worker processes.
+
+    Args:
+        manifest_paths: Manifests to validate.
+        schema_path: Validate every manifest against this schema file.
+        processes: Number of worker processes (default: one per CPU, at most one per
+            manifest). With ``processes=1`` everything runs in this process.
+        ignore: Glob patterns skipped under ``pages/``, in addition to each
+            repository's ``.labkiignore``.
+
+        The other arguments apply to each repository as in ``labki validate``.
+
+    Returns:
+        One `RepoResult` per manifest, in the given order.
+    """
+    paths = [Path(p) for p in manifest_paths]
+    run = partial(
+        validate_one,
+        schema_path=schema_path,
+        jobs=jobs,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_size=cache_size,
+        changed_since=changed_since,
+        ignore=tuple(ignore),
+        scan_jobs=scan_jobs,
+        max_errors=max_errors,
+        checks=tuple(checks),
+    )
+    processes = min(processes or os.cpu_count() or 1, len(paths))
+
+    preload_schemas(schema_path)
+    if processes <= 1:
+        return [run(path) for path in paths]
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=preload_schemas, initargs=(schema_path,)
+    ) as pool:
+        return list(pool.map(run, paths))
+
+
+def validate_one(
+    manifest_path: Path,
+    *,
+    schema_path: Path | str | None = None,
+    jobs: int = 1,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+    cache_size: int = DEFAULT_MAX_ENTRIES,
+    changed_since: str | None = None,
+    ignore: tuple[str, ...] = (),
+    scan_jobs: int = 1,
+    max_errors: int | None = None,
+    checks: tuple[str, ...] = (),
+) -> RepoResult:
+    """Validate one repository of a batch; failures become error items, not exceptions."""
+    result = RepoResult(manifest_path, ValidationResults())
+
+    scope = None
+    if changed_since:
+        try:
+            scope = changed_scope(manifest_path, changed_since)
+        except ValueError as e:
+            result.results.add(ValidationItem(level="error", message=str(e)))
+            return result
+
+    repo_dir = manifest_path.parent
+    snapshot = FileSnapshot.scan(
+        repo_dir,
+        ignore=[*read_ignore_file(repo_dir.resolve() / IGNORE_FILE), *ignore],
+        jobs=scan_jobs,
+    )
+    cache = None
+    if use_cache:
+        cache = ValidationCache.for_manifest(manifest_path, cache_dir, max_entries=cache_size)
+
+    _, result.results = validate_repo(
+        manifest_path,
+        schema_path,
+        jobs=jobs,
+        cache=cache,
+        scope=scope,
+        snapshot=snapshot,
+        max_errors=max_errors,
+        checks=checks,
+    )
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            result.notes.append(f"could not save validation cache: {e}")
+    return result
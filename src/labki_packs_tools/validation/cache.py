@@ -0,0 +1,195 @@
+"""
+Persistent cache of validator results across runs.
+
+Validators describe the inputs they read with a *fingerprint*
+(see `Validator.fingerprint` and `Validator.page_fingerprint`), and their
+results are stored under a hash of that fingerprint. On the next run only
+validators (or, for page-sharded validators, pages) whose fingerprint changed
+are re-checked.
+
+The cache is a single JSON file per manifest. Entries are evicted least
+recently used first once there are more than ``max_entries``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from labki_packs_tools.validation.result_types import ValidationItem
+
+CACHE_FORMAT = 2
+"""Bump when the layout of cached values changes"""
+
+DEFAULT_MAX_ENTRIES = 500_000
+
+
+def default_cache_dir() -> Path:
+    """``$LABKI_CACHE_DIR``, else ``$XDG_CACHE_HOME/labki-packs-tools``, else ``~/.cache/...``."""
+    if os.environ.get("LABKI_CACHE_DIR"):
+        return Path(os.environ["LABKI_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "labki-packs-tools"
+
+
+def _encode_other(value: Any) -> dict:
+    # keep the type, e.g. a YAML date and the string "2025-01-01" must not collide
+    return {"__type__": type(value).__name__, "value": str(value)}
+
+
+def digest(value: Any) -> str:
+    """Stable hex digest of a JSON-serializable value."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=_encode_other)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def stat_signature(path: Path) -> list[int] | None:
+    """``[mtime_ns, size]`` of a file, or ``None`` if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def items_to_json(items: list[ValidationItem]) -> list[dict]:
+    return [item.to_dict() for item in items]
+
+
+def items_from_json(data: list[dict]) -> list[ValidationItem]:
+    return [ValidationItem(**d) for d in data]
+
+
+def tool_version() -> str:
+    """Installed version of this package; results of other versions are not reused."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("labki-packs-tools")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ValidationCache:
+    """
+    Key/value store of JSON-serializable results with LRU eviction.
+
+    Use `ValidationCache.for_manifest` to open the cache of a repository and
+    `save` to persist it after validation.
+    """
+
+    def __init__(self, path: Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, list] = {}  # key -> [last used run, value]
+        self._run = 1
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> ValidationCache:
+        """Load a cache file; a missing, corrupt or outdated file gives an empty cache."""
+        cache = cls(path, max_entries)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if data.get("format") != CACHE_FORMAT or data.get("tool") != tool_version():
+            return cache
+        cache._entries = data.get("entries", {})
+        cache._run = data.get("run", 0) + 1
+        return cache
+
+    @classmethod
+    def for_manifest(
+        cls,
+        manifest_path: Path | str,
+        cache_dir: Path | str | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> ValidationCache:
+        """Open the cache file belonging to a manifest inside ``cache_dir``."""
+        manifest_path = Path(manifest_path).resolve()
+        cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        name = f"validate-{digest(str(manifest_path))[:16]}.json"
+        return cls.load(cache_dir / name, max_entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(namespace: str, fingerprint: Any) -> str:
+        return digest([CACHE_FORMAT, namespace, fingerprint])
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if entry[0] != self._run:
+            entry[0] = self._run
+            self._dirty = True
+        return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = [self._run, value]
+        self._dirty = True
+
+    def memoize(self, namespace: str, fingerprint: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``fingerprint``, computing and storing it on a miss."""
+        if fingerprint is None:
+            return compute()
+        key = self.key(namespace, fingerprint)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def memoize_items(
+        self,
+        namespace: str,
+        fingerprint: Any,
+        compute: Callable[[], list[ValidationItem]],
+    ) -> list[ValidationItem]:
+        """Like `memoize`, for lists of ``ValidationItem``."""
+        if fingerprint is None:
+            return compute()
+        key = self.key(namespace, fingerprint)
+        value = self.get(key)
+        if value is not None:
+            return items_from_json(value)
+        items = compute()
+        self.put(key, items_to_json(items))
+        return items
+
+    def prune(self) -> None:
+        """Evict least recently used entries down to ``max_entries``."""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        by_age = sorted(self._entries.items(), key=lambda kv: kv[1][0])
+        for key, _ in by_age[:excess]:
+            del self._entries[key]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache file (atomically), if anything changed."""
+        self.prune()
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "format": CACHE_FORMAT,
+            "tool": tool_version(),
+            "run": self._run,
+            "entries": self._entries,
+        }
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
@@ -0,0 +1,381 @@
+"""
+Long-running validation server, and the client ``labki validate`` uses to reach it.
+
+``labki serve`` keeps modules imported, schemas compiled and, per manifest, a
+`WatchSession` (parsed manifest, file snapshot and results) in memory. Before
+answering a request the session is brought up to date with the files that
+changed since the previous one: reported by inotify where available, otherwise
+found by comparing stat signatures (modification time and size) of ``pages/``,
+the manifest and the schema. Answers are the same as a fresh ``validate_repo``
+run.
+
+The protocol is JSON-RPC 2.0, one JSON document per line, over a Unix socket
+(`default_socket_path`) or standard input and output. Methods:
+
+- ``validate``: ``manifest`` (absolute path), optional ``schema``, ``ignore``
+  (the patterns of ``--ignore`` and ``.labkiignore``), ``changed_since`` and
+  ``version`` (rejected unless it matches the server's). Returns the document
+  printed by ``labki validate --json``.
+- ``ping``: returns the server's ``version`` and ``pid``.
+- ``shutdown``: stops the server.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+from labki_packs_tools.validation.cache import (
+    default_cache_dir,
+    items_from_json,
+    tool_version,
+)
+from labki_packs_tools.validation.result_formatter import results_payload
+from labki_packs_tools.validation.result_types import ValidationResults
+
+SOCKET_ENV = "LABKI_SOCKET"
+
+DEFAULT_MAX_SESSIONS = 16
+"""Manifests kept in memory; the least recently validated is dropped first"""
+
+PING_TIMEOUT = 1.0
+"""Seconds a server may take to answer ``ping`` before it is considered unresponsive"""
+
+VALIDATE_TIMEOUT = 120.0
+"""Seconds ``labki validate`` waits for a server's answer before validating in-process"""
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+VALIDATION_FAILED = -32000
+VERSION_MISMATCH = -32001
+
+
+def default_socket_path() -> Path:
+    """``$LABKI_SOCKET``, else ``daemon.sock`` in the validation cache directory."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    return default_cache_dir() / "daemon.sock"
+
+
+class DaemonError(Exception):
+    """An error response of the server."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+# ────────────────────────────────────────────────
+# Server
+# ────────────────────────────────────────────────
+class _Session:
+    def __init__(self, manifest: Path, schema: Path | None, ignore: tuple[str, ...]):
+        # only the server validates; the client functions stay cheap to import
+        from labki_packs_tools.validation.snapshot import FileSnapshot
+        from labki_packs_tools.validation.watch import WatchSession, make_watcher
+
+        snapshot = FileSnapshot.scan(manifest.parent, ignore=ignore)
+        self.watch = WatchSession(manifest, schema, snapshot=snapshot)
+        self.watcher = make_watcher(self.watch)
+        self.lock = threading.Lock()
+
+    def results(self) -> ValidationResults:
+        changed = self.watcher.wait(timeout=0)
+        if (changed is None or changed) and self.watch.update(changed):
+            self.watcher.sync(self.watch.snapshot)
+        return self.watch.results
+
+    def close(self) -> None:
+        self.watcher.close()
+
+
+class ValidationServer:
+    """Answers JSON-RPC requests; safe to use from several threads."""
+
+    def __init__(self, *, max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.stopped = threading.Event()
+        self._sessions: OrderedDict[tuple, _Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validate(
+        self,
+        manifest: Path | str,
+        schema: Path | str | None = None,
+        *,
+        ignore: Iterable[str] = (),
+        changed_since: str | None = None,
+    ) -> ValidationResults:
+        """
+        Results of ``validate_repo(manifest, schema)``, from the session of that manifest.
+
+        Raises:
+            ValueError: If the scope of ``changed_since`` cannot be computed.
+        """
+        from labki_packs_tools.validation.scope import changed_scope
+
+        manifest = Path(os.path.abspath(manifest))
+        schema = Path(os.path.abspath(schema)) if schema is not None else None
+        scope = changed_scope(manifest, changed_since) if changed_since else None
+
+        session = self._session(manifest, schema, tuple(ignore))
+        with session.lock:
+            results = session.results()
+        if scope is not None:
+            results = ValidationResults([item for item in results if scope.includes(item)])
+        return results
+
+    def handle(self, request: Any) -> dict | None:
+        """The response to a decoded request; ``None`` for notifications."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            return _error(request_id, INVALID_PARAMS, "params must be an object")
+        try:
+            result = self._call(request["method"], params)
+        except DaemonError as e:
+            response = _error(request_id, e.code, str(e))
+        except Exception as e:
+            response = _error(request_id, VALIDATION_FAILED, str(e))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in request else None
+
+    def handle_line(self, line: bytes) -> bytes | None:
+        """The encoded response to one line of input; ``None`` if there is none."""
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = _error(None, PARSE_ERROR, f"Parse error: {e}")
+        else:
+            response = self.handle(request)
+        if response is None:
+            return None
+        return json.dumps(response, sort_keys=True).encode("utf-8") + b"\n"
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _call(self, method: str, params: dict) -> Any:
+        if method == "ping":
+            return {"version": tool_version(), "pid": os.getpid()}
+        if method == "shutdown":
+            self.stopped.set()
+            return None
+        if method != "validate":
+            raise DaemonError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+        version = params.get("version")
+        if version is not None and version != tool_version():
+            raise DaemonError(
+                VERSION_MISMATCH, f"Server runs version {tool_version()}, client {version}"
+            )
+        manifest = params.get("manifest")
+        schema = params.get("schema")
+        ignore = params.get("ignore", [])
+        changed_since = params.get("changed_since")
+        if (
+            not isinstance(manifest, str)
+            or not isinstance(schema, (str, type(None)))
+            or not isinstance(changed_since, (str, type(None)))
+            or not isinstance(ignore, list)
+            or not all(isinstance(p, str) for p in ignore)
+        ):
+            raise DaemonError(INVALID_PARAMS, "Invalid parameters for validate")
+        results = self.validate(manifest, schema, ignore=ignore, changed_since=changed_since)
+        return results_payload(results)
+
+    def _session(self, manifest: Path, schema: Path | None, ignore: tuple[str, ...]) -> _Session:
+        key = (manifest, schema, ignore)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+        # the first run can take a while; other manifests are served meanwhile
+        session = _Session(manifest, schema, ignore)
+        evicted = []
+        with self._lock:
+            known = self._sessions.setdefault(key, session)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[1])
+        if known is not session:
+            evicted.append(session)
+        for old in evicted:
+            with old.lock:  # wait for requests still using it
+                old.close()
+        return known
+
+
+def _error(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _UnixServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = self.server.validation.handle_line(line)
+            if response is not None:
+                self.wfile.write(response)
+                self.wfile.flush()
+            if self.server.validation.stopped.is_set():
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, validation: ValidationServer):
+        self.validation = validation
+        super().__init__(str(path), _Handler)
+
+
+def serve_unix(path: Path | str | None = None, *, server: ValidationServer | None = None) -> None:
+    """
+    Answer requests on a Unix socket until a ``shutdown`` request arrives.
+
+    The socket is only accessible to the current user. A leftover socket file of a
+    server that is no longer running is replaced.
+
+    Raises:
+        OSError: If another server is listening on ``path``, or ``path`` exists
+            and is not a socket.
+    """
+    path = Path(path) if path is not None else default_socket_path()
+    if path.exists() or path.is_symlink():
+        if not stat.S_ISSOCK(path.lstat().st_mode):
+            raise OSError(f"Not a socket, refusing to replace it: {path}")
+        try:
+            request("ping", socket_path=path, timeout=PING_TIMEOUT)
+        except (OSError, DaemonError):
+            path.unlink()
+        else:
+            raise OSError(f"A validation server is already listening on {path}")
+    server = server or ValidationServer()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    old_umask = os.umask(0o177)
+    try:
+        unix_server = _UnixServer(path, server)
+    finally:
+        os.umask(old_umask)
+    try:
+        unix_server.serve_forever()
+    finally:
+        unix_server.server_close()
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+def serve_stdio(
+    stdin: IO[bytes], stdout: IO[bytes], *, server: ValidationServer | None = None
+) -> None:
+    """Answer requests read from ``stdin`` until it ends or a ``shutdown`` request arrives."""
+    server = server or ValidationServer()
+    try:
+        for line in stdin:
+            response = server.handle_line(line)
+            if response is not None:
+                stdout.write(response)
+                stdout.flush()
+            if server.stopped.is_set():
+                break
+    finally:
+        server.close()
+
+
+# ────────────────────────────────────────────────
+# Client
+# ────────────────────────────────────────────────
+def request(
+    method: str,
+    params: dict | None = None,
+    *,
+    socket_path: Path | str | None = None,
+    timeout: float | None = None,
+) -> Any:
+    """
+    Send one request to the server on ``socket_path`` and return its result.
+
+    Raises:
+        OSError: If no server is listening or the connection failed.
+        DaemonError: If the server answered with an error.
+    """
+    path = Path(socket_path) if socket_path is not None else default_socket_path()
+    message = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("The validation server closed the connection")
+    response = json.loads(line)
+    if "error" in response:
+        raise DaemonError(response["error"]["code"], response["error"]["message"])
+    return response.get("result")
+
+
+def validate_with_daemon(
+    manifest_path: Path | str,
+    schema_path: Path | str | None = None,
+    *,
+    ignore: Iterable[str] = (),
+    changed_since: str | None = None,
+    socket_path: Path | str | None = None,
+) -> ValidationResults | None:
+    """
+    Validate through a running server.
+
+    A server that does not answer ``ping`` within `PING_TIMEOUT` (e.g. a
+    stopped process whose socket is still there), or the validation within
+    `VALIDATE_TIMEOUT`, is treated as not running.
+
+    Returns:
+        The results, or ``None`` if no responsive server (of this version) is running.
+
+    Raises:
+        DaemonError: If the server could not validate, e.g. ``changed_since`` is
+            not a commit.
+    """
+    path = Path(socket_path) if socket_path is not None else default_socket_path()
+    if not path.exists():
+        return None
+    params = {
+        "manifest": os.path.abspath(manifest_path),
+        "schema": os.path.abspath(schema_path) if schema_path is not None else None,
+        "ignore": list(ignore),
+        "changed_since": changed_since,
+        "version": tool_version(),
+    }
+    try:
+        request("ping", socket_path=path, timeout=PING_TIMEOUT)
+        payload = request("validate", params, socket_path=path, timeout=VALIDATE_TIMEOUT)
+    except (OSError, ValueError):
+        return None
+    except DaemonError as e:
+        if e.code == VERSION_MISMATCH:
+            return None
+        raise
+    return ValidationResults(items_from_json(payload["items"]))
@@ -0,0 +1,423 @@
+"""
+Generated fast-path validators for JSON Schemas.
+
+`FastValidator` translates a schema into specialized Python source (one plain
+function per subschema, with required keys, patterns and sub-validators
+inlined) and compiles it once. The generated code only answers "is this
+instance valid?": when it says yes, there are no errors to report; when it
+says no, callers fall back to ``Draft202012Validator.iter_errors`` for the
+actual errors, so messages are unchanged.
+
+The generated code is conservative: anything it cannot decide exactly like
+``jsonschema`` (e.g. ``uniqueItems`` over non-string items, non-string object
+keys) counts as "maybe invalid" and goes to the fallback. That is only sound
+where a subschema's failure makes the instance fail, so ``not``, ``oneOf``
+and ``if`` are only translated over subschemas the generated code decides
+exactly. Schemas using other subschemas there, or keywords the generator does
+not know, raise `UnsupportedSchema`; they are always validated by ``jsonschema``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable
+from urllib.parse import unquote
+
+_ANNOTATIONS = frozenset(
+    {
+        "$schema",
+        "$comment",
+        "$defs",
+        "definitions",
+        "$anchor",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "deprecated",
+        "readOnly",
+        "writeOnly",
+        "format",  # an annotation unless a format checker is enabled
+    }
+)
+
+_TYPE_CHECKS = {
+    "object": "isinstance({x}, dict)",
+    "array": "isinstance({x}, list)",
+    "string": "isinstance({x}, str)",
+    "boolean": "isinstance({x}, bool)",
+    "null": "{x} is None",
+    "integer": (
+        "((isinstance({x}, int) and not isinstance({x}, bool))"
+        " or (isinstance({x}, float) and {x}.is_integer()))"
+    ),
+    "number": "(isinstance({x}, (int, float)) and not isinstance({x}, bool))",
+}
+
+
+_INLINE_KEYWORDS = _ANNOTATIONS | {"type", "pattern", "minLength", "maxLength"}
+
+
+class UnsupportedSchema(Exception):
+    """The schema uses a feature the fast path does not implement."""
+
+
+class FastValidator:
+    """
+    Compiled "is valid?" check for a schema and all its subschemas.
+
+    Raises:
+        UnsupportedSchema: If the schema cannot be translated.
+    """
+
+    def __init__(self, schema: dict | bool):
+        self.schema = schema
+        generator = _Generator(schema)
+        self.source = generator.generate()
+        namespace: dict[str, Any] = {
+            "_MISSING": object(),
+            "_unique_strings": _unique_strings,
+            **generator.constants,
+        }
+        exec(compile(self.source, "<labki fast validator>", "exec"), namespace)
+        self._functions: dict[int, Callable[[Any], bool]] = {
+            key: namespace[name] for key, name in generator.names.items()
+        }
+        self._root = self._functions[id(schema)]
+
+    def is_valid(self, instance: Any) -> bool:
+        """True only if the instance is certainly valid."""
+        return _guarded(self._root, instance)
+
+    def validator_for(self, subschema: Any) -> Callable[[Any], bool] | None:
+        """The compiled check for a subschema of this schema, if it was reachable."""
+        function = self._functions.get(id(subschema))
+        if function is None:
+            return None
+        return lambda instance: _guarded(function, instance)
+
+
+def _guarded(function: Callable[[Any], bool], instance: Any) -> bool:
+    try:
+        return function(instance)
+    except Exception:  # e.g. RecursionError on very deep instances
+        return False
+
+
+def _unique_strings(items: list) -> bool:
+    # exact for strings; other items compare in jsonschema-specific ways (1 vs True)
+    if not all(type(item) is str for item in items):
+        return False
+    return len(set(items)) == len(items)
+
+
+class _Generator:
+    def __init__(self, root: dict | bool):
+        self.root = root
+        self.names: dict[int, str] = {}
+        self.constants: dict[str, Any] = {}
+        self._pending: list[tuple[str, Any]] = []
+        self._keep_alive: list[Any] = []
+        self._lines: list[str] = []
+        self._exact: dict[int, bool] = {}
+
+    def generate(self) -> str:
+        self.function_for(self.root)
+        while self._pending:
+            name, schema = self._pending.pop()
+            self._emit_function(name, schema)
+        return "\n".join(self._lines) + "\n"
+
+    # ─── Helpers ─────────────────────────────────
+    def function_for(self, schema: Any) -> str:
+        key = id(schema)
+        if key not in self.names:
+            self.names[key] = f"_v{len(self.names)}"
+            self._keep_alive.append(schema)
+            self._pending.append((self.names[key], schema))
+        return self.names[key]
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def regex(self, pattern: Any) -> str:
+        if not isinstance(pattern, str):
+            raise UnsupportedSchema(f"Invalid pattern: {pattern!r}")
+        try:
+            return self.constant(re.compile(pattern))
+        except re.error as e:
+            raise UnsupportedSchema(f"Invalid pattern {pattern!r}: {e}") from e
+
+    def resolve(self, ref: Any) -> Any:
+        if not isinstance(ref, str) or not ref.startswith("#"):
+            raise UnsupportedSchema(f"Only local $ref is supported: {ref!r}")
+        target = self.root
+        for token in filter(None, ref[1:].split("/")):
+            token = unquote(token).replace("~1", "/").replace("~0", "~")
+            try:
+                target = target[int(token) if isinstance(target, list) else token]
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                raise UnsupportedSchema(f"Unresolvable $ref: {ref}") from e
+        return target
+
+    def exact(self, schema: Any) -> bool:
+        """
+        Whether the generated check of ``schema`` never says "invalid" for a valid
+        instance, so it may be negated (``not``, ``oneOf``, ``if``).
+        """
+        if not isinstance(schema, dict):
+            return True
+        key = id(schema)
+        if key not in self._exact:
+            self._exact[key] = True  # assumed while recursing through cyclic $refs
+            self._keep_alive.append(schema)
+            self._exact[key] = self._exact_keywords(schema)
+        return self._exact[key]
+
+    def _exact_keywords(self, schema: dict) -> bool:
+        if schema.get("uniqueItems") is True:
+            return False
+        if (
+            schema.get("propertyNames", True) is not True
+            or schema.get("patternProperties")
+            or schema.get("additionalProperties", True) is not True
+        ):
+            return False  # objects with non-string keys count as invalid
+        subschemas: list[Any] = []
+        if "$ref" in schema:
+            subschemas.append(self.resolve(schema["$ref"]))
+        if isinstance(schema.get("properties"), dict):
+            subschemas += schema["properties"].values()
+        for keyword in ("anyOf", "allOf", "oneOf"):
+            if isinstance(schema.get(keyword), list):
+                subschemas += schema[keyword]
+        subschemas += [schema[k] for k in ("items", "not", "if", "then", "else") if k in schema]
+        return all(self.exact(subschema) for subschema in subschemas)
+
+    def _require_exact(self, keyword: str, subschemas: list[Any]) -> None:
+        if not all(self.exact(subschema) for subschema in subschemas):
+            raise UnsupportedSchema(f"'{keyword}' over subschemas that cannot be checked exactly")
+
+    # ─── Code generation ─────────────────────────
+    def _emit_function(self, name: str, schema: Any) -> None:
+        out = self._lines
+        out.append(f"def {name}(x):")
+        if schema is True or schema is False:
+            out.append(f"    return {schema}")
+            out.append("")
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"Invalid schema: {schema!r}")
+        if "$id" in schema and schema is not self.root:
+            raise UnsupportedSchema("Nested $id is not supported")
+
+        known = {
+            "$id",
+            "$ref",
+            "type",
+            "properties",
+            "required",
+            "additionalProperties",
+            "patternProperties",
+            "propertyNames",
+            "minProperties",
+            "maxProperties",
+            "items",
+            "minItems",
+            "maxItems",
+            "uniqueItems",
+            "pattern",
+            "minLength",
+            "maxLength",
+            "minimum",
+            "maximum",
+            "exclusiveMinimum",
+            "exclusiveMaximum",
+            "anyOf",
+            "allOf",
+            "oneOf",
+            "not",
+            "if",
+            "then",
+            "else",
+        }
+        unknown = set(schema) - known - _ANNOTATIONS
+        if unknown:
+            raise UnsupportedSchema(f"Unsupported keyword(s): {', '.join(sorted(unknown))}")
+
+        body: list[str] = []
+        if "$ref" in schema:
+            body.append(
+                f"if not {self.function_for(self.resolve(schema['$ref']))}(x): return False"
+            )
+        if "type" in schema:
+            body.append(f"if not ({self._type_check(schema['type'], 'x')}): return False")
+        # after a single-type check the matching isinstance() guard is redundant
+        only = schema.get("type") if isinstance(schema.get("type"), str) else None
+        for type_name, guard, checks in (
+            ("object", "isinstance(x, dict)", self._object_checks(schema)),
+            ("array", "isinstance(x, list)", self._array_checks(schema)),
+            ("string", "isinstance(x, str)", self._string_checks(schema)),
+            (
+                "number",
+                "isinstance(x, (int, float)) and not isinstance(x, bool)",
+                self._number_checks(schema),
+            ),
+        ):
+            if only == type_name or (only == "integer" and type_name == "number"):
+                body += checks
+            elif only is None:
+                body += self._indent(f"if {guard}:", checks)
+        body += self._combinator_checks(schema)
+
+        out.extend(f"    {line}" for line in body)
+        out.append("    return True")
+        out.append("")
+
+    @staticmethod
+    def _indent(header: str, lines: list[str]) -> list[str]:
+        if not lines:
+            return []
+        return [header] + [f"    {line}" for line in lines]
+
+    def _type_check(self, types: Any, var: str) -> str:
+        types = [types] if isinstance(types, str) else types
+        if not isinstance(types, list) or not types:
+            raise UnsupportedSchema(f"Invalid type: {types!r}")
+        try:
+            return " or ".join(_TYPE_CHECKS[t].format(x=var) for t in types)
+        except (KeyError, TypeError) as e:
+            raise UnsupportedSchema(f"Invalid type: {types!r}") from e
+
+    def check(self, schema: Any, var: str) -> str:
+        """
+        Expression that is true if the value in variable ``var`` is valid.
+
+        Simple string/type schemas are inlined, anything else calls its function.
+        """
+        if schema is True or schema is False:
+            return str(schema)
+        if not isinstance(schema, dict) or not set(schema) <= _INLINE_KEYWORDS:
+            return f"{self.function_for(schema)}({var})"
+
+        string_part = " and ".join(self._string_conditions(schema, var))
+        if "type" not in schema:
+            return f"(not isinstance({var}, str) or {string_part})" if string_part else "True"
+        type_part = self._type_check(schema["type"], var)
+        if not string_part:
+            return f"({type_part})"
+        if schema["type"] == "string":
+            return f"(isinstance({var}, str) and {string_part})"
+        return f"(({type_part}) and (not isinstance({var}, str) or {string_part}))"
+
+    def _object_checks(self, schema: dict) -> list[str]:
+        lines: list[str] = []
+        required = schema.get("required", [])
+        if required:
+            if not isinstance(required, list):
+                raise UnsupportedSchema("'required' must be an array")
+            lines.append(f"if not {self.constant(frozenset(required))}.issubset(x): return False")
+
+        properties = schema.get("properties", {})
+        for key, subschema in properties.items():
+            lines.append(f"v = x.get({key!r}, _MISSING)")
+            lines.append(f"if v is not _MISSING and not {self.check(subschema, 'v')}: return False")
+
+        names = schema.get("propertyNames", True)
+        patterns = schema.get("patternProperties", {})
+        additional = schema.get("additionalProperties", True)
+        if names is not True or patterns or additional is not True:
+            loop = ["if type(k) is not str: return False"]  # jsonschema may choke on others
+            if names is not True:
+                loop.append(f"if not {self.check(names, 'k')}: return False")
+            for pattern, subschema in patterns.items():
+                regex = self.regex(pattern)
+                loop.append(
+                    f"if {regex}.search(k) and not {self.check(subschema, 'v')}: return False"
+                )
+            if additional is not True:
+                skip = [f"k in {self.constant(frozenset(properties))}"]
+                skip += [f"{self.regex(pattern)}.search(k)" for pattern in patterns]
+                loop.append(f"if not ({' or '.join(skip)}):")
+                if additional is False:
+                    loop.append("    return False")
+                else:
+                    loop.append(f"    if not {self.check(additional, 'v')}: return False")
+            lines.append("for k, v in x.items():")
+            lines += [f"    {line}" for line in loop]
+
+        if "minProperties" in schema:
+            lines.append(f"if len(x) < {int(schema['minProperties'])}: return False")
+        if "maxProperties" in schema:
+            lines.append(f"if len(x) > {int(schema['maxProperties'])}: return False")
+        return lines
+
+    def _array_checks(self, schema: dict) -> list[str]:
+        lines: list[str] = []
+        if "minItems" in schema:
+            lines.append(f"if len(x) < {int(schema['minItems'])}: return False")
+        if "maxItems" in schema:
+            lines.append(f"if len(x) > {int(schema['maxItems'])}: return False")
+        if schema.get("uniqueItems") is True:
+            lines.append("if not _unique_strings(x): return False")
+        if "items" in schema:
+            lines.append("for v in x:")
+            lines.append(f"    if not {self.check(schema['items'], 'v')}: return False")
+        return lines
+
+    def _string_checks(self, schema: dict) -> list[str]:
+        return [f"if not {cond}: return False" for cond in self._string_conditions(schema, "x")]
+
+    def _string_conditions(self, schema: dict, var: str) -> list[str]:
+        conditions: list[str] = []
+        if "minLength" in schema:
+            conditions.append(f"len({var}) >= {int(schema['minLength'])}")
+        if "maxLength" in schema:
+            conditions.append(f"len({var}) <= {int(schema['maxLength'])}")
+        if "pattern" in schema:
+            conditions.append(f"{self.regex(schema['pattern'])}.search({var})")
+        return conditions
+
+    def _number_checks(self, schema: dict) -> list[str]:
+        lines: list[str] = []
+        for keyword, op in (
+            ("minimum", "<"),
+            ("maximum", ">"),
+            ("exclusiveMinimum", "<="),
+            ("exclusiveMaximum", ">="),
+        ):
+            if keyword in schema:
+                bound = schema[keyword]
+                if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+                    raise UnsupportedSchema(f"Invalid {keyword}: {bound!r}")
+                lines.append(f"if x {op} {bound!r}: return False")
+        return lines
+
+    def _combinator_checks(self, schema: dict) -> list[str]:
+        lines: list[str] = []
+        for keyword in ("anyOf", "allOf", "oneOf"):
+            if keyword not in schema:
+                continue
+            subschemas = schema[keyword]
+            if not isinstance(subschemas, list) or not subschemas:
+                raise UnsupportedSchema(f"'{keyword}' must be a non-empty array")
+            calls = [f"{self.function_for(s)}(x)" for s in subschemas]
+            if keyword == "anyOf":
+                lines.append(f"if not ({' or '.join(calls)}): return False")
+            elif keyword == "allOf":
+                lines.append(f"if not ({' and '.join(calls)}): return False")
+            else:
+                self._require_exact(keyword, subschemas)
+                lines.append(f"if ({' + '.join(calls)}) != 1: return False")
+        if "not" in schema:
+            self._require_exact("not", [schema["not"]])
+            lines.append(f"if {self.function_for(schema['not'])}(x): return False")
+        if "if" in schema:
+            self._require_exact("if", [schema["if"]])
+            condition = self.function_for(schema["if"])
+            then = self.function_for(schema.get("then", True))
+            otherwise = self.function_for(schema.get("else", True))
+            lines.append(f"if not ({then}(x) if {condition}(x) else {otherwise}(x)): return False")
+        return lines
@@ -0,0 +1,236 @@
+"""
+Pages referenced from page content.
+
+`scan_file` extracts the references of one page file in a single regular
+expression pass over its bytes (memory-mapped for large files):
+
+- wikitext: transclusions (``{{X}}``, ``{{Template:X|...}}``, ``{{:X}}``),
+  links (``[[Form:Y]]``, ``[[Y|label]]``) and ``{{#invoke:Z|...}}``, outside
+  comments and ``<nowiki>``/``<pre>`` blocks; template parameters
+  (``{{{1}}}``) are not references
+- Lua (``.lua`` files): ``require``, ``mw.loadData`` and ``mw.loadJsonData``
+  of a literal page name, outside comments
+
+References are returned as written (``(kind, target)``, whitespace
+normalized); `resolve_reference` maps them to titles of a manifest.
+`scan_files` scans many files, in worker processes for large repositories,
+and keeps the results in the validation cache keyed by the hash of the file's
+content, so only new or edited files are scanned again.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+
+from labki_packs_tools.validation.cache import ValidationCache, stat_signature
+
+KINDS = ("transclusion", "link", "invoke", "require")
+
+MMAP_THRESHOLD = 1 << 20
+"""Files at least this large (in bytes) are memory-mapped instead of read"""
+
+MIN_POOL_FILES = 256
+"""Fewest files to scan that are worth starting worker processes for"""
+
+LUA_SUFFIXES = (".lua",)
+
+_WIKITEXT = re.compile(
+    rb"""
+    (?P<skip>
+        <!--.*?(?:-->|\Z)
+        | <(?P<tag>nowiki|pre|source|syntaxhighlight)\b[^>]*?(?:/>|>.*?(?:</(?P=tag)\s*>|\Z))
+        | \{\{\{  # template parameter, whose default may still transclude
+    )
+    | \{\{\s*\#invoke\s*:\s*(?P<invoke>[^|{}\n]+?)\s*[|}]
+    | \{\{\s*(?:(?:safe)?subst\s*:\s*|msgnw\s*:\s*)?
+        (?P<transclusion>[^\#{}|<>\[\]\n][^{}|<>\[\]\n]*?)\s*(?:\||\}\})
+    | \[\[\s*(?P<link>[^\#{}|<>\[\]\n][^\#{}|<>\[\]\n]*?)\s*(?:[|\#]|\]\])
+    """,
+    re.DOTALL | re.VERBOSE | re.IGNORECASE,
+)
+
+_LUA = re.compile(
+    rb"""
+    (?P<skip>--\[(?P<eq>=*)\[.*?\](?P=eq)\]|--[^\n]*)
+    | \b(?:require|mw\.loadData|mw\.loadJsonData)\s*\(?\s*
+        (?P<q>['"])(?P<require>[^'"\n]+)(?P=q)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+_HASH_NAMESPACE = "references-hash"
+_REFS_NAMESPACE = "references"
+
+Reference = tuple[str, str]
+"""``(kind, target)``, with the target as written"""
+
+
+# ────────────────────────────────────────────────
+# Single files
+# ────────────────────────────────────────────────
+@contextlib.contextmanager
+def _contents(path: Path | str) -> Iterator[bytes | mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+        else:
+            yield f.read()
+
+
+def scan_bytes(data: bytes | mmap.mmap, *, lua: bool = False) -> list[Reference]:
+    """References in page content, each once, in order of first appearance."""
+    found: dict[Reference, None] = {}
+    kinds = ("require",) if lua else ("invoke", "transclusion", "link")
+    for match in (_LUA if lua else _WIKITEXT).finditer(data):
+        for kind in kinds:
+            value = match.group(kind)
+            if value is not None:
+                target = " ".join(value.decode("utf-8", "replace").replace("_", " ").split())
+                found.setdefault((kind, target))
+                break
+    return list(found)
+
+
+def scan_file(path: Path | str, *, lua: bool | None = None) -> list[Reference]:
+    """
+    References in a page file. ``lua`` defaults to whether the file is a Lua module.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if lua is None:
+        lua = str(path).endswith(LUA_SUFFIXES)
+    with _contents(path) as data:
+        return scan_bytes(data, lua=lua)
+
+
+def file_hash(path: Path | str) -> str:
+    """SHA-256 of a file's content."""
+    with _contents(path) as data:
+        return hashlib.sha256(data).hexdigest()
+
+
+def _scan_or_nothing(path: Path) -> list[Reference]:
+    # a missing or unreadable file is reported by PageFileValidator
+    try:
+        return scan_file(path)
+    except OSError:
+        return []
+
+
+# ────────────────────────────────────────────────
+# Many files
+# ────────────────────────────────────────────────
+def scan_files(
+    paths: Sequence[Path],
+    *,
+    cache: ValidationCache | None = None,
+    signatures: Mapping[Path, list[int] | None] | None = None,
+    jobs: int = 1,
+) -> dict[Path, list[Reference]]:
+    """
+    References of each file (none for files that cannot be read).
+
+    Args:
+        cache: Reuse references of files whose content was scanned before.
+            A file's hash is itself cached by path and stat signature, so
+            unchanged files are not read at all.
+        signatures: Stat signatures of the files (e.g. from a `FileSnapshot`);
+            files are stat-ed if not given.
+        jobs: Scan in this many worker processes, if there are at least
+            `MIN_POOL_FILES` files to scan.
+    """
+    found: dict[Path, list[Reference]] = {}
+    todo: list[tuple[Path, str | None]] = []
+    for path in dict.fromkeys(paths):
+        if cache is None:
+            todo.append((path, None))
+            continue
+        signature = signatures.get(path) if signatures is not None else stat_signature(path)
+        if signature is None:
+            found[path] = []
+            continue
+        try:
+            content = cache.memoize(
+                _HASH_NAMESPACE, [str(path), signature], lambda p=path: file_hash(p)
+            )
+        except OSError:
+            found[path] = []
+            continue
+        cached = cache.get(cache.key(_REFS_NAMESPACE, [content, path.suffix in LUA_SUFFIXES]))
+        if cached is None:
+            todo.append((path, content))
+        else:
+            found[path] = [(kind, target) for kind, target in cached]
+
+    scanned = _scan_all([path for path, _ in todo], jobs)
+    for (path, content), references in zip(todo, scanned):
+        found[path] = references
+        if cache is not None and content is not None:
+            key = cache.key(_REFS_NAMESPACE, [content, path.suffix in LUA_SUFFIXES])
+            cache.put(key, [list(ref) for ref in references])
+    return found
+
+
+def _scan_all(paths: list[Path], jobs: int) -> list[list[Reference]]:
+    if jobs <= 1 or len(paths) < MIN_POOL_FILES:
+        return [_scan_or_nothing(path) for path in paths]
+    # validators may run on threads, and forking a multi-threaded process can deadlock
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        return list(pool.map(_scan_or_nothing, paths, chunksize=chunksize))
+
+
+# ────────────────────────────────────────────────
+# Titles
+# ────────────────────────────────────────────────
+def _ucfirst(text: str) -> str:
+    return text[:1].upper() + text[1:]
+
+
+def normalize_title(title: str) -> str:
+    """
+    Canonical form of a page title for comparisons: spaces instead of
+    underscores, and upper-case first letters of namespace and name.
+    """
+    title = " ".join(title.replace("_", " ").split())
+    namespace, sep, name = title.partition(":")
+    if sep and namespace:
+        return f"{_ucfirst(namespace.strip())}:{_ucfirst(name.strip())}"
+    return _ucfirst(title)
+
+
+def resolve_reference(kind: str, target: str, titles: Mapping[str, str]) -> str | None:
+    """
+    The title a reference points to, if it is one of ``titles``.
+
+    Args:
+        titles: Known titles by `normalize_title`.
+    """
+    if target.startswith("/"):  # relative subpage
+        return None
+    if kind == "invoke":
+        candidates = [f"Module:{target}"]
+    elif kind == "transclusion" and target.startswith(":"):
+        candidates = [target[1:]]
+    elif kind == "transclusion":
+        # a prefix that is not a namespace is part of a template name
+        candidates = [target, f"Template:{target}"] if ":" in target else [f"Template:{target}"]
+    else:
+        candidates = [target.removeprefix(":")]
+    for candidate in candidates:
+        title = titles.get(normalize_title(candidate))
+        if title is not None:
+            return title
+    return None
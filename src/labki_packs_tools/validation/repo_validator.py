@@ -1,14 +1,36 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Any, Callable, Collection
 
-from labki_packs_tools.utils import load_json, load_yaml
+from labki_packs_tools.utils import PackGraph, load_yaml
+from labki_packs_tools.validation.cache import ValidationCache
 from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+from labki_packs_tools.validation.schema_registry import load_schema
 from labki_packs_tools.validation.schema_resolver import resolve_schema
+from labki_packs_tools.validation.scope import ValidationScope
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators import ManifestSchemaValidator
 from labki_packs_tools.validation.validators.base import Validator
 
+MIN_SHARD_SIZE = 256
+"""Smallest number of pages worth handing to a separate worker"""
 
-def validate_repo(manifest_path: Path | str) -> tuple[int, ValidationResults]:
+
+def validate_repo(
+    manifest_path: Path | str,
+    schema_path: Path | str | None = None,
+    *,
+    jobs: int = 1,
+    cache: ValidationCache | None = None,
+    scope: ValidationScope | None = None,
+    snapshot: FileSnapshot | None = None,
+    results: ValidationResults | None = None,
+    max_errors: int | None = None,
+    checks: Collection[str] = (),
+) -> tuple[int, ValidationResults]:
     """
     Validate a Labki content repository manifest.
 
@@ -16,12 +38,127 @@ def validate_repo(manifest_path: Path | str) -> tuple[int, ValidationResults]:
       1. Loads manifest and schema.
       2. Applies all Validator subclasses for applicable schema_version.
 
+    Args:
+        manifest_path: Path to the manifest file.
+        schema_path: Validate against this schema file instead of the one
+            selected by the manifest's ``schema_version``.
+        jobs: Number of worker threads. With ``jobs > 1`` validators run concurrently
+            and page-sharded validators split ``pages`` across workers.
+            Results are merged in the same order as a serial run.
+        cache: Results of previous runs. Validators (and pages of page-sharded
+            validators) whose inputs are unchanged are answered from the cache,
+            and new results are added to it. The caller is responsible for saving it.
+        scope: Only report items about these pages, packs and files (see
+            `labki_packs_tools.validation.scope.changed_scope`). Validators
+            skip work outside the scope where they can.
+        snapshot: Listing of the repository's ``pages/`` directory that
+            file-based validators answer from; scanned once here if not given.
+        results: Add the items to these results (e.g. one with sinks, which then
+            receive the items of each validator as soon as it finishes).
+        max_errors: Error budget. Validation stops as soon as this many errors
+            were found (the rest of that validator's items and the remaining
+            validators are dropped), and validators that require a structurally
+            valid manifest are skipped once any error was found. Either sets
+            ``results.truncated``.
+        checks: Codes of opt-in validators to run as well (``Validator.opt_in``),
+            e.g. ``"page-dupes"``.
+
     Returns:
         (exit_code, ValidationResults)
     """
     manifest_path = Path(manifest_path)
-    results = ValidationResults()
+    if results is None:
+        results = ValidationResults()
+    context = load_context(
+        manifest_path, schema_path, results, cache=cache, scope=scope, snapshot=snapshot
+    )
+    if context is None:
+        return results.rc, results
+
+    # ───────────────────────────────
+    # Apply all registered validators
+    # ───────────────────────────────
+    def emit(items: list[ValidationItem]) -> None:
+        results.extend(items if scope is None else [i for i in items if scope.includes(i)])
+
+    validators = applicable_validators(context["manifest"], checks)
+    context["jobs"] = jobs
+    if max_errors is not None:
+        context["max_errors"] = max_errors
+        _run_within_budget(validators, context, results, scope, jobs, max_errors)
+    elif jobs <= 1:
+        for validator_cls in validators:
+            emit(_run_shards(validator_cls, [context]))
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                [
+                    pool.submit(run_validator, validator_cls, ctx)
+                    for ctx in _shard_context(validator_cls, context, jobs)
+                ]
+                for validator_cls in validators
+            ]
+            for validator_cls, shard_futures in zip(validators, futures):
+                emit(_collect(validator_cls, shard_futures))
+
+    return results.rc, results
+
+
+def _run_within_budget(
+    validators: list[type[Validator]],
+    context: dict[str, Any],
+    results: ValidationResults,
+    scope: ValidationScope | None,
+    jobs: int,
+    max_errors: int,
+) -> None:
+    """
+    Run validators one after another (shards concurrently) until the budget is spent.
 
+    Validators that need a structurally valid manifest are skipped once the
+    schema validation found errors (in or out of scope).
+    """
+    invalid = False
+    with ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as pool:
+        for validator_cls in validators:
+            if results.truncated:
+                break
+            if validator_cls.requires_valid_manifest and invalid:
+                results.truncated = True
+                continue
+            if pool is None:
+                items = _run_shards(validator_cls, [context])
+            else:
+                shards = _shard_context(validator_cls, context, jobs)
+                futures = [pool.submit(run_validator, validator_cls, ctx) for ctx in shards]
+                items = _collect(validator_cls, futures)
+            if issubclass(validator_cls, ManifestSchemaValidator):
+                invalid = any(item.level == "error" for item in items)
+            for item in items:
+                if scope is not None and not scope.includes(item):
+                    continue
+                results.add(item)
+                if results.count("error") >= max_errors:
+                    results.truncated = True
+                    break
+
+
+def load_context(
+    manifest_path: Path,
+    schema_path: Path | str | None,
+    results: ValidationResults,
+    *,
+    cache: ValidationCache | None = None,
+    scope: ValidationScope | None = None,
+    snapshot: FileSnapshot | None = None,
+) -> dict[str, Any] | None:
+    """
+    Load the manifest and its schema into the keyword arguments of `Validator.validate`.
+
+    Returns:
+        The context, or ``None`` if the manifest or schema could not be
+        loaded (an error item is added to ``results``).
+    """
     # ───────────────────────────────
     # Load manifest
     # ───────────────────────────────
@@ -29,45 +166,136 @@ def validate_repo(manifest_path: Path | str) -> tuple[int, ValidationResults]:
         manifest = load_yaml(manifest_path)
     except Exception as e:
         results.add(ValidationItem(level="error", message=f"Failed to read manifest: {e}"))
-        return results.rc, results
+        return None
 
     # ───────────────────────────────
     # Resolve and load schema
     # ───────────────────────────────
     try:
-        schema_path = resolve_schema(manifest)
-        schema = load_json(schema_path)
+        schema_path = schema_path or resolve_schema(manifest, base_dir=manifest_path.parent)
+        schema = load_schema(schema_path).schema
     except Exception as e:
         results.add(ValidationItem(level="error", message=f"Failed to resolve schema: {e}"))
-        return results.rc, results
+        return None
 
     # ───────────────────────────────
     # Extract manifest fields
     # ───────────────────────────────
     pages = manifest.get("pages", {})
     packs = manifest.get("packs", {})
+    try:
+        graph = PackGraph.from_packs(packs, pages)
+    except Exception:
+        # malformed packs/pages; validators build (and report on) their own view
+        graph = None
+
+    if snapshot is None:
+        snapshot = FileSnapshot.scan(manifest_path.parent)
+
+    return {
+        "manifest": manifest,
+        "pages": pages,
+        "packs": packs,
+        "schema": schema,  # optional for schema-aware checks
+        "manifest_path": manifest_path,  # optional for file-path-based checks
+        "graph": graph,  # shared integer-indexed pack graph
+        "cache": cache,  # optional, for validators that cache finer-grained results
+        "scope": scope,  # optional, for validators that can skip out-of-scope entries
+        "snapshot": snapshot,  # one stat pass over pages/, shared by file-based checks
+        "page_files": snapshot.page_files(pages),  # page file -> titles
+    }
+
+
+def applicable_validators(manifest: dict, checks: Collection[str] = ()) -> list[type[Validator]]:
+    """
+    Registered validators that apply to the manifest's ``schema_version``;
+    opt-in validators only if their code is in ``checks``.
+    """
     schema_version = str(manifest.get("schema_version", "0.0.0"))
+    return [
+        v
+        for v in Validator.registry
+        if v.applies_to_version(schema_version) and (not v.opt_in or v.code in checks)
+    ]
 
-    # ───────────────────────────────
-    # Apply all registered validators
-    # ───────────────────────────────
-    for validator_cls in Validator.registry:
-        if validator_cls.applies_to_version(schema_version):
-            validator = validator_cls()
-            try:
-                items = validator.validate(
-                    manifest=manifest,
-                    pages=pages,
-                    packs=packs,
-                    schema=schema,  # optional for schema-aware checks
-                    manifest_path=manifest_path,  # optional for file-path-based checks
-                )
-                results.extend(items)
-            except Exception as e:
-                results.add(
-                    ValidationItem(
-                        level="error", message=f"Validator {validator_cls.__name__} failed: {e}"
-                    )
+
+def run_validator(validator_cls: type[Validator], context: dict) -> list[ValidationItem]:
+    """
+    Run one validator, restricted to ``context["scope"]`` and answered from
+    ``context["cache"]`` where possible. Exceptions propagate.
+    """
+    validator = validator_cls()
+    scope = context.get("scope")
+    if scope is not None and validator_cls.page_sharded and isinstance(context["pages"], dict):
+        pages = {title: meta for title, meta in context["pages"].items() if title in scope.pages}
+        context = {**context, "pages": pages}
+    cache = context.get("cache")
+    if cache is None:
+        return validator.validate(**context)
+
+    name = validator_cls.__name__
+    if validator_cls.page_sharded and isinstance(context["pages"], dict):
+        items: list[ValidationItem] = []
+        for title, meta in context["pages"].items():
+            page_context = {**context, "pages": {title: meta}}
+            fingerprint = _safe_fingerprint(validator.page_fingerprint, title, meta, **context)
+            items.extend(
+                cache.memoize_items(
+                    name, fingerprint, lambda ctx=page_context: validator.validate(**ctx)
                 )
+            )
+        return items
 
-    return results.rc, results
+    fingerprint = _safe_fingerprint(validator.fingerprint, **context)
+    return cache.memoize_items(name, fingerprint, lambda: validator.validate(**context))
+
+
+def _safe_fingerprint(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Fingerprint, or ``None`` (don't cache) if the inputs are too malformed to describe."""
+    try:
+        return method(*args, **kwargs)
+    except Exception:
+        return None
+
+
+def _run_shards(validator_cls: type[Validator], contexts: list[dict]) -> list[ValidationItem]:
+    """Run a validator over its shards serially, reporting failures as an error item."""
+    items: list[ValidationItem] = []
+    try:
+        for ctx in contexts:
+            items.extend(run_validator(validator_cls, ctx))
+    except Exception as e:
+        return [failure_item(validator_cls, e)]
+    return items
+
+
+def _collect(validator_cls: type[Validator], futures: list[Future]) -> list[ValidationItem]:
+    """Concatenate shard results in order; the first failing shard fails the validator."""
+    items: list[ValidationItem] = []
+    for future in futures:
+        try:
+            items.extend(future.result())
+        except Exception as e:
+            return [failure_item(validator_cls, e)]
+    return items
+
+
+def failure_item(validator_cls: type[Validator], e: Exception) -> ValidationItem:
+    return ValidationItem(level="error", message=f"Validator {validator_cls.__name__} failed: {e}")
+
+
+def _shard_context(validator_cls: type[Validator], context: dict, n: int) -> list[dict]:
+    """Split ``pages`` into up to ``n`` contiguous shards for page-sharded validators."""
+    pages = context["pages"]
+    if not validator_cls.page_sharded or not isinstance(pages, dict):
+        return [context]
+    n = min(n, len(pages) // MIN_SHARD_SIZE)
+    if n <= 1:
+        return [context]
+
+    items = list(pages.items())
+    size = -(-len(items) // n)
+    return [
+        {**context, "pages": dict(items[start : start + size])}
+        for start in range(0, len(items), size)
+    ]
@@ -1,58 +1,232 @@
 from __future__ import annotations
 
 import json
-from typing import Iterable
-
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
+from typing import TYPE_CHECKING, Iterable, Sequence, TextIO
 
 from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+from labki_packs_tools.validation.sinks import summary_payload
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from labki_packs_tools.validation.batch import RepoResult
+
+_console: Console | None = None
+
+
+DEFAULT_EXAMPLES = 10
+"""Items shown per code and level; the others are only counted"""
+
+LEVELS = (("error", "Errors", "red"), ("warning", "Warnings", "yellow"), ("info", "Info", "green"))
+
+
+def get_console() -> Console:
+    """The console results are printed to, created (and rich imported) on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
 
-console = Console()
+def print_results(
+    results: ValidationResults,
+    *,
+    title: str | None = None,
+    max_examples: int | None = DEFAULT_EXAMPLES,
+    full_report: TextIO | None = None,
+) -> None:
+    """
+    Pretty-print results, grouped by level and code, and a summary.
 
+    Args:
+        max_examples: Show at most this many items of each code (``None`` for all);
+            the number of the others is shown instead.
+        full_report: Also write every item, as plain text, to this stream.
 
-def print_results(results: ValidationResults, *, title: str | None = None) -> None:
-    """Pretty-print results using Rich tables and summary."""
+    Rich tables are only used on a terminal; other output (CI logs, pipes) is
+    written as plain text, which is much faster for large result sets.
+    """
+    console = get_console()
+    pretty = console.is_terminal
     if title:
-        console.rule(f"[bold cyan]{title}")
+        if pretty:
+            console.rule(f"[bold cyan]{title}")
+        else:
+            console.file.write(f"== {title} ==\n")
 
-    _print_section(results.errors, "Errors", "red")
-    _print_section(results.warnings, "Warnings", "yellow")
-    _print_section(results.infos, "Info", "green")
+    hint = " (see the full report)" if full_report is not None else ""
+    for level, label, color in LEVELS:
+        if not results.count(level):
+            continue
+        groups = _groups(item for item in results if item.level == level)
+        if pretty:
+            _print_table(groups, f"{label} ({results.count(level)})", color, max_examples, hint)
+        else:
+            _write_groups(groups, f"{label} ({results.count(level)})", max_examples, hint)
+
+    if full_report is not None:
+        for item in results:
+            full_report.write(f"{item}\n")
+        full_report.flush()
 
     # Summary panel at the bottom
+    summary = f"Validation completed: {results.summary()}"
+    if not pretty:
+        console.file.write(summary + "\n")
+        return
+    from rich.panel import Panel
+    from rich.text import Text
+
     color = "red" if results.has_errors else ("yellow" if results.has_warnings else "green")
-    text = Text(f"Validation completed: {results.summary()}", style=f"bold {color}")
-    console.print(Panel(text, border_style=color))
+    console.print(Panel(Text(summary, style=f"bold {color}"), border_style=color))
 
 
-def _print_section(items: list[ValidationItem], label: str, color: str) -> None:
-    if not items:
-        return
+def _groups(items: Iterable[ValidationItem]) -> list[tuple[str, list[ValidationItem]]]:
+    """Items by code, largest group first (then in order of first appearance)."""
+    groups: dict[str, list[ValidationItem]] = {}
+    for item in items:
+        groups.setdefault(item.code or "-", []).append(item)
+    return sorted(groups.items(), key=lambda group: -len(group[1]))
+
+
+def _print_table(
+    groups: list[tuple[str, list[ValidationItem]]],
+    label: str,
+    color: str,
+    max_examples: int | None,
+    hint: str,
+) -> None:
+    from rich.table import Table
+
     table = Table(title=f"[bold {color}]{label}[/bold {color}]", show_header=False)
     table.add_column("Level", style=color, width=10)
     table.add_column("Code", style="bold magenta", width=16)
     table.add_column("Message", style="white")
 
-    for item in items:
-        table.add_row(item.level.upper(), item.code or "-", item.message)
-    console.print(table)
+    for code, items in groups:
+        shown = items if max_examples is None else items[:max_examples]
+        for item in shown:
+            table.add_row(item.level.upper(), item.code or "-", item.message)
+        if len(items) > len(shown):
+            table.add_row("", code, f"... and {len(items) - len(shown)} more{hint}", style="dim")
+        table.add_section()
+    get_console().print(table)
+
+
+def _write_groups(
+    groups: list[tuple[str, list[ValidationItem]]],
+    label: str,
+    max_examples: int | None,
+    hint: str,
+) -> None:
+    lines = [label]
+    for code, items in groups:
+        lines.append(f"  {code}: {len(items)}")
+        shown = items if max_examples is None else items[:max_examples]
+        lines.extend(f"    {item}" for item in shown)
+        if len(items) > len(shown):
+            lines.append(f"    ... and {len(items) - len(shown)} more{hint}")
+    get_console().file.write("\n".join(lines) + "\n")
 
 
 def print_results_json(results: ValidationResults) -> None:
     """Emit JSON for programmatic use."""
+    _print_json(results_payload(results))
+
+
+def _print_json(payload: dict) -> None:
+    text = json.dumps(payload, indent=2, sort_keys=True)
+    console = get_console()
+    if console.is_terminal:
+        console.print_json(text)
+    else:
+        # highlighting is slow for large documents, and lost in pipes anyway
+        console.file.write(text + "\n")
+
+
+def results_payload(results: ValidationResults) -> dict:
+    """The JSON document of `print_results_json`: a summary and every item."""
+    return {"summary": summary_payload(results), "items": [item.to_dict() for item in results]}
+
+
+def print_batch_results(
+    repos: Sequence[RepoResult],
+    *,
+    max_examples: int | None = DEFAULT_EXAMPLES,
+    full_report: TextIO | None = None,
+) -> None:
+    """Print the results of each repository, then a per-repository and aggregate summary."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
+
+    for repo in repos:
+        if full_report is not None:
+            full_report.write(f"== {repo.manifest_path} ==\n")
+        print_results(
+            repo.results,
+            title=str(repo.manifest_path),
+            max_examples=max_examples,
+            full_report=full_report,
+        )
+
+    table = Table(title="[bold cyan]Repositories[/bold cyan]")
+    table.add_column("Repository", style="white")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("Warnings", justify="right", style="yellow")
+    table.add_column("Infos", justify="right", style="green")
+    table.add_column("Status")
+    for repo in repos:
+        res = repo.results
+        status = "[red]FAILED" if res.has_errors else "[green]OK"
+        if res.truncated:
+            status += " (truncated)"
+        table.add_row(
+            str(repo.manifest_path),
+            str(res.count("error")),
+            str(res.count("warning")),
+            str(res.count("info")),
+            status,
+        )
+    console = get_console()
+    console.print(table)
+
+    aggregate = _aggregate(repos)
+    failed = sum(1 for repo in repos if repo.results.has_errors)
+    color = "red" if failed else ("yellow" if aggregate.has_warnings else "green")
+    text = Text(
+        f"Validated {len(repos)} repositories ({failed} failed): {aggregate.summary()}",
+        style=f"bold {color}",
+    )
+    console.print(Panel(text, border_style=color))
+
+
+def print_batch_results_json(repos: Sequence[RepoResult]) -> None:
+    """Emit JSON with an aggregate summary and the results of each repository."""
+    summary = summary_payload(_aggregate(repos))
+    summary["repositories"] = len(repos)
+    summary["failed"] = sum(1 for repo in repos if repo.results.has_errors)
     payload = {
-        "summary": {
-            "errors": len(results.errors),
-            "warnings": len(results.warnings),
-            "infos": len(results.infos),
-            "exit_code": results.rc,
-        },
-        "items": [item.__dict__ for item in results],
+        "summary": summary,
+        "repositories": [
+            {
+                "manifest": str(repo.manifest_path),
+                "summary": summary_payload(repo.results),
+                "items": [item.to_dict() for item in repo.results],
+            }
+            for repo in repos
+        ],
     }
-    console.print_json(json.dumps(payload, indent=2, sort_keys=True))
+    _print_json(payload)
+
+
+def _aggregate(repos: Sequence[RepoResult]) -> ValidationResults:
+    aggregate = ValidationResults()
+    for repo in repos:
+        aggregate.merge(repo.results)
+    return aggregate
 
 
 def aggregate_print(results_list: Iterable[ValidationResults]) -> ValidationResults:
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Iterable, List, Literal, Optional
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Iterable, List, Literal, Optional
 
 if TYPE_CHECKING:
-    pass
+    from labki_packs_tools.validation.sinks import ResultSink
 
 
 # ────────────────────────────────────────────────
@@ -15,40 +16,85 @@ class ValidationResults:
     """
     Container for all validation messages produced during repo validation.
     Provides convenience accessors and merge methods.
+
+    Items are counted per level and per code as they are added, so totals,
+    ``rc`` and ``summary()`` do not scan the items. Every added item is also
+    written to each of ``sinks`` (see `labki_packs_tools.validation.sinks`);
+    with ``keep_items=False`` items are only counted and written to the sinks,
+    not stored.
     """
 
     _items: List[ValidationItem] = field(default_factory=list)
+    sinks: List[ResultSink] = field(default_factory=list, repr=False, compare=False)
+    keep_items: bool = field(default=True, repr=False, compare=False)
+    truncated: bool = field(default=False, compare=False)
+    """True if validation stopped early because the error budget was spent"""
+    _levels: Counter = field(init=False, repr=False, compare=False)
+    _codes: Counter = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._levels = Counter(item.level for item in self._items)
+        self._codes = Counter(item.code for item in self._items)
 
     def add(self, item: ValidationItem) -> None:
-        self._items.append(item)
+        self._levels[item.level] += 1
+        self._codes[item.code] += 1
+        if self.keep_items:
+            self._items.append(item)
+        for sink in self.sinks:
+            sink.write(item)
 
     def extend(self, items: Iterable[ValidationItem]) -> None:
+        if self.sinks or not self.keep_items:
+            for item in items:
+                self.add(item)
+            return
+        start = len(self._items)
         self._items.extend(items)
+        added = self._items[start:]
+        self._levels.update(item.level for item in added)
+        self._codes.update(item.code for item in added)
 
     def merge(self, other: ValidationResults) -> None:
         self.extend(other._items)
+        self.truncated |= other.truncated
 
     # ─── Filters ─────────────────────────────────
     @property
     def errors(self) -> List[ValidationItem]:
-        return [i for i in self._items if i.level == "error"]
+        return self._filter("error")
 
     @property
     def warnings(self) -> List[ValidationItem]:
-        return [i for i in self._items if i.level == "warning"]
+        return self._filter("warning")
 
     @property
     def infos(self) -> List[ValidationItem]:
-        return [i for i in self._items if i.level == "info"]
+        return self._filter("info")
+
+    def _filter(self, level: str) -> List[ValidationItem]:
+        if not self._levels[level]:
+            return []
+        return [i for i in self._items if i.level == level]
+
+    # ─── Counters ────────────────────────────────
+    def count(self, level: str) -> int:
+        """Number of items of a level, including items not kept."""
+        return self._levels[level]
+
+    @property
+    def codes(self) -> dict[str | None, int]:
+        """Number of items per code (``None`` for items without one)."""
+        return {code: n for code, n in self._codes.items() if n}
 
     # ─── Status and summaries ────────────────────
     @property
     def has_errors(self) -> bool:
-        return bool(self.errors)
+        return self._levels["error"] > 0
 
     @property
     def has_warnings(self) -> bool:
-        return bool(self.warnings)
+        return self._levels["warning"] > 0
 
     @property
     def rc(self) -> int:
@@ -56,23 +102,34 @@ class ValidationResults:
         return 1 if self.has_errors else 0
 
     def summary(self) -> str:
-        return (
-            f"{len(self.errors)} error(s), {len(self.warnings)} warning(s), "
-            f"{len(self.infos)} info(s)"
+        text = (
+            f"{self._levels['error']} error(s), {self._levels['warning']} warning(s), "
+            f"{self._levels['info']} info(s)"
         )
+        if self.truncated:
+            text += " (truncated: stopped at the error limit)"
+        return text
 
     def __bool__(self) -> bool:
         """True if no errors."""
         return not self.has_errors
 
+    def __len__(self) -> int:
+        return sum(self._levels.values())
+
     def __iter__(self):
         yield from self._items
 
-    def print(self, *, title: str | None = None) -> None:
-        """Pretty-print this result set using the Rich formatter."""
+    def close(self) -> None:
+        """Tell the sinks that no more items follow."""
+        for sink in self.sinks:
+            sink.close(self)
+
+    def print(self, *, title: str | None = None, **options: Any) -> None:
+        """Pretty-print this result set using the Rich formatter (see `print_results`)."""
         from labki_packs_tools.validation.result_formatter import print_results
 
-        print_results(self, title=title)
+        print_results(self, title=title, **options)
 
     def print_json(self) -> None:
         """Emit structured JSON via the Rich formatter."""
@@ -84,7 +141,7 @@ class ValidationResults:
 # ────────────────────────────────────────────────
 # Core structured result
 # ────────────────────────────────────────────────
-@dataclass
+@dataclass(slots=True)
 class ValidationItem:
     """
     A single validation message with structured context.
@@ -95,8 +152,18 @@ class ValidationItem:
     repo_url: Optional[str] = None
     page: Optional[str] = None
     code: Optional[str] = None  # optional code for documentation / silencing
+    pack: Optional[str] = None  # pack the item is about, if any
+    file: Optional[str] = None  # repository-relative file the item is about, if any
+
+    def to_dict(self) -> dict[str, Any]:
+        """The fields as a JSON-serializable dict."""
+        return {name: getattr(self, name) for name in _ITEM_FIELDS}
 
     def __str__(self) -> str:
-        loc = f"{self.repo_url or ''} / {self.page or ''}".strip(" /")
+        subject = self.page or self.pack or self.file or ""
+        loc = f"{self.repo_url or ''} / {subject}".strip(" /")
         prefix = f"[{self.level.upper()}]"
         return f"{prefix} {loc}: {self.message}" if loc else f"{prefix} {self.message}"
+
+
+_ITEM_FIELDS = tuple(f.name for f in fields(ValidationItem))
@@ -0,0 +1,167 @@
+"""
+Process-wide registry of compiled JSON Schema validators.
+
+Loading a schema file and building its ``Draft202012Validator`` (and the
+generated fast path, see `labki_packs_tools.validation.fastpath`) happens once
+per distinct schema (keyed by path and content hash), however many manifests
+are validated in the process. Files are only re-read when their modification
+time or size changes.
+
+All validators resolve ``$ref``s to other documents through one `referencing`
+registry (`SCHEMA_REFS`), which reads them from local files, the packaged
+schemas or the schema download cache (see `schema_resolver.schema_for_uri`).
+Relative references are relative to the referencing schema file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from jsonschema import Draft202012Validator, ValidationError
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
+from referencing.jsonschema import DRAFT202012
+
+from labki_packs_tools.validation import schema_resolver
+from labki_packs_tools.validation.cache import digest, stat_signature
+from labki_packs_tools.validation.fastpath import FastValidator, UnsupportedSchema
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    schema: dict
+    validator: Draft202012Validator
+    digest: str
+    """Hash of the schema's canonical JSON, stable across processes"""
+    path: Path | None = None
+    fast: FastValidator | None = None
+    """Generated fast-path check, if the schema could be translated"""
+
+    def iter_errors(
+        self, instance: Any, subschema: Any = None, *, path: str | None = None
+    ) -> Iterable[ValidationError]:
+        """
+        Errors of ``instance`` against the schema, or against one of its subschemas
+        (located at ``path`` in the document being validated).
+
+        Instances the fast path proves valid skip ``jsonschema`` entirely.
+        """
+        if subschema is None:
+            if self.fast is not None and self.fast.is_valid(instance):
+                return ()
+            return self.validator.iter_errors(instance)
+
+        check = self.fast.validator_for(subschema) if self.fast is not None else None
+        if check is not None and check(instance):
+            return ()
+        return self.validator.descend(instance, subschema, path=path)
+
+
+def _retrieve(uri: str) -> Resource:
+    try:
+        path = schema_resolver.schema_for_uri(uri)
+        return _resource(path, tuple(stat_signature(path) or ()))
+    except (OSError, ValueError) as e:
+        raise NoSuchResource(ref=uri) from e
+
+
+@lru_cache(maxsize=256)
+def _resource(path: Path, signature: tuple[int, ...]) -> Resource:
+    # keyed by stat signature as well, so edited files are read again
+    return Resource.from_contents(json.loads(path.read_bytes()), default_specification=DRAFT202012)
+
+
+SCHEMA_REFS: Registry = Registry(retrieve=_retrieve)
+"""Registry shared by all compiled validators to look up referenced documents"""
+
+_lock = threading.Lock()
+_by_path: dict[Path, tuple[list[int] | None, str]] = {}  # path -> (stat signature, file hash)
+_by_file: dict[tuple[Path, str], CompiledSchema] = {}  # (path, file hash) -> compiled
+_by_digest: dict[tuple[Any, str], CompiledSchema] = {}  # (class, schema digest) -> compiled
+
+
+def load_schema(path: Path | str) -> CompiledSchema:
+    """
+    Load and compile a schema file, reusing the result of earlier calls.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not valid JSON.
+    """
+    path = Path(path).resolve()
+    stat = stat_signature(path)
+    with _lock:
+        known = _by_path.get(path)
+        if known is not None and stat is not None and known[0] == stat:
+            return _by_file[(path, known[1])]
+
+    raw = path.read_bytes()
+    file_hash = hashlib.sha256(raw).hexdigest()
+    with _lock:
+        compiled = _by_file.get((path, file_hash))
+    if compiled is None:
+        compiled = compile_schema(json.loads(raw), path=path)
+    with _lock:
+        _by_file[(path, file_hash)] = compiled
+        _by_path[path] = (stat, file_hash)
+    return compiled
+
+
+def compile_schema(
+    schema: dict[str, Any],
+    *,
+    path: Path | None = None,
+    validator_cls: Callable[..., Any] = Draft202012Validator,
+) -> CompiledSchema:
+    """
+    Return the compiled validator for an in-memory schema, building it on first use.
+
+    ``path`` is where the schema was read from; relative ``$ref``s in a schema
+    without ``$id`` are resolved against it.
+    """
+    schema_digest = digest(schema)
+    key = (validator_cls, schema_digest)
+    with _lock:
+        compiled = _by_digest.get(key)
+    if compiled is not None:
+        return compiled
+
+    # private copy, so later changes to the caller's dict cannot leak into the registry
+    schema = copy.deepcopy(schema)
+    fast = None
+    if validator_cls is Draft202012Validator:  # the generated code follows its semantics
+        with contextlib.suppress(UnsupportedSchema):
+            fast = FastValidator(schema)
+    if hasattr(validator_cls, "META_SCHEMA"):  # a jsonschema validator class
+        # relative $refs are relative to the schema file, unless it declares its own $id
+        base = {"$id": path.as_uri()} if path is not None and "$id" not in schema else {}
+        validator = validator_cls({**base, **schema}, registry=SCHEMA_REFS)
+    else:
+        validator = validator_cls(schema)
+    compiled = CompiledSchema(
+        schema=schema,
+        validator=validator,
+        digest=schema_digest,
+        path=path,
+        fast=fast,
+    )
+    with _lock:
+        return _by_digest.setdefault(key, compiled)
+
+
+def clear_schema_registry() -> None:
+    """Forget all compiled schemas, referenced documents and the schema index."""
+    with _lock:
+        _by_path.clear()
+        _by_file.clear()
+        _by_digest.clear()
+    _resource.cache_clear()
+    schema_resolver.clear_schema_index()
@@ -1,22 +1,36 @@
 from __future__ import annotations
 
-import warnings
+import hashlib
+import json
+import os
+from functools import cache
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
-from labki_packs_tools.const import SCHEMA_DIR, SCHEMA_INDEX
+from labki_packs_tools import const
 from labki_packs_tools.utils import load_json, load_yaml
+from labki_packs_tools.validation.cache import default_cache_dir
 
+FETCH_ENV = "LABKI_FETCH_SCHEMAS"
+"""When set (and not ``0``), schema URLs missing from the schema cache are downloaded into it"""
 
-def resolve_schema(manifest: Path | str | dict[str, Any]) -> Path:
+FETCH_TIMEOUT = 30
+"""Seconds to wait for a schema download"""
+
+
+def resolve_schema(manifest: Path | str | dict[str, Any], *, base_dir: Path | None = None) -> Path:
     """
     Resolve and return the correct JSON Schema path for a given manifest.
 
-    This function determines which schema file to use based on the `schema_version`
-    field in the manifest. It supports both path and dict inputs.
+    This function determines which schema file to use based on the `$schema`
+    field of the manifest if it has one, otherwise on its `schema_version`.
+    It supports both path and dict inputs.
 
     Args:
         manifest: Either a path to a manifest YAML file or a pre-loaded manifest dict.
+        base_dir: Directory a relative `$schema` path is relative to
+            (default: the manifest's directory, or the working directory for a dict).
 
     Returns:
         The resolved Path to the JSON schema file.
@@ -31,20 +45,19 @@ def resolve_schema(manifest: Path | str | dict[str, Any]) -> Path:
     # ───────────────────────────────
     if not isinstance(manifest, dict):
         manifest_path = Path(manifest)
+        if base_dir is None:
+            base_dir = manifest_path.parent
         try:
             manifest = load_yaml(manifest_path)
         except Exception as e:
             raise ValueError(f"Failed to read manifest '{manifest_path}': {e}") from e
 
     # ───────────────────────────────
-    # Handle explicit $schema (not yet supported)
+    # Explicit $schema (path or URL)
     # ───────────────────────────────
     explicit_schema = manifest.get("$schema")
     if isinstance(explicit_schema, str) and explicit_schema.strip():
-        warnings.warn(
-            "Explicit $schema URIs are not yet supported. Ignoring explicit $schema field.",
-            stacklevel=2,
-        )
+        return schema_for_uri(explicit_schema.strip(), base_dir=base_dir)
 
     # ───────────────────────────────
     # Resolve by schema_version
@@ -64,7 +77,7 @@ def resolve_schema(manifest: Path | str | dict[str, Any]) -> Path:
         )
 
     schema_rel = manifest_map[version_str]
-    schema_path = (SCHEMA_DIR / schema_rel).resolve()
+    schema_path = (const.SCHEMA_DIR / schema_rel).resolve()
 
     if not schema_path.exists():
         raise ValueError(
@@ -75,20 +88,143 @@ def resolve_schema(manifest: Path | str | dict[str, Any]) -> Path:
     return schema_path
 
 
+def packaged_schemas() -> list[Path]:
+    """
+    Return the schema files listed in the schema index, each once, in index order.
+
+    Raises:
+        RuntimeError: If the schema index file itself is missing or corrupt.
+    """
+    paths: list[Path] = []
+    for schema_rel in _read_index().get("manifest", {}).values():
+        path = (const.SCHEMA_DIR / schema_rel).resolve()
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def schema_for_uri(uri: str, *, base_dir: Path | None = None) -> Path:
+    """
+    Local file of the schema at ``uri``: a path (relative to ``base_dir``), a
+    ``file:`` URI, or an ``http(s):`` URL.
+
+    URLs are matched against the ``$id`` of the packaged schemas first, then
+    looked up in the schema cache (`schema_cache_dir`). Validation never uses
+    the network by default: other URLs are only downloaded into the cache if
+    ``$LABKI_FETCH_SCHEMAS`` is set, or beforehand with `fetch_schema`.
+
+    Raises:
+        ValueError: If the file does not exist, or the URL is neither cached nor
+            downloadable.
+    """
+    parts = urlsplit(uri)
+    if parts.scheme in ("http", "https"):
+        packaged = _packaged_ids().get(uri)
+        return packaged if packaged is not None else _cached_schema(uri)
+
+    if parts.scheme == "file":
+        from urllib.request import url2pathname
+
+        path = Path(url2pathname(parts.path))
+    elif len(parts.scheme) > 1:  # a single letter is a Windows drive
+        raise ValueError(f"Unsupported schema URI '{uri}': use a path, file: or http(s): URI")
+    else:
+        path = Path(uri)
+        if not path.is_absolute():
+            path = (base_dir if base_dir is not None else Path.cwd()) / path
+    if not path.is_file():
+        raise ValueError(f"Schema file not found: {path}")
+    return path.resolve()
+
+
+def clear_schema_index() -> None:
+    """Read the schema index (and the ``$id`` of packaged schemas) again on next use."""
+    _read_index.cache_clear()
+    _packaged_ids.cache_clear()
+
+
+def schema_cache_dir() -> Path:
+    """Where downloaded schemas are kept: ``schemas/`` in the validation cache directory."""
+    return default_cache_dir() / "schemas"
+
+
+def fetch_schema(url: str) -> Path:
+    """
+    Download the schema at ``url`` into the schema cache, replacing a cached copy.
+
+    Raises:
+        ValueError: If the download fails or is not JSON.
+    """
+    path = _cache_path(url)
+
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+            raw = response.read()
+        json.loads(raw)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Failed to download schema '{url}': {e}") from e
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(raw)
+    os.replace(tmp, path)
+    return path
+
+
+def _cache_path(url: str) -> Path:
+    name = Path(urlsplit(url).path).name or "schema.json"
+    return schema_cache_dir() / f"{hashlib.sha256(url.encode()).hexdigest()[:16]}-{name}"
+
+
+def _cached_schema(url: str) -> Path:
+    path = _cache_path(url)
+    if path.is_file():
+        return path
+    if os.environ.get(FETCH_ENV, "0") in ("", "0"):
+        raise ValueError(
+            f"Schema '{url}' is not in the schema cache ({path.parent}); "
+            f"run with --fetch-schemas or set {FETCH_ENV}=1 to download it"
+        )
+    return fetch_schema(url)
+
+
+@cache
+def _packaged_ids() -> dict[str, Path]:
+    """Packaged schemas by their ``$id``, so URLs of released schemas resolve offline."""
+    ids: dict[str, Path] = {}
+    try:
+        paths = packaged_schemas()
+    except RuntimeError:
+        return ids
+    for path in paths:
+        try:
+            schema = load_json(path)
+        except (OSError, ValueError):
+            continue
+        schema_id = schema.get("$id") if isinstance(schema, dict) else None
+        if isinstance(schema_id, str):
+            ids.setdefault(schema_id, path)
+    return ids
+
+
+@cache
 def _read_index() -> dict[str, Any]:
     """
     Load and return the schema index JSON file that maps schema versions to file paths.
 
+    The index is read once per process.
+
     Raises:
         RuntimeError: If the schema index file does not exist or cannot be loaded.
     """
-    if not SCHEMA_INDEX.exists():
+    if not const.SCHEMA_INDEX.exists():
         raise RuntimeError(
             "Schema index file not found. The package may be installed incorrectly "
             "or the schema index is missing. Please reinstall or report a packaging issue."
         )
 
     try:
-        return load_json(SCHEMA_INDEX)
+        return load_json(const.SCHEMA_INDEX)
     except Exception as e:
-        raise RuntimeError(f"Failed to load schema index from '{SCHEMA_INDEX}': {e}") from e
+        raise RuntimeError(f"Failed to load schema index from '{const.SCHEMA_INDEX}': {e}") from e
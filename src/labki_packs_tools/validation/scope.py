@@ -0,0 +1,195 @@
+"""
+Restrict validation to what changed since a git revision.
+
+`changed_scope` compares the working tree with a revision using git plumbing
+(``git diff``, ``git ls-files``, ``git show``) and returns the manifest entries
+and files whose validation results can differ:
+
+- pages whose manifest entry changed, or whose page file changed
+- packs whose manifest entry changed, packs listing a changed page or sharing a
+  page title with a changed pack, and every pack that (transitively)
+  ``depends_on`` a changed pack
+- changed files, and the files of changed pages (for orphan detection)
+
+Validating with a `ValidationScope` reports exactly the items of a full run
+that `ValidationScope.includes`; repository-wide items (e.g. top-level
+fields) are always included. A dependency cycle is reported on its first pack:
+every pack of a cycle depends on the others, so a change to any of them puts
+the whole cycle in scope.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+import yaml
+
+from labki_packs_tools.utils import UniqueKeyLoader, load_yaml
+from labki_packs_tools.validation.result_types import ValidationItem
+
+
+@dataclass
+class ValidationScope:
+    pages: set[str] = field(default_factory=set)
+    packs: set[str] = field(default_factory=set)
+    files: set[str] = field(default_factory=set)
+    """Paths relative to the manifest's directory, with ``/`` separators"""
+
+    def includes(self, item: ValidationItem) -> bool:
+        """Whether an item is about something in scope (items about nothing in particular are)."""
+        if item.page is not None:
+            return item.page in self.pages
+        if item.pack is not None:
+            return item.pack in self.packs
+        if item.file is not None:
+            return item.file in self.files
+        return True
+
+
+def changed_scope(manifest_path: Path | str, ref: str) -> ValidationScope | None:
+    """
+    Compute the `ValidationScope` of the changes between ``ref`` and the working tree.
+
+    Uncommitted and untracked (but not ignored) files count as changed.
+
+    Returns:
+        The scope, or ``None`` if everything must be validated: the manifest did
+        not exist at ``ref``, could not be parsed, or one of its top-level fields
+        (e.g. ``schema_version``) changed.
+
+    Raises:
+        ValueError: If the manifest is not in a git work tree, ``ref`` is not a
+            commit, or git is not available.
+    """
+    manifest_path = Path(manifest_path)
+    repo_dir = manifest_path.parent.resolve()
+    toplevel = Path(_git(repo_dir, "rev-parse", "--show-toplevel").strip())
+    _git(toplevel, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    prefix = PurePosixPath(repo_dir.relative_to(toplevel.resolve()).as_posix())
+
+    changed = _git(toplevel, "diff", "--name-only", "--no-renames", "-z", ref, "--", str(prefix))
+    untracked = _git(
+        toplevel, "ls-files", "--others", "--exclude-standard", "-z", "--", str(prefix)
+    )
+    files = {
+        PurePosixPath(name).relative_to(prefix).as_posix()
+        for name in (changed + untracked).split("\0")
+        if name
+    }
+
+    try:
+        old_text = _git(toplevel, "show", f"{ref}:{prefix / manifest_path.name}")
+        old = yaml.load(old_text, Loader=UniqueKeyLoader)
+        new = load_yaml(manifest_path)
+    except (ValueError, yaml.YAMLError):
+        return None
+    return diff_scope(old, new, files)
+
+
+def diff_scope(old: Any, new: Any, files: set[str] | None = None) -> ValidationScope | None:
+    """
+    The `ValidationScope` of the changes between two versions of a manifest.
+
+    Args:
+        old: Previous manifest data.
+        new: Current manifest data.
+        files: Changed files, relative to the manifest's directory.
+
+    Returns:
+        The scope, or ``None`` if everything must be validated (see `changed_scope`).
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    if _top_level(old) != _top_level(new):
+        return None
+
+    old_pages, new_pages = _section(old, "pages"), _section(new, "pages")
+    old_packs, new_packs = _section(old, "packs"), _section(new, "packs")
+    if None in (old_pages, new_pages, old_packs, new_packs):
+        return None
+
+    files = set(files or ())
+    scope = ValidationScope(files=files)
+    scope.pages = _changed_keys(old_pages, new_pages)
+    scope.pages.update(title for title, meta in new_pages.items() if _page_file(meta) in files)
+    for title in scope.pages:
+        for pages in (old_pages, new_pages):
+            file = _page_file(pages.get(title))
+            if file is not None:
+                scope.files.add(file)
+
+    changed_packs = _changed_keys(old_packs, new_packs)
+    titles = set(scope.pages)
+    for pack_id in changed_packs:
+        for packs in (old_packs, new_packs):
+            titles.update(_str_list(packs.get(pack_id), "pages"))
+    owning = {
+        pack_id
+        for pack_id, meta in new_packs.items()
+        if not titles.isdisjoint(_str_list(meta, "pages"))
+    }
+    scope.packs = changed_packs | owning | _dependents(new_packs, changed_packs)
+    return scope
+
+
+def _git(cwd: Path, *args: str) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(cwd), *args], capture_output=True, text=True, encoding="utf-8"
+        )
+    except FileNotFoundError as e:
+        raise ValueError("git is not installed or not on PATH") from e
+    if proc.returncode != 0:
+        detail = proc.stderr.strip() or f"exit code {proc.returncode}"
+        raise ValueError(f"git {' '.join(args)} failed: {detail}")
+    return proc.stdout
+
+
+def _top_level(manifest: dict) -> dict:
+    return {k: v for k, v in manifest.items() if k not in ("pages", "packs")}
+
+
+def _section(manifest: dict, name: str) -> dict | None:
+    value = manifest.get(name)
+    if value is None:
+        return {}
+    return value if isinstance(value, dict) else None
+
+
+def _changed_keys(old: dict, new: dict) -> set[str]:
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def _page_file(meta: Any) -> str | None:
+    file = meta.get("file") if isinstance(meta, dict) else None
+    if not isinstance(file, str):
+        return None
+    return PurePosixPath(os.path.normpath(file).replace(os.sep, "/")).as_posix()
+
+
+def _str_list(meta: Any, key: str) -> list[str]:
+    values = meta.get(key) if isinstance(meta, dict) else None
+    if not isinstance(values, list):
+        return []
+    return [v for v in values if isinstance(v, str)]
+
+
+def _dependents(packs: dict, pack_ids: set[str]) -> set[str]:
+    """Packs that transitively depend on any of ``pack_ids`` (which may no longer exist)."""
+    reverse: dict[str, set[str]] = {}
+    for pack_id, meta in packs.items():
+        for dep in _str_list(meta, "depends_on"):
+            reverse.setdefault(dep, set()).add(pack_id)
+
+    found: set[str] = set()
+    stack = list(pack_ids)
+    while stack:
+        for dependent in reverse.get(stack.pop(), ()):
+            if dependent not in found:
+                found.add(dependent)
+                stack.append(dependent)
+    return found
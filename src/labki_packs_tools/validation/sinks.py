@@ -0,0 +1,135 @@
+"""
+Write validation items out as they are produced.
+
+A sink attached to `ValidationResults` (``ValidationResults(sinks=[...])``)
+receives every item when it is added, and the totals when
+`ValidationResults.close` is called, so output can be streamed while
+validators run instead of being rendered from all results at the end.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, TextIO
+
+from labki_packs_tools.validation.result_types import ValidationItem
+
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.result_types import ValidationResults
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+DEFAULT_RULE = "labki"
+"""SARIF rule id of items without a code"""
+
+
+class ResultSink(ABC):
+    """Receives items one at a time."""
+
+    @abstractmethod
+    def write(self, item: ValidationItem) -> None:
+        """Handle one item."""
+
+    @abstractmethod
+    def close(self, results: ValidationResults) -> None:
+        """Called once after the last item, with the results that counted them."""
+
+
+def summary_payload(results: ValidationResults) -> dict:
+    """Totals as reported in the ``summary`` of JSON output."""
+    summary = {
+        "errors": results.count("error"),
+        "warnings": results.count("warning"),
+        "infos": results.count("info"),
+        "exit_code": results.rc,
+    }
+    if results.truncated:
+        summary["truncated"] = True
+    return summary
+
+
+class NdjsonSink(ResultSink):
+    """One JSON object per item and line, then a ``{"summary": ...}`` line."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, item: ValidationItem) -> None:
+        self.stream.write(json.dumps(item.to_dict(), sort_keys=True) + "\n")
+        self.stream.flush()
+
+    def close(self, results: ValidationResults) -> None:
+        self.stream.write(json.dumps({"summary": summary_payload(results)}, sort_keys=True) + "\n")
+        self.stream.flush()
+
+
+class SarifSink(ResultSink):
+    """
+    A SARIF 2.1.0 log with one run, for code scanning tools.
+
+    Results are written as they arrive; the tool description, whose rules are
+    the codes seen, follows them. Items about a file are located in that file,
+    others in ``manifest_uri``, with the page or pack as logical location.
+    """
+
+    def __init__(self, stream: TextIO, *, manifest_uri: str = "manifest.yml"):
+        self.stream = stream
+        self.manifest_uri = manifest_uri
+        self._codes: dict[str, None] = {}
+        self._started = False
+
+    def write(self, item: ValidationItem) -> None:
+        code = item.code or DEFAULT_RULE
+        self._codes.setdefault(code)
+        if self._started:
+            self.stream.write(",\n")
+        else:
+            self._start()
+        self.stream.write(json.dumps(self._result(item, code), sort_keys=True))
+        self.stream.flush()
+
+    def close(self, results: ValidationResults) -> None:
+        if not self._started:
+            self._start()
+        tool = {"driver": {"name": "labki-packs-tools", "rules": self._rules()}}
+        self.stream.write(f'\n], "tool": {json.dumps(tool, sort_keys=True)}}}]}}\n')
+        self.stream.flush()
+
+    def _start(self) -> None:
+        self._started = True
+        header = json.dumps({"$schema": SARIF_SCHEMA, "version": "2.1.0"})
+        self.stream.write(header[:-1] + ', "runs": [{"results": [\n')
+
+    def _result(self, item: ValidationItem, code: str) -> dict:
+        location: dict = {
+            "physicalLocation": {"artifactLocation": {"uri": item.file or self.manifest_uri}}
+        }
+        logical = [
+            {"name": name, "kind": kind}
+            for name, kind in ((item.page, "page"), (item.pack, "pack"))
+            if name is not None
+        ]
+        if logical:
+            location["logicalLocations"] = logical
+        return {
+            "ruleId": code,
+            "level": SARIF_LEVELS.get(item.level, "none"),
+            "message": {"text": item.message},
+            "locations": [location],
+        }
+
+    def _rules(self) -> list[dict]:
+        # importing the validators registers them all
+        from labki_packs_tools.validation.validators.base import Validator
+
+        descriptions = {
+            getattr(v, "code", None): getattr(v, "message", None) for v in Validator.registry
+        }
+        rules = []
+        for code in self._codes:
+            rule: dict = {"id": code}
+            if descriptions.get(code):
+                rule["shortDescription"] = {"text": descriptions[code]}
+            rules.append(rule)
+        return rules
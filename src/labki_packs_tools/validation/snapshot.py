@@ -0,0 +1,403 @@
+"""
+One-pass snapshot of a repository's ``pages/`` tree.
+
+`FileSnapshot.scan` lists ``pages/`` once with ``os.scandir`` and records
+the stat data of every file. File-based validators answer "does this page
+file exist?", "which files are orphans?" and "has this file changed?" from
+the snapshot instead of issuing ``resolve()``/``exists()``/``os.walk`` calls
+per page. On high-latency filesystems (e.g. NFS) directories can be listed
+concurrently.
+
+Ignore rules are glob patterns, read from a ``.labkiignore`` file next to
+the manifest (one per line, ``#`` for comments) or passed in. Like
+``.gitignore``, a pattern without ``/`` matches a name at any depth, and one
+with ``/`` matches the path relative to the repository. Ignored directories
+are not scanned; paths in them are looked up directly when referenced.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import posixpath
+import stat
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+IGNORE_FILE = ".labkiignore"
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    size: int
+    mtime_ns: int
+    exists: bool
+    """False for dangling symlinks"""
+    real: str
+    """Path with symlinks resolved (relative to the repository when inside it)"""
+    walked: bool = True
+    """False if only reachable through a symlinked directory (which os.walk does not follow)"""
+
+    @property
+    def signature(self) -> list[int] | None:
+        """``[mtime_ns, size]``, like `labki_packs_tools.validation.cache.stat_signature`."""
+        return [self.mtime_ns, self.size] if self.exists else None
+
+
+@dataclass
+class PageFiles:
+    """Which pages reference which files, built once per manifest by `FileSnapshot.page_files`."""
+
+    titles: dict[str, set[str]]
+    """Normalized file path (as written, if outside the repository) -> titles referencing it"""
+    unlisted: set[str]
+    """Keys of ``titles`` outside the scanned tree or ignored, which are looked up directly"""
+
+
+@dataclass
+class _Listing:
+    rel: str
+    real: str
+    walked: bool
+    files: dict[str, FileInfo]
+    subdirs: list[tuple[str, str, bool, int]]  # (rel, real, walked, mtime_ns)
+
+
+class FileSnapshot:
+    """Files and directories under ``root/subdir``, keyed by ``/``-separated relative path."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        subdir: str = "pages",
+        files: dict[str, FileInfo] | None = None,
+        dirs: dict[str, int] | None = None,
+        ignore: Iterable[str] = (),
+    ):
+        self.root = root
+        self.subdir = subdir
+        self.files: dict[str, FileInfo] = files or {}
+        self.dirs: dict[str, int] = dirs or {}
+        """Scanned directories and their mtime (in ns)"""
+        self.ignore = tuple(ignore)
+        self._real_dirs: dict[str, tuple[str, bool]] = {}  # rel -> (real, walked)
+        self._skipped: set[str] = set()
+        self._located: dict[str, tuple[str | None, str | None]] = {}
+
+    # ─── Construction ────────────────────────────
+    @classmethod
+    def scan(
+        cls,
+        repo_dir: Path | str,
+        *,
+        subdir: str = "pages",
+        ignore: Iterable[str] | None = None,
+        jobs: int = 1,
+    ) -> FileSnapshot:
+        """
+        List ``repo_dir/subdir`` recursively.
+
+        Args:
+            repo_dir: Directory containing the manifest.
+            subdir: Directory to scan, relative to ``repo_dir``.
+            ignore: Glob patterns to skip; default: the ``.labkiignore`` file, if any.
+            jobs: Number of directories listed concurrently.
+        """
+        root = Path(repo_dir).resolve()
+        if ignore is None:
+            ignore = read_ignore_file(root / IGNORE_FILE)
+        snapshot = cls(root, subdir=subdir, ignore=ignore)
+
+        snapshot._scan_all(jobs)
+        return snapshot
+
+    def _scan_all(self, jobs: int = 1) -> None:
+        start = self.root / self.subdir
+        try:
+            st = start.stat()
+        except OSError:
+            return
+        if not stat.S_ISDIR(st.st_mode):
+            return
+        self.dirs[self.subdir] = st.st_mtime_ns
+        self._real_dirs[self.subdir] = (self.subdir, True)
+        self._scan([(self.subdir, self.subdir, True)], jobs)
+
+    def _scan(self, todo: list[tuple[str, str, bool]], jobs: int = 1) -> None:
+        seen_real = {os.path.realpath(self.root / self.subdir)}
+        if jobs <= 1:
+            while todo:
+                listing = self._list(*todo.pop())
+                todo += self._merge(listing, seen_real)
+            return
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            pending: set[Future] = {pool.submit(self._list, *args) for args in todo}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for args in self._merge(future.result(), seen_real):
+                        pending.add(pool.submit(self._list, *args))
+
+    def _list(self, rel: str, real: str, walked: bool) -> _Listing:
+        listing = _Listing(rel, real, walked, {}, [])
+        try:
+            it = os.scandir(self.root / rel)
+        except OSError:
+            return listing
+        with it:
+            for entry in it:
+                child = f"{rel}/{entry.name}"
+                if self.ignored(child):
+                    continue
+                child_real = f"{real}/{entry.name}"
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if entry.is_symlink():
+                    child_real = self._relative(os.path.realpath(entry.path))
+                if is_dir:
+                    try:
+                        mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    # os.walk lists symlinked directories but does not descend into them
+                    listing.subdirs.append(
+                        (child, child_real, walked and not entry.is_symlink(), mtime)
+                    )
+                    continue
+                try:
+                    st, exists = entry.stat(), True
+                except OSError:
+                    st, exists = entry.stat(follow_symlinks=False), False
+                listing.files[child] = FileInfo(
+                    st.st_size, st.st_mtime_ns, exists, child_real, walked
+                )
+        return listing
+
+    def _merge(self, listing: _Listing, seen_real: set[str]) -> list[tuple[str, str, bool]]:
+        self.files.update(listing.files)
+        todo = []
+        for rel, real, walked, mtime in listing.subdirs:
+            if real != rel:
+                # reached through a symlink: guard against loops and repeated subtrees
+                real_abs = os.path.realpath(self.root / rel)
+                if real_abs in seen_real:
+                    self._skipped.add(rel)
+                    continue
+                seen_real.add(real_abs)
+            self.dirs[rel] = mtime
+            self._real_dirs[rel] = (real, walked)
+            todo.append((rel, real, walked))
+        return todo
+
+    # ─── Updates ─────────────────────────────────
+    def refresh(self, paths: Iterable[str]) -> set[str]:
+        """
+        Re-read paths (files or directories) that changed since the scan.
+
+        Returns:
+            The files whose entries were added, removed or changed.
+        """
+        changed: set[str] = set()
+        for path in sorted(paths):
+            norm = self.normalize(path)
+            if norm is None or self._in_ignored(norm):
+                continue
+            if norm != self.subdir:
+                parent = posixpath.dirname(norm)
+                if not norm.startswith(f"{self.subdir}/") or parent not in self.dirs:
+                    continue  # outside the tree, or in a directory that is itself refreshed
+            before = self._files_under(norm)
+            self._forget(norm)
+            if norm == self.subdir:
+                self._scan_all()
+            else:
+                self._refresh_entry(norm, parent)
+                with contextlib.suppress(OSError):
+                    self.dirs[parent] = os.stat(self.root / parent).st_mtime_ns
+            after = self._files_under(norm)
+            changed.update(
+                rel for rel in before.keys() | after.keys() if before.get(rel) != after.get(rel)
+            )
+        return changed
+
+    def _files_under(self, norm: str) -> dict[str, FileInfo]:
+        if norm not in self.dirs:
+            info = self.files.get(norm)
+            return {norm: info} if info is not None else {}
+        prefix = f"{norm}/"
+        return {rel: info for rel, info in self.files.items() if rel.startswith(prefix)}
+
+    def changes(self, other: FileSnapshot) -> set[str]:
+        """Files and directories that differ between this snapshot and ``other``."""
+        changed = self.files.keys() ^ other.files.keys()
+        changed |= self.dirs.keys() ^ other.dirs.keys()
+        changed.update(
+            rel for rel, info in self.files.items() if other.files.get(rel, info) != info
+        )
+        return changed
+
+    def _forget(self, norm: str) -> None:
+        self.files.pop(norm, None)
+        self._skipped.discard(norm)
+        if norm not in self.dirs:
+            return
+        prefix = f"{norm}/"
+        for table in (self.files, self.dirs, self._real_dirs):
+            for rel in [rel for rel in table if rel == norm or rel.startswith(prefix)]:
+                del table[rel]
+        self._skipped = {rel for rel in self._skipped if not rel.startswith(prefix)}
+
+    def _refresh_entry(self, norm: str, parent: str) -> None:
+        full = self.root / norm
+        try:
+            lst = os.lstat(full)
+        except OSError:
+            return  # removed
+        parent_real, walked = self._real_dirs[parent]
+        is_link = stat.S_ISLNK(lst.st_mode)
+        real = f"{parent_real}/{posixpath.basename(norm)}"
+        if is_link:
+            real = self._relative(os.path.realpath(full))
+        try:
+            st, exists = (os.stat(full) if is_link else lst), True
+        except OSError:
+            st, exists = lst, False
+
+        if not (exists and stat.S_ISDIR(st.st_mode)):
+            self.files[norm] = FileInfo(st.st_size, st.st_mtime_ns, exists, real, walked)
+            return
+        listing = _Listing(parent, parent_real, walked, {}, [])
+        listing.subdirs.append((norm, real, walked and not is_link, st.st_mtime_ns))
+        self._scan(self._merge(listing, set()))
+
+    def _relative(self, path: str) -> str:
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return path
+
+    # ─── Queries ─────────────────────────────────
+    def ignored(self, rel: str) -> bool:
+        """Whether a ``/``-separated relative path matches an ignore rule."""
+        name = posixpath.basename(rel)
+        for pattern in self.ignore:
+            if "/" in pattern.rstrip("/"):
+                if fnmatchcase(rel, pattern.strip("/")):
+                    return True
+            elif fnmatchcase(name, pattern.rstrip("/")):
+                return True
+        return False
+
+    def normalize(self, path: str) -> str | None:
+        """Relative ``/``-separated form of a manifest file path, ``None`` if outside the repo."""
+        return self._locate(path)[0]
+
+    def _locate(self, path: str) -> tuple[str | None, str | None]:
+        """``(normalized path, parent directory if in the scanned tree)``, memoized."""
+        located = self._located.get(path)
+        if located is not None:
+            return located
+        norm = None
+        if not os.path.isabs(path):
+            norm = os.path.normpath(path).replace(os.sep, "/")
+            if norm == ".." or norm.startswith("../"):
+                norm = None
+        parent = None
+        if norm is not None and norm.startswith(f"{self.subdir}/") and not self._in_ignored(norm):
+            parent = posixpath.dirname(norm)
+        self._located[path] = located = (norm, parent)
+        return located
+
+    def get(self, path: str) -> FileInfo | None:
+        """
+        Stat data of a file (following symlinks), ``None`` if nothing exists there.
+
+        Answered from the snapshot for paths in the scanned tree; other paths
+        (outside ``subdir``, or ignored) are looked up directly.
+        """
+        norm, parent = self._locate(path)
+        if parent is None:
+            return self._stat_direct(path)
+        if parent in self.dirs:
+            return self.files.get(norm)
+        if self.subdir not in self.dirs:
+            return None  # no scanned tree at all
+        while parent not in self.dirs:
+            if parent in self._skipped:
+                return self._stat_direct(path)
+            parent = posixpath.dirname(parent)
+        # an ancestor was listed without this directory in it
+        return None
+
+    def exists(self, path: str) -> bool:
+        info = self.get(path)
+        return info is not None and info.exists
+
+    def stat_signature(self, path: str) -> list[int] | None:
+        info = self.get(path)
+        return info.signature if info is not None else None
+
+    def canonical(self, path: str) -> str:
+        """The symlink-free path of a file, used to compare references with files found."""
+        info = self.get(path)
+        if info is not None:
+            return info.real
+        norm = self.normalize(path)
+        return norm if norm is not None else os.path.normpath(path)
+
+    def page_files(self, pages: Any) -> PageFiles:
+        """Index the ``file`` of every entry of a manifest's ``pages``."""
+        titles: dict[str, set[str]] = {}
+        unlisted: set[str] = set()
+        if isinstance(pages, dict):
+            for title, meta in pages.items():
+                file = meta.get("file") if isinstance(meta, dict) else None
+                if not isinstance(file, str) or not file:
+                    continue
+                norm, parent = self._locate(file)
+                key = norm if norm is not None else file
+                titles.setdefault(key, set()).add(title)
+                if parent is None:
+                    unlisted.add(key)
+        return PageFiles(titles, unlisted)
+
+    def aliases(self, reals: set[str]) -> set[str]:
+        """Listed files that are symlinks to (or reached through symlinks to) one of ``reals``."""
+        return {rel for rel, info in self.files.items() if info.real != rel and info.real in reals}
+
+    def walk_files(self) -> Iterator[str]:
+        """Files that ``os.walk`` (without following symlinks) would list, sorted."""
+        return iter(sorted(rel for rel, info in self.files.items() if info.walked))
+
+    def _in_ignored(self, norm: str) -> bool:
+        if not self.ignore:
+            return False
+        parts = norm.split("/")
+        return any(self.ignored("/".join(parts[: i + 1])) for i in range(1, len(parts)))
+
+    def _stat_direct(self, path: str) -> FileInfo | None:
+        full = self.root / path
+        try:
+            st, exists = full.stat(), True
+        except OSError:
+            try:
+                st, exists = full.lstat(), False
+            except OSError:
+                return None
+        return FileInfo(st.st_size, st.st_mtime_ns, exists, self._relative(os.path.realpath(full)))
+
+
+def read_ignore_file(path: Path) -> list[str]:
+    """Patterns of an ignore file; missing file: no patterns."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
@@ -0,0 +1,275 @@
+"""
+Streaming manifest validation driven by YAML parse events.
+
+`validate_repo` loads the whole manifest before any validator runs.
+For very large, generated manifests this module instead walks the YAML
+event stream and validates each ``pages`` / ``packs`` entry as soon as it has
+been parsed, yielding ``ValidationItem`` objects immediately.
+
+Only the compact state needed for cross-references is kept between entries:
+
+- page title -> file path (pack page references and orphan detection)
+- pack id -> ``depends_on`` (dependency and cycle checks)
+- page title -> owning pack (duplicate page detection)
+
+Items are produced in stream order rather than in the per-validator order of
+`validate_repo`, and only the built-in validators are applied.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterator
+
+import yaml
+
+from labki_packs_tools.utils import PackGraph, UniqueKeyLoader
+from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+from labki_packs_tools.validation.schema_registry import CompiledSchema, load_schema
+from labki_packs_tools.validation.schema_resolver import resolve_schema
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators import (
+    ManifestSchemaValidator,
+    OrphanPageValidator,
+    PackCycleValidator,
+    PackDependencyValidator,
+    PackPagesValidator,
+    PackRedundantDependencyValidator,
+    PageChecksumValidator,
+    PageFileValidator,
+)
+
+_HEADER_KEYS = ("schema_version", "$schema")
+
+
+def iter_validate_repo(
+    manifest_path: Path | str,
+    schema_path: Path | str | None = None,
+    *,
+    snapshot: FileSnapshot | None = None,
+) -> Iterator[ValidationItem]:
+    """
+    Validate a manifest incrementally, yielding items as soon as they are known.
+
+    Args:
+        manifest_path: Path to the ``manifest.yml`` file.
+        schema_path: Validate against this schema file instead of the one
+            selected by the manifest's ``schema_version``.
+        snapshot: Listing of ``pages/`` for the file checks; scanned if not given.
+
+    Yields:
+        ``ValidationItem`` objects, page and pack entries first, followed by
+        the checks that need the complete cross-reference state.
+    """
+    manifest_path = Path(manifest_path)
+
+    # ───────────────────────────────
+    # Resolve schema from the header
+    # ───────────────────────────────
+    try:
+        header = _peek_header(manifest_path)
+    except Exception as e:
+        yield ValidationItem(level="error", message=f"Failed to read manifest: {e}")
+        return
+
+    try:
+        compiled = load_schema(schema_path or resolve_schema(header, base_dir=manifest_path.parent))
+    except Exception as e:
+        yield ValidationItem(level="error", message=f"Failed to resolve schema: {e}")
+        return
+
+    if snapshot is None:
+        snapshot = FileSnapshot.scan(manifest_path.parent)
+    yield from _StreamValidator(manifest_path, compiled, snapshot).run()
+
+
+def validate_repo_streaming(
+    manifest_path: Path | str,
+    schema_path: Path | str | None = None,
+    *,
+    snapshot: FileSnapshot | None = None,
+) -> tuple[int, ValidationResults]:
+    """
+    Collect the output of `iter_validate_repo` into a ``ValidationResults``.
+
+    Returns:
+        (exit_code, ValidationResults)
+    """
+    results = ValidationResults()
+    results.extend(iter_validate_repo(manifest_path, schema_path, snapshot=snapshot))
+    return results.rc, results
+
+
+class _StreamValidator:
+    """Single-use driver that walks the YAML events of one manifest."""
+
+    def __init__(self, manifest_path: Path, compiled: CompiledSchema, snapshot: FileSnapshot):
+        self.manifest_path = manifest_path
+        self.schema = schema = compiled.schema
+        self.compiled = compiled
+        self.schema_validator = ManifestSchemaValidator()
+        self.page_validator = PageFileValidator()
+        self.checksum_validator = PageChecksumValidator()
+        self.pack_pages_validator = PackPagesValidator()
+        self.snapshot = snapshot
+
+        properties = schema.get("properties", {})
+        self.pages_schema = properties.get("pages", {})
+        self.packs_schema = properties.get("packs", {})
+
+        # Compact cross-reference state
+        self.top: dict[str, Any] = {}
+        self.page_files: dict[str, Any] = {}
+        self.pack_deps: dict[str, list] = {}
+        self.page_owner: dict[str, str] = {}
+        self.deferred_packs: list[tuple[str, Any]] = []
+        self.pages_done = False
+
+    # ─── Event driving ───────────────────────────
+    def run(self) -> Iterator[ValidationItem]:
+        with self.manifest_path.open("r", encoding="utf-8") as f:
+            loader = UniqueKeyLoader(f)
+            try:
+                yield from self._walk(loader)
+            except yaml.YAMLError as e:
+                yield ValidationItem(level="error", message=f"Failed to read manifest: {e}")
+                return
+            finally:
+                loader.dispose()
+
+        yield from self._finish()
+
+    def _walk(self, loader: UniqueKeyLoader) -> Iterator[ValidationItem]:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            raise yaml.YAMLError("manifest is empty")
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise yaml.YAMLError("top-level YAML node must be a mapping")
+        loader.get_event()
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_next(loader)
+            if key in self.top:
+                raise yaml.YAMLError(f"found duplicate key: {key}")
+            if key in ("pages", "packs") and loader.check_event(yaml.MappingStartEvent):
+                self.top[key] = {}
+                loader.get_event()
+                seen: set[str] = set()
+                while not loader.check_event(yaml.MappingEndEvent):
+                    entry_key = _construct_next(loader)
+                    if entry_key in seen:
+                        raise yaml.YAMLError(f"found duplicate key: {entry_key}")
+                    seen.add(entry_key)
+                    entry = _construct_next(loader)
+                    if key == "pages":
+                        yield from self._on_page(entry_key, entry)
+                    else:
+                        yield from self._on_pack(entry_key, entry)
+                loader.get_event()
+                if key == "pages":
+                    self.pages_done = True
+            else:
+                self.top[key] = _construct_next(loader)
+
+    # ─── Per-entry checks ────────────────────────
+    def _on_page(self, title: str, meta: Any) -> Iterator[ValidationItem]:
+        errors = self.compiled.iter_errors({title: meta}, self.pages_schema, path="pages")
+        yield from self.schema_validator.format_errors(sorted(errors, key=lambda e: e.path))
+
+        if not isinstance(meta, dict):
+            self.page_files[title] = None
+            return
+        self.page_files[title] = meta.get("file")
+        yield from self.page_validator.validate(
+            manifest_path=self.manifest_path, pages={title: meta}, snapshot=self.snapshot
+        )
+        yield from self.checksum_validator.validate(
+            manifest_path=self.manifest_path, pages={title: meta}, snapshot=self.snapshot
+        )
+
+    def _on_pack(self, pack_id: str, meta: Any) -> Iterator[ValidationItem]:
+        errors = self.compiled.iter_errors({pack_id: meta}, self.packs_schema, path="packs")
+        yield from self.schema_validator.format_errors(sorted(errors, key=lambda e: e.path))
+
+        if not isinstance(meta, dict):
+            self.pack_deps[pack_id] = []
+            return
+        self.pack_deps[pack_id] = list(meta.get("depends_on", []) or [])
+        pages_list = meta.get("pages", [])
+        if self.pages_done:
+            yield from self.pack_pages_validator.check_pack(
+                pack_id, pages_list, self.page_files, self.page_owner
+            )
+        else:
+            # pages section not seen yet: keep only the titles for later
+            self.deferred_packs.append((pack_id, pages_list))
+
+    # ─── Whole-manifest checks ───────────────────
+    def _finish(self) -> Iterator[ValidationItem]:
+        for pack_id, pages_list in self.deferred_packs:
+            yield from self.pack_pages_validator.check_pack(
+                pack_id, pages_list, self.page_files, self.page_owner
+            )
+        self.deferred_packs.clear()
+
+        packs = {pid: {"depends_on": deps} for pid, deps in self.pack_deps.items()}
+        graph = PackGraph.from_packs(packs)
+        yield from PackDependencyValidator().validate(packs=packs, graph=graph)
+        yield from PackCycleValidator().validate(packs=packs, graph=graph)
+        yield from PackRedundantDependencyValidator().validate(packs=packs, graph=graph)
+
+        pages = {title: {"file": file} for title, file in self.page_files.items()}
+        yield from OrphanPageValidator().validate(
+            manifest_path=self.manifest_path, pages=pages, snapshot=self.snapshot
+        )
+
+        # top-level fields; entries of pages/packs were validated as they streamed by
+        errors = self.compiled.iter_errors(self.top)
+        yield from self.schema_validator.format_errors(sorted(errors, key=lambda e: e.path))
+
+
+def _construct_next(loader: UniqueKeyLoader) -> Any:
+    """Compose and construct the next node in the stream as a plain Python object."""
+    node = loader.compose_node(None, None)
+    return loader.construct_document(node)
+
+
+def _peek_header(manifest_path: Path) -> dict[str, Any]:
+    """
+    Read the top-level scalars needed to resolve the schema.
+
+    Stops parsing as soon as ``schema_version`` is seen, which is normally
+    the first key of the document.
+    """
+    header: dict[str, Any] = {}
+    depth = 0
+    expecting_key = False
+    pending_key: str | None = None
+
+    with manifest_path.open("r", encoding="utf-8") as f:
+        for event in yaml.parse(f, Loader=yaml.SafeLoader):
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+                if depth == 2 and pending_key is not None:
+                    # the value of a top-level key is a collection; skip it
+                    pending_key = None
+                    expecting_key = False
+                elif depth == 1:
+                    expecting_key = isinstance(event, yaml.MappingStartEvent)
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+                if depth == 1:
+                    expecting_key = True
+            elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)) and depth == 1:
+                if expecting_key:
+                    pending_key = getattr(event, "value", None)
+                    expecting_key = False
+                else:
+                    if pending_key in _HEADER_KEYS and isinstance(event, yaml.ScalarEvent):
+                        header[pending_key] = event.value
+                    if pending_key == "schema_version":
+                        break
+                    pending_key = None
+                    expecting_key = True
+    return header
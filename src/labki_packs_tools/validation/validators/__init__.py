@@ -3,7 +3,11 @@ from .orphan_page_validator import OrphanPageValidator
 from .pack_cycle_validator import PackCycleValidator
 from .pack_dependency_validator import PackDependencyValidator
 from .pack_pages_validator import PackPagesValidator
+from .pack_redundant_dependency_validator import PackRedundantDependencyValidator
+from .page_checksum_validator import PageChecksumValidator
+from .page_duplicate_validator import PageDuplicateValidator
 from .page_file_validator import PageFileValidator
+from .page_reference_validator import PageReferenceValidator
 
 __all__ = [
     "ManifestSchemaValidator",
@@ -11,5 +15,9 @@ __all__ = [
     "PackCycleValidator",
     "PackDependencyValidator",
     "PackPagesValidator",
+    "PackRedundantDependencyValidator",
+    "PageChecksumValidator",
+    "PageDuplicateValidator",
     "PageFileValidator",
+    "PageReferenceValidator",
 ]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import ClassVar, Optional
+from typing import Any, ClassVar, Optional
 
 from packaging.version import InvalidVersion, Version
 
@@ -19,6 +19,38 @@ class Validator(ABC):
     level: ClassVar[str] = "error"  # or "warning", "info"
     min_version: ClassVar[Optional[str]] = None
     max_version: ClassVar[Optional[str]] = None
+    page_sharded: ClassVar[bool] = False
+    """
+    True if the validator checks every entry of ``pages`` independently,
+    so ``pages`` may be split into shards that are validated concurrently
+    and whose results are concatenated in order.
+    """
+    reads_files: ClassVar[bool] = False
+    """
+    True if results depend on files under ``pages/`` (not only on the
+    manifest), so they must be re-checked when those files change.
+    """
+
+    cross_page: ClassVar[bool] = False
+    """
+    True if an item about one page can change when other pages change (e.g.
+    whether pages are duplicates), so incremental updates (``--watch``,
+    ``serve``) re-run the validator for every page rather than the changed ones.
+    """
+
+    opt_in: ClassVar[bool] = False
+    """
+    True if the validator is too slow to run by default: it only runs when its
+    code is in the ``checks`` of `validate_repo` (e.g. ``validate --dupes``),
+    and never in ``--watch`` or ``serve`` sessions.
+    """
+
+    requires_valid_manifest: ClassVar[bool] = False
+    """
+    True if results are only meaningful for a structurally valid manifest.
+    Under an error budget (``--max-errors``), such validators are skipped
+    once errors were found.
+    """
 
     registry: ClassVar[list[type[Validator]]] = []
 
@@ -37,6 +69,23 @@ class Validator(ABC):
             return False
         return not (cls.max_version and v > Version(cls.max_version))
 
+    def fingerprint(self, **context: Any) -> Any:
+        """
+        JSON-serializable summary of every input this validator reads.
+
+        Used as the key for cached results across runs; return ``None``
+        (the default) to always re-run the validator.
+        """
+        return None
+
+    def page_fingerprint(self, title: str, meta: Any, **context: Any) -> Any:
+        """
+        Like `fingerprint`, for a single page of a ``page_sharded`` validator.
+
+        Lets the cache re-check only the pages whose inputs changed.
+        """
+        return None
+
     @abstractmethod
     def validate(self, *, manifest: dict, pages: dict, packs: dict) -> list[ValidationItem]:
         """Perform validation and return results."""
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from fnmatch import fnmatch
-from typing import Any, List, Tuple
+import re
+from fnmatch import translate
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Tuple
 
 from jsonschema import Draft202012Validator, ValidationError
 
+from labki_packs_tools.validation.cache import ValidationCache, items_from_json, items_to_json
 from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.schema_registry import CompiledSchema, compile_schema
 from labki_packs_tools.validation.validators.base import Validator
 
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.scope import ValidationScope
+
 # ────────────────────────────────────────────────
 # Declarative message map
 # ────────────────────────────────────────────────
@@ -54,10 +62,15 @@ MESSAGES: dict[Tuple[str, str], str] = {
 # ────────────────────────────────────────────────
 
 
-def _match_path(pattern: str, path: List[str]) -> bool:
-    """Return True if the path matches the fnmatch-style pattern."""
-    joined = "/".join(path)
-    return fnmatch(joined, pattern)
+def _compile_messages() -> dict[str, list[tuple[re.Pattern[str], str]]]:
+    """MESSAGES by validator keyword, with path patterns compiled to regexes."""
+    compiled: dict[str, list[tuple[re.Pattern[str], str]]] = {}
+    for (validator, pattern), msg in MESSAGES.items():
+        compiled.setdefault(validator, []).append((re.compile(translate(pattern)), msg))
+    return compiled
+
+
+_MESSAGE_PATTERNS = _compile_messages()
 
 
 def _format_schema_error(e: ValidationError) -> list[str]:
@@ -70,8 +83,9 @@ def _format_schema_error(e: ValidationError) -> list[str]:
     msgs: list[str] = []
 
     # Try to match in the declarative map
-    for (validator, pattern), msg in MESSAGES.items():
-        if e.validator == validator and _match_path(pattern, path_list):
+    joined = "/".join(str(p) for p in path_list)
+    for pattern, msg in _MESSAGE_PATTERNS.get(e.validator, ()):
+        if pattern.match(joined):
             try:
                 msgs.append(msg.format(*path_list))
             except Exception:
@@ -97,6 +111,24 @@ def _format_anyof_error(e: ValidationError) -> list[str]:
     return msgs
 
 
+def _error_subject(e: ValidationError) -> dict[str, str]:
+    """The page or pack an error is about, as ``ValidationItem`` fields."""
+    path = list(e.path)
+    if not path or path[0] not in ("pages", "packs"):
+        return {}
+    if len(path) >= 2:
+        key = path[1]
+    elif "propertyNames" in e.schema_path and isinstance(e.instance, str):
+        key = e.instance  # invalid key; the error is located at the mapping itself
+    else:
+        return {}
+    return {"page" if path[0] == "pages" else "pack": str(key)}
+
+
+def _no_cache(namespace: str, fingerprint: Any, compute: Callable[[], Any]) -> Any:
+    return compute()
+
+
 # ────────────────────────────────────────────────
 # Main validator class
 # ────────────────────────────────────────────────
@@ -109,21 +141,100 @@ class ManifestSchemaValidator(Validator):
     min_version = None
     max_version = None
 
-    def validate(self, *, manifest: dict, schema: dict, **kwargs: Any) -> list[ValidationItem]:
-        results: list[ValidationItem] = []
-        validator = Draft202012Validator(schema)
-        errors: List[ValidationError] = sorted(
-            validator.iter_errors(manifest), key=lambda e: e.path
-        )
+    def validate(
+        self,
+        *,
+        manifest: dict,
+        schema: dict,
+        cache: ValidationCache | None = None,
+        scope: ValidationScope | None = None,
+        max_errors: int | None = None,
+        **kwargs: Any,
+    ) -> list[ValidationItem]:
+        """
+        Args:
+            max_errors: Error budget of the run. Only the first ``max_errors``
+                schema errors found are reported, which are not necessarily the
+                first ones by path.
+        """
+        compiled = compile_schema(schema, validator_cls=Draft202012Validator)
+        if (cache is not None or scope is not None) and isinstance(manifest, dict):
+            return self._validate_segments(compiled, manifest, cache, scope, max_errors)
+
+        found: Iterable[ValidationError] = compiled.iter_errors(manifest)
+        if max_errors is not None:
+            found = islice(found, max_errors)
+        errors: List[ValidationError] = sorted(found, key=lambda e: e.path)
+        return self.format_errors(errors)
+
+    def _validate_segments(
+        self,
+        compiled: CompiledSchema,
+        manifest: dict,
+        cache: ValidationCache | None,
+        scope: ValidationScope | None,
+        max_errors: int | None = None,
+    ) -> list[ValidationItem]:
+        """
+        Validate the top-level fields and every ``pages`` / ``packs`` entry separately,
+        caching the errors of each segment and skipping entries outside ``scope``.
+
+        Errors of one entry only depend on that entry, so a stable sort of all
+        segment errors by path gives the same output as a single full run.
+        """
+        properties = compiled.schema.get("properties", {})
+        top = dict(manifest)
+        segments: list[tuple[Any, Callable[[], Iterable[ValidationError]]]] = []
+
+        for section in ("pages", "packs"):
+            entries = manifest.get(section)
+            subschema = properties.get(section)
+            if not isinstance(entries, dict) or not isinstance(subschema, dict):
+                continue
+            top[section] = {}
+            in_scope = None if scope is None else getattr(scope, section)
+            for key, entry in entries.items():
+                if in_scope is not None and key not in in_scope:
+                    continue
+                segments.append(
+                    (
+                        [section, key, entry],
+                        partial(compiled.iter_errors, {key: entry}, subschema, path=section),
+                    )
+                )
+        segments.insert(0, (["top", top], partial(compiled.iter_errors, top)))
+
+        memoize = cache.memoize if cache is not None else _no_cache
+        located: list[tuple[list, dict]] = []
+        for fingerprint, errors in segments:
+            located.extend(
+                memoize(
+                    self.code,
+                    [compiled.digest, fingerprint],
+                    lambda errors=errors: [
+                        [list(e.path), items_to_json(self.format_errors([e]))] for e in errors()
+                    ],
+                )
+            )
+            if max_errors is not None and len(located) >= max_errors:
+                break
 
+        located.sort(key=lambda pair: pair[0])
+        return [item for _, items in located for item in items_from_json(items)]
+
+    def format_errors(self, errors: Iterable[ValidationError]) -> list[ValidationItem]:
+        """Convert raw jsonschema errors into friendly ``ValidationItem`` objects."""
+        results: list[ValidationItem] = []
         for e in errors:
             # Format known schema and anyOf errors
+            subject = _error_subject(e)
             for msg in _format_anyof_error(e) + _format_schema_error(e):
                 results.append(
                     ValidationItem(
                         level=self.level,
                         message=f"Schema validation: {msg}",
                         code=self.code,
+                        **subject,
                     )
                 )
 
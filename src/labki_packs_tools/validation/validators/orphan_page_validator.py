@@ -1,44 +1,94 @@
-import os
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable
 
 from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.snapshot import FileSnapshot, PageFiles
 from labki_packs_tools.validation.validators.base import Validator
 
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.scope import ValidationScope
+
 
 class OrphanPageValidator(Validator):
     code = "page-orphan"
     message = "Detect orphan page files not listed in manifest"
     level = "warning"
+    reads_files = True
+    requires_valid_manifest = True
 
-    def validate(self, *, manifest_path: Path, pages: dict, **kwargs: Any) -> list[ValidationItem]:
-        items = []
-        referenced_abs_paths: set[Path] = set()
+    def fingerprint(
+        self,
+        *,
+        manifest_path: Path,
+        pages: dict,
+        scope: ValidationScope | None = None,
+        snapshot: FileSnapshot | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(manifest_path.parent)
+        # files can only appear or disappear by changing the mtime of their directory
+        files = [meta.get("file") for meta in pages.values()]
+        return {
+            "root": str(snapshot.root / manifest_path.name),
+            "dirs": sorted(snapshot.dirs.items()),
+            "ignore": list(snapshot.ignore),
+            "files": files,
+            "scope": sorted(scope.files) if scope is not None else None,
+        }
 
-        for meta in pages.values():
-            file_rel = meta.get("file")
-            if not file_rel:
-                continue
-            abs_path = (manifest_path.parent / file_rel).resolve()
-            referenced_abs_paths.add(abs_path)
+    def validate(
+        self,
+        *,
+        manifest_path: Path,
+        pages: dict,
+        scope: ValidationScope | None = None,
+        snapshot: FileSnapshot | None = None,
+        page_files: PageFiles | None = None,
+        **kwargs: Any,
+    ) -> list[ValidationItem]:
+        items = []
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(manifest_path.parent)
+        if page_files is None:
+            page_files = snapshot.page_files(pages)
 
-        pages_dir = (manifest_path.parent / "pages").resolve()
-        if not pages_dir.exists():
+        if scope is None:
+            candidates = list(snapshot.walk_files())
+        else:
+            # only files that changed can have become orphans
+            prefix = f"{snapshot.subdir}/"
+            candidates = [
+                rel
+                for rel in sorted(scope.files)
+                if rel.startswith(prefix)
+                and (info := snapshot.files.get(rel)) is not None
+                and info.walked
+            ]
+        candidates = [rel for rel in candidates if rel.endswith(".wiki") or rel.endswith(".md")]
+        if not candidates:
             return items
 
-        for root, _dirs, files in os.walk(pages_dir):
-            for fname in files:
-                if not (fname.endswith(".wiki") or fname.endswith(".md")):
-                    continue
-                f_abs = Path(root) / fname
-                if f_abs not in referenced_abs_paths:
-                    rel = os.path.relpath(f_abs, manifest_path.parent)
-                    items.append(
-                        ValidationItem(
-                            level=self.level,
-                            message=f"Orphan page file not referenced in manifest: {rel}",
-                            code=self.code,
-                        )
+        if scope is None:
+            keys: Iterable[str] = page_files.titles
+        else:
+            # only page files that are (symlinks to) a candidate can reference it
+            targets = {snapshot.canonical(rel) for rel in candidates}
+            names = targets | snapshot.aliases(targets)
+            keys = [key for key in names if key in page_files.titles] + list(page_files.unlisted)
+        referenced = {snapshot.canonical(key) for key in keys}
+
+        for rel in candidates:
+            if snapshot.canonical(rel) not in referenced:
+                items.append(
+                    ValidationItem(
+                        level=self.level,
+                        message=f"Orphan page file not referenced in manifest: {rel}",
+                        code=self.code,
+                        file=rel,
                     )
+                )
 
         return items
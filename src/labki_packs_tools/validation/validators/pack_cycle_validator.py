@@ -1,6 +1,6 @@
-from collections import defaultdict, deque
 from typing import Any
 
+from labki_packs_tools.utils import PackGraph
 from labki_packs_tools.validation.result_types import ValidationItem
 from labki_packs_tools.validation.validators.base import Validator
 
@@ -9,39 +9,36 @@ class PackCycleValidator(Validator):
     code = "pack-cycles"
     message = "Packs must not form dependency cycles"
     level = "error"
+    requires_valid_manifest = True
 
-    def validate(self, *, packs: dict, **kwargs: Any) -> list[ValidationItem]:
+    def fingerprint(self, *, packs: dict, **kwargs: Any) -> Any:
+        return [[pid, meta.get("depends_on", [])] for pid, meta in (packs or {}).items()]
+
+    def validate(
+        self, *, packs: dict, graph: PackGraph | None = None, **kwargs: Any
+    ) -> list[ValidationItem]:
         items = []
         if not packs:
             return items
 
-        # Build graph
-        indeg = defaultdict(int)
-        graph = defaultdict(list)
-        for pid in packs:
-            indeg[pid] = 0
-        for pack_id, meta in packs.items():
-            for dep in meta.get("depends_on", []) or []:
-                graph[dep].append(pack_id)
-                indeg[pack_id] += 1
-
-        # Kahn's algorithm
-        q = deque([pid for pid in packs if indeg[pid] == 0])
-        visited = 0
-        while q:
-            current = q.popleft()
-            visited += 1
-            for neighbor in graph[current]:
-                indeg[neighbor] -= 1
-                if indeg[neighbor] == 0:
-                    q.append(neighbor)
+        graph = graph or PackGraph.from_packs(packs)
 
-        if visited != len(packs):
+        # one item per strongly connected component that is a cycle, in manifest order;
+        # dependencies on unknown packs are not part of the graph
+        cycles = []
+        for component in graph.strongly_connected_components():
+            path = graph.cycle_path(component)
+            if path:
+                cycles.append((component, path))
+        for component, path in sorted(cycles):
+            ids = [graph.pack_ids[i] for i in component]
+            route = " -> ".join(graph.pack_ids[i] for i in path)
+            if len(ids) == 1:
+                message = f"Pack '{ids[0]}' depends on itself"
+            else:
+                members = ", ".join(f"'{pid}'" for pid in ids)
+                message = f"Dependency cycle among packs {members}: {route}"
             items.append(
-                ValidationItem(
-                    level=self.level,
-                    message="Dependency cycle detected among packs",
-                    code=self.code,
-                )
+                ValidationItem(level=self.level, message=message, code=self.code, pack=ids[0])
             )
         return items
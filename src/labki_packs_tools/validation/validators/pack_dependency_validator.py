@@ -1,5 +1,6 @@
 from typing import Any
 
+from labki_packs_tools.utils import PackGraph
 from labki_packs_tools.validation.result_types import ValidationItem
 from labki_packs_tools.validation.validators.base import Validator
 
@@ -8,17 +9,21 @@ class PackDependencyValidator(Validator):
     code = "pack-deps"
     message = "All pack dependencies must reference valid pack IDs"
     level = "error"
+    requires_valid_manifest = True
 
-    def validate(self, *, packs: dict, **kwargs: Any) -> list[ValidationItem]:
-        items = []
-        for pack_id, meta in (packs or {}).items():
-            for dep in meta.get("depends_on", []) or []:
-                if dep not in packs:
-                    items.append(
-                        ValidationItem(
-                            level=self.level,
-                            message=f"Pack '{pack_id}' depends_on unknown pack id: {dep}",
-                            code=self.code,
-                        )
-                    )
-        return items
+    def fingerprint(self, *, packs: dict, **kwargs: Any) -> Any:
+        return [[pid, meta.get("depends_on", [])] for pid, meta in (packs or {}).items()]
+
+    def validate(
+        self, *, packs: dict, graph: PackGraph | None = None, **kwargs: Any
+    ) -> list[ValidationItem]:
+        graph = graph or PackGraph.from_packs(packs or {})
+        return [
+            ValidationItem(
+                level=self.level,
+                message=f"Pack '{pack_id}' depends_on unknown pack id: {dep}",
+                code=self.code,
+                pack=pack_id,
+            )
+            for pack_id, dep in graph.unknown_deps
+        ]
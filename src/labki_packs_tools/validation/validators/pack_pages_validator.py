@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Container
 
 from labki_packs_tools.validation.result_types import ValidationItem
 from labki_packs_tools.validation.validators.base import Validator
@@ -8,44 +8,70 @@ class PackPagesValidator(Validator):
     code = "pack-pages"
     message = "Pages referenced in packs must be valid"
     level = "error"
+    requires_valid_manifest = True
+
+    def fingerprint(self, *, packs: dict, pages: dict, **kwargs: Any) -> Any:
+        return {
+            "packs": [[pid, meta.get("pages", [])] for pid, meta in (packs or {}).items()],
+            "titles": list(pages),
+        }
 
     def validate(self, *, packs: dict, pages: dict, **kwargs: Any) -> list[ValidationItem]:
         items = []
         seen_page_to_pack = {}
 
         for pack_id, meta in (packs or {}).items():
-            pages_list = meta.get("pages", [])
-            if pages_list and not isinstance(pages_list, list):
+            items.extend(self.check_pack(pack_id, meta.get("pages", []), pages, seen_page_to_pack))
+        return items
+
+    def check_pack(
+        self,
+        pack_id: str,
+        pages_list: Any,
+        pages: Container[str],
+        seen_page_to_pack: dict[str, str],
+    ) -> list[ValidationItem]:
+        """
+        Check the page list of a single pack.
+
+        ``seen_page_to_pack`` is shared across calls so that pages claimed by
+        more than one pack are reported, and is updated in place.
+        """
+        items = []
+        if pages_list and not isinstance(pages_list, list):
+            items.append(
+                ValidationItem(
+                    level=self.level,
+                    message=f"Pack '{pack_id}' pages must be an array",
+                    code=self.code,
+                    pack=pack_id,
+                )
+            )
+            return items
+
+        for title in pages_list or []:
+            if title not in pages:
                 items.append(
                     ValidationItem(
                         level=self.level,
-                        message=f"Pack '{pack_id}' pages must be an array",
+                        message=f"Pack '{pack_id}' references unknown page title: {title}",
                         code=self.code,
+                        pack=pack_id,
                     )
                 )
-                continue
-
-            for title in pages_list or []:
-                if title not in pages:
-                    items.append(
-                        ValidationItem(
-                            level=self.level,
-                            message=f"Pack '{pack_id}' references unknown page title: {title}",
-                            code=self.code,
-                        )
-                    )
-                elif title in seen_page_to_pack and seen_page_to_pack[title] != pack_id:
-                    other = seen_page_to_pack[title]
-                    items.append(
-                        ValidationItem(
-                            level=self.level,
-                            message=(
-                                f"Page title '{title}' included in multiple packs "
-                                f"('{other}' and '{pack_id}'). Move to a shared dependency pack."
-                            ),
-                            code=self.code,
-                        )
+            elif title in seen_page_to_pack and seen_page_to_pack[title] != pack_id:
+                other = seen_page_to_pack[title]
+                items.append(
+                    ValidationItem(
+                        level=self.level,
+                        message=(
+                            f"Page title '{title}' included in multiple packs "
+                            f"('{other}' and '{pack_id}'). Move to a shared dependency pack."
+                        ),
+                        code=self.code,
+                        pack=pack_id,
                     )
-                else:
-                    seen_page_to_pack[title] = pack_id
+                )
+            else:
+                seen_page_to_pack[title] = pack_id
         return items
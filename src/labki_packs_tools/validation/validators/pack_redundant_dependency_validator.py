@@ -0,0 +1,37 @@
+from typing import Any
+
+from labki_packs_tools.resolve import PackResolver
+from labki_packs_tools.utils import PackGraph
+from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.validators.base import Validator
+
+
+class PackRedundantDependencyValidator(Validator):
+    """``depends_on`` entries already implied by another dependency of the pack."""
+
+    code = "pack-redundant-deps"
+    message = "Packs should only list dependencies they do not get through other dependencies"
+    level = "warning"
+    requires_valid_manifest = True
+
+    def fingerprint(self, *, packs: dict, **kwargs: Any) -> Any:
+        return [[pid, meta.get("depends_on", [])] for pid, meta in (packs or {}).items()]
+
+    def validate(
+        self, *, packs: dict, graph: PackGraph | None = None, **kwargs: Any
+    ) -> list[ValidationItem]:
+        if not packs:
+            return []
+        graph = graph or PackGraph.from_packs(packs)
+        return [
+            ValidationItem(
+                level=self.level,
+                message=(
+                    f"Pack '{entry.pack}' depends_on '{entry.dependency}', which it already "
+                    f"depends on through '{entry.via}'"
+                ),
+                code=self.code,
+                pack=entry.pack,
+            )
+            for entry in PackResolver(graph).redundant_dependencies()
+        ]
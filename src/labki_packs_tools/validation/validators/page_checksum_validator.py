@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from labki_packs_tools.checksum import cached_checksum
+from labki_packs_tools.validation.cache import stat_signature
+from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators.base import Validator
+
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.cache import ValidationCache
+
+
+class PageChecksumValidator(Validator):
+    code = "page-checksum"
+    message = "Page files must match the checksum recorded in the manifest"
+    level = "error"
+    page_sharded = True
+    reads_files = True
+    requires_valid_manifest = True
+
+    def page_fingerprint(
+        self,
+        title: str,
+        meta: Any,
+        *,
+        manifest_path: Path,
+        snapshot: FileSnapshot | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        file_rel = meta.get("file") if isinstance(meta, dict) else None
+        if not file_rel:
+            stat = None
+        elif snapshot is not None:
+            stat = snapshot.stat_signature(file_rel)
+        else:
+            stat = stat_signature(manifest_path.parent / file_rel)
+        return [title, meta, stat]
+
+    def validate(
+        self,
+        *,
+        manifest_path: Path,
+        pages: dict,
+        snapshot: FileSnapshot | None = None,
+        cache: ValidationCache | None = None,
+        **kwargs: Any,
+    ) -> list[ValidationItem]:
+        items = []
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(manifest_path.parent)
+
+        for title, meta in pages.items():
+            expected = meta.get("checksum") if isinstance(meta, dict) else None
+            file_rel = meta.get("file") if isinstance(meta, dict) else None
+            if not isinstance(expected, str) or not isinstance(file_rel, str):
+                continue
+            # a missing file is reported by PageFileValidator
+            signature = snapshot.stat_signature(file_rel)
+            if signature is None:
+                continue
+            try:
+                # unchanged files (same path, mtime and size) are not hashed again
+                actual = cached_checksum(manifest_path.parent / file_rel, signature, cache)
+            except OSError:
+                continue
+            if actual != expected:
+                items.append(
+                    ValidationItem(
+                        level="error",
+                        message=f"Page file does not match its checksum: {file_rel} (for {title})",
+                        code=self.code,
+                        page=title,
+                        file=file_rel,
+                    )
+                )
+
+        return items
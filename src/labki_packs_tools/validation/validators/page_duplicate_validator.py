@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from labki_packs_tools.dupes import find_duplicates
+from labki_packs_tools.utils import PackGraph
+from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators.base import Validator
+
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.cache import ValidationCache
+
+
+MAX_NAMED = 3
+"""Duplicates named in the item of each page; the others are counted"""
+
+
+class PageDuplicateValidator(Validator):
+    """Pages with identical or near-duplicate content (see `labki_packs_tools.dupes`)."""
+
+    code = "page-dupes"
+    message = "Pages should not duplicate the content of other pages"
+    level = "warning"
+    reads_files = True
+    cross_page = True
+    opt_in = True
+    requires_valid_manifest = True
+
+    def validate(
+        self,
+        *,
+        manifest_path: Path,
+        pages: dict,
+        packs: dict,
+        graph: PackGraph | None = None,
+        snapshot: FileSnapshot | None = None,
+        cache: ValidationCache | None = None,
+        jobs: int = 1,
+        **kwargs: Any,
+    ) -> list[ValidationItem]:
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(manifest_path.parent)
+        root = manifest_path.parent
+        signatures = {}
+        for meta in pages.values():
+            file_rel = meta.get("file") if isinstance(meta, dict) else None
+            if isinstance(file_rel, str) and file_rel:
+                signatures[root / file_rel] = snapshot.stat_signature(file_rel)
+
+        groups = find_duplicates(
+            manifest_path,
+            pages=pages,
+            packs=packs,
+            graph=graph,
+            cache=cache,
+            signatures=signatures,
+            jobs=jobs,
+        )
+        graph = graph or PackGraph.from_packs(packs, pages)
+        items = []
+        for group in groups:
+            for title in group.pages:
+                owners = _owners(graph, title)
+                others = [other for other in group.pages if other != title]
+                relation = (
+                    "has the same content as" if group.identical else "is a near-duplicate of"
+                )
+                items.append(
+                    ValidationItem(
+                        level=self.level,
+                        message=f"Page {_label(title, owners)} {relation} {_others(graph, others)}",
+                        code=self.code,
+                        page=title,
+                        pack=owners[0] if owners else None,
+                    )
+                )
+        return items
+
+
+def _owners(graph: PackGraph, title: str) -> list[str]:
+    if title not in graph.page_index:
+        return []
+    return [graph.pack_ids[pack] for pack in graph.packs_of(graph.page_index[title])]
+
+
+def _label(title: str, owners: list[str]) -> str:
+    if not owners:
+        return f"'{title}'"
+    noun = "pack" if len(owners) == 1 else "packs"
+    return f"'{title}' ({noun} {', '.join(owners)})"
+
+
+def _others(graph: PackGraph, titles: list[str]) -> str:
+    named = ", ".join(_label(title, _owners(graph, title)) for title in titles[:MAX_NAMED])
+    if len(titles) > MAX_NAMED:
+        return f"{named} and {len(titles) - MAX_NAMED} other pages"
+    return named
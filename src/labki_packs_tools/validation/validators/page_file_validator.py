@@ -1,7 +1,9 @@
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Any
 
+from labki_packs_tools.validation.cache import stat_signature
 from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.snapshot import FileSnapshot
 from labki_packs_tools.validation.validators.base import Validator
 
 
@@ -9,9 +11,39 @@ class PageFileValidator(Validator):
     code = "page-file"
     message = "Validate page file presence and module placement"
     level = "error"
+    page_sharded = True
+    reads_files = True
+    requires_valid_manifest = True
 
-    def validate(self, *, manifest_path: Path, pages: dict, **kwargs: Any) -> list[ValidationItem]:
+    def page_fingerprint(
+        self,
+        title: str,
+        meta: Any,
+        *,
+        manifest_path: Path,
+        snapshot: FileSnapshot | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        file_rel = meta.get("file") if isinstance(meta, dict) else None
+        if not file_rel:
+            stat = None
+        elif snapshot is not None:
+            stat = snapshot.stat_signature(file_rel)
+        else:
+            stat = stat_signature(manifest_path.parent / file_rel)
+        return [title, meta, stat]
+
+    def validate(
+        self,
+        *,
+        manifest_path: Path,
+        pages: dict,
+        snapshot: FileSnapshot | None = None,
+        **kwargs: Any,
+    ) -> list[ValidationItem]:
         items = []
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(manifest_path.parent)
 
         for title, meta in pages.items():
             file_rel = meta.get("file")
@@ -21,31 +53,35 @@ class PageFileValidator(Validator):
                         level="error",
                         message=f"Page '{title}' is missing a 'file' path",
                         code=self.code,
+                        page=title,
                     )
                 )
                 continue
 
-            abs_path = (manifest_path.parent / file_rel).resolve()
+            info = snapshot.get(file_rel)
 
             # File must exist
-            if not abs_path.exists():
+            if info is None or not info.exists:
                 items.append(
                     ValidationItem(
                         level="error",
                         message=f"Page file not found: {file_rel} (for {title})",
                         code=self.code,
+                        page=title,
                     )
                 )
 
             # Module-specific conventions
             inferred_ns = title.split(":", 1)[0] if ":" in title else None
             if inferred_ns == "Module":
-                if abs_path.suffix != ".lua":
+                suffix = PurePosixPath(info.real if info is not None else file_rel).suffix
+                if suffix != ".lua":
                     items.append(
                         ValidationItem(
                             level="warning",
                             message=f"Module files should use .lua extension: {file_rel}",
                             code=self.code,
+                            page=title,
                         )
                     )
                 if "Modules" not in file_rel.replace("\\", "/"):
@@ -54,6 +90,7 @@ class PageFileValidator(Validator):
                             level="warning",
                             message=f"Module files should be under pages/Modules/: {file_rel}",
                             code=self.code,
+                            page=title,
                         )
                     )
 
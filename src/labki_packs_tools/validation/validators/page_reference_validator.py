@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from labki_packs_tools.utils import PackGraph
+from labki_packs_tools.validation.references import normalize_title, resolve_reference, scan_files
+from labki_packs_tools.validation.result_types import ValidationItem
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators.base import Validator
+
+if TYPE_CHECKING:
+    from labki_packs_tools.validation.cache import ValidationCache
+    from labki_packs_tools.validation.scope import ValidationScope
+
+VERBS = {
+    "transclusion": "transcludes",
+    "link": "links to",
+    "invoke": "invokes",
+    "require": "requires",
+}
+
+
+class PageReferenceValidator(Validator):
+    code = "page-refs"
+    message = "Pages must only reference pages of their pack and the packs it depends on"
+    level = "warning"
+    reads_files = True
+    requires_valid_manifest = True
+
+    def validate(
+        self,
+        *,
+        manifest_path: Path,
+        pages: dict,
+        packs: dict,
+        graph: PackGraph | None = None,
+        snapshot: FileSnapshot | None = None,
+        cache: ValidationCache | None = None,
+        scope: ValidationScope | None = None,
+        jobs: int = 1,
+        **kwargs: Any,
+    ) -> list[ValidationItem]:
+        graph = graph or PackGraph.from_packs(packs or {}, pages or {})
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(manifest_path.parent)
+        root = manifest_path.parent
+
+        # pages of packs (page -> file), the only ones whose references can be checked
+        sources: dict[int, str] = {}
+        for page in range(graph.n_pages):
+            title = graph.page_titles[page]
+            owners = graph.packs_of(page)
+            if not owners or (
+                scope is not None
+                and title not in scope.pages
+                and not any(graph.pack_ids[p] in scope.packs for p in owners)
+            ):
+                continue
+            meta = pages.get(title)
+            file_rel = meta.get("file") if isinstance(meta, dict) else None
+            if isinstance(file_rel, str) and file_rel and snapshot.exists(file_rel):
+                sources[page] = file_rel
+        if not sources:
+            return []
+
+        paths = {file_rel: root / file_rel for file_rel in sources.values()}
+        signatures = {paths[rel]: snapshot.stat_signature(rel) for rel in paths}
+        found = scan_files(list(paths.values()), cache=cache, signatures=signatures, jobs=jobs)
+        titles = {normalize_title(title): title for title in graph.page_titles}
+
+        items: list[ValidationItem] = []
+        for pack in range(graph.n_packs):
+            pack_id = graph.pack_ids[pack]
+            closure: set[int] | None = None
+            dependents: set[int] | None = None
+            for page in graph.pages_of(pack):
+                if page not in sources:
+                    continue
+                if closure is None:
+                    closure = set(graph.reachable([pack]))
+                    # depending on one of these would create a cycle
+                    dependents = set(graph.reachable([pack], reverse=True))
+                title = graph.page_titles[page]
+                seen = {title}
+                for kind, target in found[paths[sources[page]]]:
+                    resolved = resolve_reference(kind, target, titles)
+                    if resolved is None or resolved in seen:
+                        continue
+                    seen.add(resolved)
+                    owners = list(graph.packs_of(graph.page_index[resolved]))
+                    if not owners or closure.intersection(owners):
+                        continue
+                    items.append(
+                        ValidationItem(
+                            level=self.level,
+                            message=(
+                                f"Page '{title}' of pack '{pack_id}' {VERBS[kind]} '{resolved}' "
+                                f"of {_packs(graph, owners)}, which '{pack_id}' does not depend "
+                                f"on; {_suggestion(graph, owners, dependents)}"
+                            ),
+                            code=self.code,
+                            page=title,
+                            pack=pack_id,
+                            file=sources[page],
+                        )
+                    )
+        return items
+
+
+def _packs(graph: PackGraph, packs: list[int]) -> str:
+    names = ", ".join(f"'{graph.pack_ids[p]}'" for p in packs)
+    return f"pack {names}" if len(packs) == 1 else f"packs {names}"
+
+
+def _suggestion(graph: PackGraph, owners: list[int], dependents: set[int]) -> str:
+    """The dependency edge to add, unless every candidate would create a cycle."""
+    candidates = [p for p in owners if p not in dependents]
+    if not candidates:
+        return "adding the dependency would create a cycle"
+    if len(candidates) == 1:
+        return f"add '{graph.pack_ids[candidates[0]]}' to depends_on"
+    names = ", ".join(f"'{graph.pack_ids[p]}'" for p in candidates)
+    return f"add one of {names} to depends_on"
@@ -0,0 +1,438 @@
+"""
+Watch a repository and re-validate incrementally as files change.
+
+`WatchSession` keeps the parsed manifest, the `FileSnapshot` of ``pages/`` and
+each validator's results in memory. `WatchSession.update` takes the paths that
+changed and re-runs only what they can affect:
+
+- files or directories under ``pages/``: the validators that read files
+  (``Validator.reads_files``), for the pages referencing them and for the
+  files that appeared or disappeared (orphan detection)
+- the manifest: every validator, restricted to the `ValidationScope` of the
+  entries that changed (see `labki_packs_tools.validation.scope.diff_scope`)
+- the schema file, or a top-level manifest field: everything
+
+Items outside the scope of an update are kept from the previous results,
+except those of validators comparing pages with each other
+(``Validator.cross_page``), which re-run for every page.
+
+Changes are reported by inotify (through ``ctypes``, on Linux) or otherwise
+found by polling: rescanning ``pages/`` and stat-ing the manifest and schema
+every few seconds.
+"""
+
+from __future__ import annotations
+
+import bisect
+import ctypes
+import ctypes.util
+import errno
+import os
+import posixpath
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from labki_packs_tools.validation.cache import stat_signature
+from labki_packs_tools.validation.repo_validator import (
+    applicable_validators,
+    failure_item,
+    load_context,
+    run_validator,
+)
+from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+from labki_packs_tools.validation.scope import ValidationScope, diff_scope
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators.base import Validator
+
+POLL_INTERVAL = 1.0
+"""Seconds between scans when inotify is not available"""
+
+DEBOUNCE = 0.02
+"""Seconds to keep collecting events after the first one (editors save in several steps)"""
+
+
+class WatchSession:
+    """Validation state of one manifest, kept up to date by `update`."""
+
+    def __init__(
+        self,
+        manifest_path: Path | str,
+        schema_path: Path | str | None = None,
+        *,
+        snapshot: FileSnapshot | None = None,
+    ):
+        self.manifest_path = Path(manifest_path)
+        self.schema_path = Path(schema_path) if schema_path is not None else None
+        if snapshot is None:
+            snapshot = FileSnapshot.scan(self.manifest_path.parent)
+        self.snapshot = snapshot
+        self.context: dict[str, Any] | None = None
+
+        self._load_errors = ValidationResults()
+        self._items: dict[type[Validator], list[ValidationItem]] = {}
+        self._failed: set[type[Validator]] = set()
+        self._titles: dict[str, set[str]] = {}  # page file -> titles referencing it
+        self._files: list[str] = []  # sorted keys of _titles
+        self._manifest_key = watch_key(snapshot.root, self.manifest_path)
+        self._schema_key = watch_key(snapshot.root, self.schema_path) if self.schema_path else None
+        self._full()
+
+    @property
+    def results(self) -> ValidationResults:
+        """Current results, in the order of a full `validate_repo` run (per validator)."""
+        results = ValidationResults(list(self._load_errors))
+        for items in self._items.values():
+            results.extend(items)
+        return results
+
+    @property
+    def watched_files(self) -> list[Path]:
+        """Files outside ``pages/`` whose changes must be reported to `update`."""
+        return [p for p in (self.manifest_path, self.schema_path) if p is not None]
+
+    def update(self, changed: Iterable[str] | None) -> bool:
+        """
+        Re-validate after files changed.
+
+        Args:
+            changed: Changed paths, as returned by `watch_key`; ``None`` if
+                unknown (everything is re-read).
+
+        Returns:
+            Whether anything was re-validated.
+        """
+        if changed is None:
+            self.snapshot = FileSnapshot.scan(
+                self.snapshot.root, subdir=self.snapshot.subdir, ignore=self.snapshot.ignore
+            )
+            self._full()
+            return True
+
+        changed = set(changed)
+        prefix = f"{self.snapshot.subdir}/"
+        page_paths = {p for p in changed if p == self.snapshot.subdir or p.startswith(prefix)}
+        files = self.snapshot.refresh(page_paths) | page_paths
+
+        if self.context is None or (self._schema_key is not None and self._schema_key in changed):
+            self._full()
+        elif self._manifest_key in changed:
+            old = self.context
+            if self._load() is None:
+                return True
+            scope = diff_scope(old["manifest"], self.context["manifest"], files)
+            if scope is None:
+                self._full(reload=False)
+            else:
+                scope.pages |= self._titles_for(files)
+                self._rerun(list(self._items), scope)
+        elif files:
+            scope = ValidationScope(pages=self._titles_for(files), files=files)
+            self._rerun([v for v in self._items if v.reads_files], scope)
+        else:
+            return False
+        return True
+
+    # ─── Internals ───────────────────────────────
+    def _load(self) -> dict[str, Any] | None:
+        self._load_errors = ValidationResults()
+        self.context = load_context(
+            self.manifest_path, self.schema_path, self._load_errors, snapshot=self.snapshot
+        )
+        if self.context is None:
+            self._items.clear()
+            self._failed.clear()
+        else:
+            self._titles = self.context["page_files"].titles
+            self._files = sorted(self._titles)
+        return self.context
+
+    def _full(self, *, reload: bool = True) -> None:
+        if reload and self._load() is None:
+            return
+        self._items = {}
+        self._failed.clear()
+        for validator_cls in applicable_validators(self.context["manifest"]):
+            self._items[validator_cls] = self._run(validator_cls, self.context)
+
+    def _rerun(self, validators: list[type[Validator]], scope: ValidationScope) -> None:
+        scoped = {**self.context, "scope": scope}
+        for validator_cls in validators:
+            if validator_cls in self._failed or validator_cls.cross_page:
+                # no earlier results to keep, or they may depend on what changed
+                self._items[validator_cls] = self._run(validator_cls, self.context)
+                continue
+            new = self._run(validator_cls, scoped)
+            if validator_cls in self._failed:
+                self._items[validator_cls] = new
+                continue
+            kept = [item for item in self._items[validator_cls] if not scope.includes(item)]
+            self._items[validator_cls] = kept + [item for item in new if scope.includes(item)]
+
+    def _run(self, validator_cls: type[Validator], context: dict) -> list[ValidationItem]:
+        try:
+            items = run_validator(validator_cls, context)
+        except Exception as e:
+            self._failed.add(validator_cls)
+            return [failure_item(validator_cls, e)]
+        self._failed.discard(validator_cls)
+        return items
+
+    def _titles_for(self, paths: Iterable[str]) -> set[str]:
+        """Titles of pages whose file is one of ``paths`` (or a symlink to it), or inside one."""
+        paths = set(paths)
+        found: set[str] = set()
+        for path in paths | self.snapshot.aliases(paths):
+            found |= self._titles.get(path, set())
+            prefix = f"{path}/"
+            i = bisect.bisect_left(self._files, prefix)
+            while i < len(self._files) and self._files[i].startswith(prefix):
+                found |= self._titles[self._files[i]]
+                i += 1
+        return found
+
+
+def watch_key(root: Path, path: Path) -> str:
+    """How a changed path is reported: relative to ``root`` with ``/``, or absolute."""
+    path = Path(os.path.abspath(path))
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        pass
+    try:
+        return path.resolve().relative_to(root).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+# ────────────────────────────────────────────────
+# Change notification
+# ────────────────────────────────────────────────
+class PollingWatcher:
+    """Finds changes by rescanning ``pages/`` and stat-ing files periodically."""
+
+    def __init__(
+        self, snapshot: FileSnapshot, files: Iterable[Path], *, interval: float = POLL_INTERVAL
+    ):
+        self.interval = interval
+        self.snapshot = FileSnapshot(
+            snapshot.root,
+            subdir=snapshot.subdir,
+            files=dict(snapshot.files),
+            dirs=dict(snapshot.dirs),
+            ignore=snapshot.ignore,
+        )
+        self.files = {watch_key(snapshot.root, f): (f, stat_signature(f)) for f in files}
+
+    def wait(self, timeout: float | None = None) -> set[str] | None:
+        """Changed paths (see `watch_key`); empty if none before ``timeout`` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            changed = self.poll()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def poll(self) -> set[str]:
+        current = FileSnapshot.scan(
+            self.snapshot.root, subdir=self.snapshot.subdir, ignore=self.snapshot.ignore
+        )
+        changed = self.snapshot.changes(current)
+        self.snapshot = current
+        for key, (path, signature) in self.files.items():
+            new = stat_signature(path)
+            if new != signature:
+                changed.add(key)
+                self.files[key] = (path, new)
+        return changed
+
+    def sync(self, snapshot: FileSnapshot) -> None:
+        """Nothing to do: every poll scans the whole tree."""
+
+    def close(self) -> None:
+        pass
+
+
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; followed by the name
+
+
+def _libc() -> ctypes.CDLL:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError, TypeError) as e:
+        raise OSError(f"inotify is not available: {e}") from e
+    return libc
+
+
+class InotifyWatcher:
+    """Receives changes from the Linux kernel; one watch per directory of ``pages/``."""
+
+    def __init__(self, snapshot: FileSnapshot, files: Iterable[Path]):
+        self._libc = _libc()
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self.root = snapshot.root
+        self._keys: dict[int, str] = {}  # watch descriptor -> directory key
+        self._wds: dict[str, int] = {}
+        try:
+            for f in files:
+                directory = Path(os.path.abspath(f)).parent
+                self._add(directory, watch_key(self.root, directory))
+            self.sync(snapshot)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout: float | None = None) -> set[str] | None:
+        """
+        Changed paths (see `watch_key`); empty if none before ``timeout`` seconds,
+        ``None`` if events were lost.
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        changed: set[str] = set()
+        overflow = False
+        deadline = time.monotonic() + DEBOUNCE
+        while True:
+            overflow |= self._read(changed)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                break
+        return None if overflow else changed
+
+    def sync(self, snapshot: FileSnapshot) -> None:
+        """Watch directories that appeared since the last call."""
+        for rel in snapshot.dirs:
+            if rel not in self._wds:
+                self._add(self.root / rel, rel)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add(self, directory: Path, key: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return  # already gone again
+            raise OSError(err, os.strerror(err), str(directory))
+        self._keys[wd] = "" if key == "." else key
+        self._wds[key] = wd
+
+    def _read(self, changed: set[str]) -> bool:
+        """Add the paths of pending events to ``changed``; True if the queue overflowed."""
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return False
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            key = self._keys.get(wd)
+            if key is None:
+                continue
+            if mask & _IN_IGNORED:  # directory removed
+                del self._keys[wd]
+                if self._wds.get(key) == wd:
+                    del self._wds[key]
+                continue
+            if name:
+                changed.add(posixpath.join(key, name) if key else name)
+            elif key:
+                changed.add(key)
+        return overflow
+
+
+def make_watcher(
+    session: WatchSession, *, poll: bool = False, interval: float = POLL_INTERVAL
+) -> InotifyWatcher | PollingWatcher:
+    """An inotify watcher where available (unless ``poll``), otherwise a polling one."""
+    if not poll:
+        try:
+            return InotifyWatcher(session.snapshot, session.watched_files)
+        except OSError:
+            pass  # not Linux, or out of watches
+    return PollingWatcher(session.snapshot, session.watched_files, interval=interval)
+
+
+def watch(
+    manifest_path: Path | str,
+    schema_path: Path | str | None = None,
+    *,
+    on_results: Callable[[ValidationResults, float], None],
+    snapshot: FileSnapshot | None = None,
+    poll: bool = False,
+    interval: float = POLL_INTERVAL,
+    stop: Callable[[], bool] | None = None,
+) -> ValidationResults:
+    """
+    Validate a manifest, then again whenever it or its page files change.
+
+    Args:
+        on_results: Called with the results and the seconds spent validating,
+            after the first run and after every update.
+        poll: Poll every ``interval`` seconds even if inotify is available.
+        stop: Checked between updates; return True to stop watching.
+            Without it, runs until interrupted (``KeyboardInterrupt``).
+
+    Returns:
+        The last results.
+    """
+    start = time.perf_counter()
+    session = WatchSession(manifest_path, schema_path, snapshot=snapshot)
+    on_results(session.results, time.perf_counter() - start)
+
+    watcher = make_watcher(session, poll=poll, interval=interval)
+    try:
+        while stop is None or not stop():
+            changed = watcher.wait(timeout=0.1 if stop is not None else None)
+            if changed is not None and not changed:
+                continue
+            start = time.perf_counter()
+            if session.update(changed):
+                watcher.sync(session.snapshot)
+                on_results(session.results, time.perf_counter() - start)
+    finally:
+        watcher.close()
+    return session.results
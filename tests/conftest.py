@@ -31,6 +31,14 @@ def pytest_collection_modifyitems(config: pytest.Config, items: list[Function])
                 item.add_marker(skip_packaging)
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Keep the validation cache of CLI runs out of the user's cache directory."""
+    monkeypatch.setenv("LABKI_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
 # ────────────────────────────────────────────────────────────────
 # Paths
 # ────────────────────────────────────────────────────────────────
@@ -0,0 +1,134 @@
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from labki_packs_tools.assign import AssignmentRule, AssignmentRules, PackMatcher
+from labki_packs_tools.ingest import update_manifest
+from labki_packs_tools.manifest import Manifest
+
+
+def _matcher(*rules: dict) -> PackMatcher:
+    return AssignmentRules(rules=list(rules)).compile()
+
+
+def test_matcher_first_rule_wins():
+    matcher = _matcher(
+        {"pack": "special", "title": "Template:Supply*"},
+        {"pack": "templates", "namespace": "Template"},
+        {"pack": "everything", "regex": ".*"},
+    )
+    assert matcher.match("Template:SupplyItem") == "special"
+    assert matcher.match("Template:Other") == "templates"
+    assert matcher.match("Buffalo") == "everything"
+
+
+def test_matcher_namespace_and_main():
+    matcher = _matcher(
+        {"pack": "main", "namespace": "Main"}, {"pack": "forms", "namespace": "Form"}
+    )
+    assert matcher.match("Buffalo") == "main"
+    assert matcher.match("Form:Supply") == "forms"
+    assert matcher.match("Help:Other") is None
+
+
+def test_matcher_categories_from_content():
+    matcher = _matcher(
+        {"pack": "supplies", "category": "Lab supply"},
+        {"pack": "fallback", "title": "*"},
+    )
+    content = "Some text\n[[Category:Lab_supply|sortkey]]\n"
+    assert matcher.match("Buffalo", content) == "supplies"
+    assert matcher.match("Buffalo", "no categories") == "fallback"
+
+
+def test_matcher_regex_with_groups():
+    matcher = _matcher(
+        {"pack": "a", "regex": r"Help:(?P<topic>Getting)(\w+)"},
+        {"pack": "b", "regex": r"Help:.*"},
+    )
+    assert matcher.match("Help:GettingStarted") == "a"
+    assert matcher.match("Help:Other") == "b"
+
+
+def test_matcher_rules_that_cannot_be_merged():
+    matcher = _matcher(
+        {"pack": "flags", "regex": "(?i)help:faq"},
+        {"pack": "a", "regex": r"Help:(?P<x>A)"},
+        {"pack": "b", "regex": r"Help:(?P<x>B)"},
+        {"pack": "double", "regex": r"Help:(\w)\1"},
+        {"pack": "globs", "title": "Help:*x*y"},
+        {"pack": "rest", "regex": "Help:"},
+    )
+    assert matcher.match("HELP:FAQ") == "flags"
+    assert matcher.match("Help:A") == "a"
+    assert matcher.match("Help:B") == "b"
+    assert matcher.match("Help:ccc") == "double"
+    assert matcher.match("Help:axby") == "globs"
+    assert matcher.match("Help:cd") == "rest"
+    assert matcher.match("Other") is None
+
+
+def test_invalid_regex_names_the_rule():
+    with pytest.raises(ValueError, match="Invalid regex for pack 'p'"):
+        _matcher({"pack": "p", "regex": "Help:("})
+
+
+def test_matcher_scales_to_many_rules():
+    rules = [{"pack": f"p{i}", "title": f"Template:Item{i}"} for i in range(3000)]
+    matcher = _matcher(*rules)
+    assert matcher.match("Template:Item2999") == "p2999"
+    assert matcher.match("Template:Item3000") is None
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [{"pack": "p"}, {"pack": "p", "title": "A*", "namespace": "Template"}],
+)
+def test_rule_requires_exactly_one_selector(rule):
+    with pytest.raises(ValidationError):
+        AssignmentRule(**rule)
+
+
+def test_ingest_assigns_new_pages(base_manifest, export_data, tmp_path):
+    manifest_path = base_manifest(
+        {
+            "packs": {
+                "supply": {"version": "1.2.3", "pages": []},
+                "misc": {"version": "1.0.0", "depends_on": ["supply", "supply"]},
+            }
+        }
+    )
+    rules_path = tmp_path / "rules.yml"
+    rules_path.write_text(
+        yaml.safe_dump(
+            {
+                "rules": [
+                    {"pack": "supply", "category": "Supply"},
+                    {"pack": "supply", "regex": r"(Form|Category):Supply"},
+                    {"pack": "misc", "namespace": "Main"},
+                ]
+            }
+        )
+    )
+
+    update_manifest(manifest_path, export_data / "latest.xml", rules_path=rules_path)
+    manifest = Manifest.from_yaml(manifest_path)
+
+    assert sorted(manifest.packs["supply"].pages) == [
+        "Category:Supply",
+        "Form:Supply",
+        "Template:Supply",
+    ]
+    assert manifest.packs["supply"].version == "1.3.0"
+    assert manifest.packs["misc"].pages == ["Buffalo"]
+    assert manifest.packs["misc"].version == "1.1.0"
+
+
+def test_ingest_rejects_rules_for_unknown_packs(base_manifest, export_data, tmp_path):
+    manifest_path = base_manifest()
+    rules_path = tmp_path / "rules.yml"
+    rules_path.write_text(yaml.safe_dump([{"pack": "nope", "namespace": "Main"}]))
+
+    with pytest.raises(ValueError, match="unknown pack"):
+        update_manifest(manifest_path, export_data / "latest.xml", rules_path=rules_path)
+    assert not (manifest_path.parent / "pages").exists()
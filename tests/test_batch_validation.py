@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.batch import expand_manifest_paths, validate_repos
+from labki_packs_tools.validation.repo_validator import validate_repo
+from tests.utils import make_manifest, make_page_file
+
+
+@pytest.fixture
+def repos(tmp_path: Path) -> list[Path]:
+    """Three repositories: valid, with a missing page file, and with an orphan file."""
+    paths = []
+    for name in ("a", "b", "c"):
+        root = tmp_path / "repos" / name
+        root.mkdir(parents=True)
+        page = make_page_file(root)
+        if name == "b":
+            (root / page["file"]).unlink()
+        if name == "c":
+            (root / "pages" / "stray.wiki").write_text("x")
+        paths.append(make_manifest(root, {"pages": {"Template:Example": page}}))
+    return paths
+
+
+def _key(items: list) -> list[tuple]:
+    return [(i.level, i.message, i.page, i.file) for i in items]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_results_match_single_runs(repos, processes):
+    results = validate_repos(repos, processes=processes, use_cache=False)
+
+    assert [r.manifest_path for r in results] == repos
+    for repo, path in zip(results, repos):
+        assert _key(repo.results) == _key(validate_repo(path)[1])
+    assert [r.rc for r in results] == [0, 1, 0]
+
+
+def test_expand_manifest_paths(repos, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    a, b, c = (p.relative_to(tmp_path) for p in repos)
+
+    assert expand_manifest_paths(["repos/*/manifest.yml"]) == [a, b, c]
+    # directories stand for their manifest, and each manifest is listed once
+    assert expand_manifest_paths(["repos/b", "repos/**/manifest.yml"]) == [b, a, c]
+    with pytest.raises(ValueError, match="No manifests match"):
+        expand_manifest_paths(["nothing/*/manifest.yml"])
+    with pytest.raises(ValueError, match="does not exist"):
+        expand_manifest_paths(["missing.yml"])
+    with pytest.raises(ValueError, match="No manifest.yml"):
+        expand_manifest_paths(["repos"])
+
+
+def test_changed_since_failure_is_reported_per_repository(repos):
+    [result] = validate_repos(repos[:1], changed_since="no-such-ref", use_cache=False)
+    assert result.rc == 1
+    assert result.results.errors
+
+
+def test_cli_aggregates_json_and_exit_code(repos):
+    args = ["validate", *map(str, repos), "--json", "--processes", "1"]
+    result = CliRunner().invoke(cli_main, args)
+
+    assert result.exit_code == 1
+    payload = json.loads(result.output)
+    assert payload["summary"]["repositories"] == 3
+    assert payload["summary"]["failed"] == 1
+    assert payload["summary"]["errors"] == 1
+    assert payload["summary"]["warnings"] == 1
+    assert [r["manifest"] for r in payload["repositories"]] == list(map(str, repos))
+    assert [r["summary"]["exit_code"] for r in payload["repositories"]] == [0, 1, 0]
+
+
+def test_cli_text_output_and_glob(repos, tmp_path):
+    pattern = str(tmp_path / "repos" / "[ac]")
+    result = CliRunner().invoke(cli_main, ["validate", pattern, "--processes", "1"])
+
+    assert result.exit_code == 0
+    assert "Validated 2 repositories (0 failed)" in result.output
+
+
+def test_cli_rejects_bad_arguments(repos, tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(cli_main, ["validate", str(tmp_path / "none" / "*.yml")])
+    assert result.exit_code == 2
+    assert "No manifests match" in result.output
+
+    result = runner.invoke(cli_main, ["validate", *map(str, repos[:2]), "--stream"])
+    assert result.exit_code == 2
+    assert "more than one manifest" in result.output
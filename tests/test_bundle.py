@@ -0,0 +1,106 @@
+import shutil
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools.bundle import build_bundles, plan_bundles
+from labki_packs_tools.cli.main import main as cli_main
+
+
+@pytest.fixture
+def repo(fixtures_repo: Path, tmp_path: Path) -> Path:
+    dest = tmp_path / "repo"
+    shutil.copytree(fixtures_repo, dest)
+    return dest
+
+
+def test_bundle_contents(repo: Path, tmp_path: Path):
+    results = build_bundles(repo / "manifest.yml", tmp_path / "dist", ["publication"], jobs=1)
+    (result,) = results
+    assert result.built
+    assert result.path.name == f"publication-1.0.0-{result.digest}.zip"
+
+    with ZipFile(result.path) as zf:
+        names = zf.namelist()
+        sub = yaml.safe_load(zf.read("manifest.yml"))
+        assert all(info.date_time == (1980, 1, 1, 0, 0, 0) for info in zf.infolist())
+    assert names == sorted(names)
+    assert list(sub["packs"]) == ["publication"]
+    assert sorted(names[1:]) == sorted(entry["file"] for entry in sub["pages"].values())
+
+
+def test_bundles_are_reproducible_and_skipped_when_unchanged(repo: Path, tmp_path: Path):
+    first = build_bundles(repo / "manifest.yml", tmp_path / "a", jobs=2)
+    second = build_bundles(repo / "manifest.yml", tmp_path / "b", jobs=1)
+    for a, b in zip(first, second):
+        assert a.path.name == b.path.name
+        assert a.path.read_bytes() == b.path.read_bytes()
+
+    again = build_bundles(repo / "manifest.yml", tmp_path / "a", jobs=2)
+    assert not any(r.built for r in again)
+
+
+def test_changed_page_rebuilds_only_its_pack(repo: Path, tmp_path: Path):
+    out = tmp_path / "dist"
+    before = {r.pack: r for r in build_bundles(repo / "manifest.yml", out, jobs=1)}
+    (repo / "pages" / "help" / "help_gettingstarted.wiki").write_text("changed", encoding="utf-8")
+    after = {r.pack: r for r in build_bundles(repo / "manifest.yml", out, jobs=1)}
+
+    assert [pack for pack, r in after.items() if r.built] == ["shared_base"]
+    assert after["shared_base"].digest != before["shared_base"].digest
+
+
+def test_manifest_timestamp_does_not_rebuild_bundles(repo: Path, tmp_path: Path):
+    out = tmp_path / "dist"
+    build_bundles(repo / "manifest.yml", out, jobs=1)
+    manifest = repo / "manifest.yml"
+    text = manifest.read_text(encoding="utf-8")
+    manifest.write_text(
+        text.replace(
+            'last_updated: "2025-09-22T00:00:00Z"', 'last_updated: "2026-01-01T00:00:00Z"', 1
+        ),
+        encoding="utf-8",
+    )
+    assert yaml.safe_load(manifest.read_text())["last_updated"] == "2026-01-01T00:00:00Z"
+
+    assert not any(r.built for r in build_bundles(manifest, out, jobs=1))
+
+
+def test_page_files_are_read_by_the_writer(repo: Path, tmp_path: Path):
+    plans = plan_bundles(repo / "manifest.yml", tmp_path)
+    members = [data for plan in plans for name, data in plan.members if name != "manifest.yml"]
+    assert members and all(isinstance(data, Path) for data in members)
+
+
+@pytest.mark.parametrize(
+    "file",
+    ["../outside.wiki", "pages/../../outside.wiki", "/etc/passwd", "C:/outside.wiki", "link.wiki"],
+)
+def test_page_files_outside_the_repo_are_rejected(repo: Path, tmp_path: Path, file: str):
+    (tmp_path / "outside.wiki").write_text("secret", encoding="utf-8")
+    (repo / "link.wiki").symlink_to(tmp_path / "outside.wiki")
+    manifest = repo / "manifest.yml"
+    data = yaml.safe_load(manifest.read_text())
+    data["pages"]["Template:Publication"]["file"] = file
+    manifest.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Template:Publication"):
+        build_bundles(manifest, tmp_path / "dist", ["publication"], jobs=1)
+    assert not list((tmp_path / "dist").iterdir())
+
+    result = CliRunner().invoke(
+        cli_main, ["bundle", "publication", "-m", str(manifest), "-o", str(tmp_path / "dist")]
+    )
+    assert result.exit_code != 0
+    assert "Traceback" not in result.output
+
+
+def test_cli_bundle_unknown_pack(repo: Path, tmp_path: Path):
+    result = CliRunner().invoke(
+        cli_main, ["bundle", "nope", "-m", str(repo / "manifest.yml"), "-o", str(tmp_path)]
+    )
+    assert result.exit_code != 0
+    assert "Unknown pack: nope" in result.output
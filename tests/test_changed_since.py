@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.scope import changed_scope
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.org", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repo(base_manifest, tmp_page, tmp_path) -> Path:
+    pages = {f"Template:T{i}": tmp_page(name=f"T{i}") for i in range(6)}
+    mpath = base_manifest(
+        {
+            "pages": pages,
+            "packs": {
+                "base": {"version": "1.0.0", "pages": ["Template:T0", "Template:T1"]},
+                "mid": {"version": "1.0.0", "pages": ["Template:T2"], "depends_on": ["base"]},
+                "top": {"version": "1.0.0", "pages": ["Template:T3"], "depends_on": ["mid"]},
+                "other": {"version": "1.0.0", "pages": ["Template:T4", "Template:T5"]},
+            },
+        }
+    )
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+    return mpath
+
+
+def _edit(mpath: Path, change: Callable[[dict], object]) -> None:
+    data = yaml.safe_load(mpath.read_text())
+    change(data)
+    mpath.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def _items(results) -> list[tuple[str, str]]:
+    return [(i.level, i.message) for i in results]
+
+
+def _assert_matches_full_run(mpath: Path, scope) -> list[tuple[str, str]]:
+    _, full = validate_repo(mpath)
+    rc, scoped = validate_repo(mpath, scope=scope)
+    expected = [item for item in full if scope.includes(item)]
+    assert _items(scoped) == _items(expected)
+    assert rc == (1 if any(i.level == "error" for i in expected) else 0)
+    return _items(scoped)
+
+
+def test_unchanged_tree_has_empty_scope(git_repo):
+    scope = changed_scope(git_repo, "HEAD")
+    assert scope is not None
+    assert (scope.pages, scope.packs, scope.files) == (set(), set(), set())
+
+
+def test_scope_covers_owning_packs_and_dependents(git_repo):
+    def change(data: dict) -> None:
+        data["pages"]["Template:T0"]["last_updated"] = "yesterday"
+        data["packs"]["base"]["version"] = "2"
+
+    _edit(git_repo, change)
+    scope = changed_scope(git_repo, "HEAD")
+    assert scope.pages == {"Template:T0"}
+    assert scope.packs == {"base", "mid", "top"}
+    assert scope.files == {"manifest.yml", "pages/templates/template_t0.wiki"}
+
+
+def test_scoped_validation_matches_full_run(git_repo):
+    repo = git_repo.parent
+
+    def change(data: dict) -> None:
+        data["pages"]["Template:T1"]["last_updated"] = "yesterday"
+        # pre-existing problems outside the diff are not reported
+        data["packs"]["other"]["depends_on"] = ["missing"]
+
+    _edit(git_repo, change)
+    _git(repo, "commit", "-q", "-am", "break things")
+
+    def change_again(data: dict) -> None:
+        data["packs"]["mid"]["pages"].append("Template:T0")  # also in 'base'
+        data["packs"]["top"]["depends_on"] = ["mid", "gone"]
+        del data["pages"]["Template:T2"]
+
+    _edit(git_repo, change_again)
+    (repo / "pages" / "templates" / "template_t3.wiki").unlink()
+    (repo / "pages" / "stray.wiki").write_text("x")
+
+    scope = changed_scope(git_repo, "HEAD")
+    messages = [m for _, m in _assert_matches_full_run(git_repo, scope)]
+    assert not any("T1" in m or "'other'" in m for m in messages)
+    assert "Pack 'top' depends_on unknown pack id: gone" in messages
+    assert "Pack 'mid' references unknown page title: Template:T2" in messages
+    assert "Page file not found: pages/templates/template_t3.wiki (for Template:T3)" in messages
+    assert "Orphan page file not referenced in manifest: pages/stray.wiki" in messages
+    assert "Orphan page file not referenced in manifest: pages/templates/template_t2.wiki" in (
+        messages
+    )
+    assert any("included in multiple packs ('base' and 'mid')" in m for m in messages)
+
+
+def test_removed_pack_brings_in_its_dependents(git_repo):
+    _edit(git_repo, lambda data: data["packs"].pop("base"))
+    scope = changed_scope(git_repo, "HEAD")
+    assert scope.packs == {"base", "mid", "top"}
+    messages = [m for _, m in _assert_matches_full_run(git_repo, scope)]
+    assert "Pack 'mid' depends_on unknown pack id: base" in messages
+
+
+def test_top_level_change_validates_everything(git_repo):
+    _edit(git_repo, lambda data: data.update(name="renamed"))
+    assert changed_scope(git_repo, "HEAD") is None
+
+
+def test_unknown_ref_is_an_error(git_repo):
+    with pytest.raises(ValueError, match="no-such-ref"):
+        changed_scope(git_repo, "no-such-ref")
+
+
+def test_cli_changed_since(git_repo):
+    runner = CliRunner()
+    result = runner.invoke(cli_main, ["validate", str(git_repo), "--changed-since", "HEAD"])
+    assert result.exit_code == 0, result.output
+
+    _edit(git_repo, lambda data: data["packs"]["other"].update(version="x"))
+    result = runner.invoke(
+        cli_main, ["validate", str(git_repo), "--changed-since", "HEAD", "--json"]
+    )
+    assert result.exit_code == 1
+    assert "Pack 'other' must have semantic version" in result.output
+
+    result = runner.invoke(cli_main, ["validate", str(git_repo), "--changed-since", "nope"])
+    assert result.exit_code != 0
+    assert "nope" in result.output
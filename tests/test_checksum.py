@@ -0,0 +1,110 @@
+import difflib
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools import checksum
+from labki_packs_tools.checksum import file_checksum, hash_files, update_checksums
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.cache import ValidationCache
+from labki_packs_tools.validation.repo_validator import validate_repo
+
+
+@pytest.fixture
+def repo(fixtures_repo: Path, tmp_path: Path) -> Path:
+    dest = tmp_path / "repo"
+    shutil.copytree(fixtures_repo, dest)
+    return dest
+
+
+def _checksum_errors(results) -> list[str]:
+    return [i.message for i in results.errors if i.code == "page-checksum"]
+
+
+def test_hash_files(tmp_path: Path):
+    paths = [tmp_path / f"{i}.wiki" for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_text(f"page {i % 2}")
+    checksums = hash_files(paths + [tmp_path / "missing.wiki"], jobs=3)
+
+    assert checksums[paths[0]] == checksums[paths[2]] != checksums[paths[1]]
+    assert checksums[paths[0]] == file_checksum(paths[0])
+    assert checksums[paths[0]].startswith("sha256:") and len(checksums[paths[0]]) == 71
+    assert checksums[tmp_path / "missing.wiki"] is None
+
+
+def test_edited_page_file_is_reported(repo: Path):
+    manifest = repo / "manifest.yml"
+    original = manifest.read_text()
+    updates = update_checksums(manifest, jobs=2)
+    pages = yaml.safe_load(manifest.read_text())["pages"]
+    assert sorted(u.title for u in updates) == sorted(pages)
+    assert update_checksums(manifest) == []
+    # only checksum lines are added, the rest of the file is kept as written
+    diff = list(difflib.ndiff(original.splitlines(), manifest.read_text().splitlines()))
+    assert [line for line in diff if line[0] == "-"] == []
+    assert len([line for line in diff if line[0] == "+"]) == len(pages)
+
+    rc, results = validate_repo(manifest)
+    assert _checksum_errors(results) == []
+
+    title, meta = next(iter(pages.items()))
+    (repo / meta["file"]).write_text("edited")
+    rc, results = validate_repo(manifest)
+    assert rc != 0
+    assert _checksum_errors(results) == [
+        f"Page file does not match its checksum: {meta['file']} (for {title})"
+    ]
+
+    [update] = update_checksums(manifest)
+    assert update.title == title
+    rc, results = validate_repo(manifest)
+    assert _checksum_errors(results) == []
+
+
+def test_unchanged_files_are_not_hashed_again(
+    repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    manifest = repo / "manifest.yml"
+    update_checksums(manifest)
+    hashed: list[Path] = []
+    monkeypatch.setattr(
+        checksum,
+        "file_checksum",
+        lambda path: hashed.append(path) or file_checksum(path),
+    )
+
+    def run() -> None:
+        cache = ValidationCache.for_manifest(manifest, tmp_path / "cache")
+        validate_repo(manifest, cache=cache)
+        cache.save()
+
+    run()
+    n_pages = len(hashed)
+    assert n_pages > 0
+
+    # editing the manifest entries re-checks the pages, but their files are unchanged
+    data = yaml.safe_load(manifest.read_text())
+    for meta in data["pages"].values():
+        meta["description"] = "changed"
+    manifest.write_text(yaml.safe_dump(data, sort_keys=False))
+    run()
+    assert len(hashed) == n_pages
+
+
+def test_cli_hash(repo: Path):
+    manifest = str(repo / "manifest.yml")
+    result = CliRunner().invoke(cli_main, ["hash", "-m", manifest, "--check"])
+    assert result.exit_code == 1
+    assert "checksum" not in (repo / "manifest.yml").read_text()
+
+    result = CliRunner().invoke(cli_main, ["hash", "-m", manifest])
+    assert result.exit_code == 0, result.output
+    assert "Checksums updated" in result.output
+
+    result = CliRunner().invoke(cli_main, ["hash", "-m", manifest, "--check"])
+    assert result.exit_code == 0
+    assert "All checksums up to date" in result.output
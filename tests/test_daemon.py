@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import io
+import json
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation import daemon
+from labki_packs_tools.validation.daemon import (
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    VERSION_MISMATCH,
+    DaemonError,
+    ValidationServer,
+    request,
+    serve_stdio,
+    serve_unix,
+    validate_with_daemon,
+)
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.result_types import ValidationResults
+
+
+def _key(results: ValidationResults) -> list[tuple]:
+    return [(i.level, i.message, i.page, i.pack, i.file) for i in results]
+
+
+@pytest.fixture
+def repo(base_manifest, tmp_page) -> Path:
+    return base_manifest(
+        {
+            "pages": {"Template:A": tmp_page(name="A"), "Template:B": tmp_page(name="B")},
+            "packs": {"base": {"version": "1.0.0", "pages": ["Template:A", "Template:B"]}},
+        }
+    )
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch) -> Path:
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv("LABKI_SOCKET", str(path))
+    return path
+
+
+@pytest.fixture
+def running(socket_path):
+    server = ValidationServer()
+    thread = threading.Thread(target=serve_unix, args=(socket_path,), kwargs={"server": server})
+    thread.start()
+    for _ in range(200):
+        if socket_path.exists():
+            break
+        threading.Event().wait(0.01)
+    yield server
+    request("shutdown", socket_path=socket_path)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not socket_path.exists()
+
+
+def test_results_follow_file_changes(repo, tmp_path):
+    server = ValidationServer()
+    try:
+        assert _key(server.validate(repo)) == _key(validate_repo(repo)[1])
+
+        (tmp_path / "pages/templates/template_a.wiki").unlink()
+        (tmp_path / "pages/stray.wiki").write_text("x")
+        results = server.validate(repo)
+        assert _key(results) == _key(validate_repo(repo)[1])
+        assert results.has_errors and results.has_warnings
+
+        repo.write_text(repo.read_text().replace("Template:B", "Template:C"))
+        assert _key(server.validate(repo)) == _key(validate_repo(repo)[1])
+    finally:
+        server.close()
+
+
+def test_stdio_protocol(repo):
+    lines = [
+        {"jsonrpc": "2.0", "id": 1, "method": "ping"},
+        {"jsonrpc": "2.0", "id": 2, "method": "validate", "params": {"manifest": str(repo)}},
+        {"jsonrpc": "2.0", "id": 3, "method": "validate", "params": {"manifest": 1}},
+        {"jsonrpc": "2.0", "id": 4, "method": "nope"},
+        {"jsonrpc": "2.0", "method": "ping"},  # notification: no response
+        {"jsonrpc": "2.0", "id": 5, "method": "shutdown"},
+        {"jsonrpc": "2.0", "id": 6, "method": "ping"},  # not read
+    ]
+    stdin = io.BytesIO(b"not json\n" + b"".join(json.dumps(m).encode() + b"\n" for m in lines))
+    stdout = io.BytesIO()
+    serve_stdio(stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [None, 1, 2, 3, 4, 5]
+    assert responses[0]["error"]["code"] == PARSE_ERROR
+    assert "pid" in responses[1]["result"]
+    assert responses[2]["result"]["summary"]["exit_code"] == 0
+    assert responses[3]["error"]["message"] == "Invalid parameters for validate"
+    assert responses[4]["error"]["code"] == METHOD_NOT_FOUND
+
+
+def test_cli_uses_running_server(repo, tmp_path, running, socket_path):
+    runner = CliRunner()
+    result = runner.invoke(cli_main, ["validate", str(repo), "--json"])
+    assert result.exit_code == 0
+    assert json.loads(result.output)["summary"]["errors"] == 0
+    assert len(running._sessions) == 1
+
+    (tmp_path / "pages/templates/template_b.wiki").unlink()
+    result = runner.invoke(cli_main, ["validate", str(repo), "--json"])
+    assert result.exit_code == 1
+    local = runner.invoke(cli_main, ["validate", str(repo), "--json", "--no-daemon"])
+    assert result.output == local.output
+
+    result = runner.invoke(cli_main, ["validate", str(repo), "--changed-since", "HEAD"])
+    assert result.exit_code == 1
+    assert "git" in result.output
+
+
+def test_cli_options_the_server_ignores_validate_locally(repo, tmp_path, running, socket_path):
+    cache_dir = tmp_path / "cache"
+    args = ["validate", str(repo), "--json", "--cache-dir", str(cache_dir), "-j", "2"]
+    result = CliRunner().invoke(cli_main, args)
+    assert result.exit_code == 0, result.output
+    assert not running._sessions
+    assert any(cache_dir.iterdir())
+
+
+def test_version_mismatch_falls_back(repo, running, socket_path):
+    with pytest.raises(DaemonError) as e:
+        request("validate", {"manifest": str(repo), "version": "0.0.0-other"})
+    assert e.value.code == VERSION_MISMATCH
+    assert validate_with_daemon(repo) is not None
+
+
+def test_no_server(repo, socket_path):
+    assert validate_with_daemon(repo) is None
+    # a socket file left behind by a server that died
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(socket_path))
+    assert validate_with_daemon(repo) is None
+
+
+def test_unresponsive_server_falls_back(repo, socket_path, monkeypatch):
+    monkeypatch.setattr(daemon, "PING_TIMEOUT", 0.1)
+    # connections are queued by the kernel, but nothing ever answers
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(socket_path))
+        sock.listen()
+        assert validate_with_daemon(repo) is None
+
+
+def test_serve_refuses_to_replace_other_files(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(OSError, match="Not a socket"):
+        serve_unix(path)
+    assert path.read_text() == "keep me"
@@ -0,0 +1,154 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools import dupes
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.dupes import (
+    find_duplicates,
+    sign_files,
+    signature,
+    similar_groups,
+    similarity,
+)
+from labki_packs_tools.validation.cache import ValidationCache
+from labki_packs_tools.validation.repo_validator import validate_repo
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def _text(seed: int, n: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _edit(text: str) -> str:
+    words = text.split()
+    words[len(words) // 2] = "edited"
+    return " ".join(words)
+
+
+@pytest.fixture
+def repo(base_manifest, tmp_page) -> Path:
+    base = _text(0)
+    pages = {
+        "Template:Original": tmp_page(name="Original", content=base),
+        "Template:Copy": tmp_page(name="Copy", content=base),
+        "Form:Edited": tmp_page(namespace="Form", name="Edited", content=_edit(base)),
+        "Template:Other": tmp_page(name="Other", content=_text(1)),
+        "Template:Empty": tmp_page(name="Empty", content=""),
+        "Template:AlsoEmpty": tmp_page(name="AlsoEmpty", content=" \n"),
+    }
+    return base_manifest(
+        {
+            "pages": pages,
+            "packs": {
+                "a": {"version": "1.0.0", "pages": ["Template:Original", "Template:Other"]},
+                "b": {"version": "1.0.0", "pages": ["Template:Copy", "Form:Edited"]},
+            },
+        }
+    )
+
+
+def test_signature_similarity():
+    text = _text(0)
+    assert signature(text) == signature(text.upper())
+    assert similarity(signature(text), signature(_edit(text))) > 0.9
+    assert similarity(signature(text), signature(_text(1))) < 0.1
+    assert signature(" \n") is None
+    # fewer tokens than a shingle
+    assert similarity(signature("{{a}}"), signature("{{a}}")) == 1
+
+
+def test_similar_groups_in_many_texts():
+    texts = {i: _text(i) for i in range(500)}
+    texts["near"] = _edit(texts[7])
+    texts["far"] = " ".join(texts[7].split()[:100])  # a third of text 7
+    groups = similar_groups({key: signature(text) for key, text in texts.items()})
+    assert groups == [[7, "near"]]
+
+
+def test_find_duplicates(repo: Path):
+    [group] = find_duplicates(repo)
+    assert group.pages == ["Template:Original", "Template:Copy", "Form:Edited"]
+    assert group.packs == ["a", "b"]
+    assert not group.identical
+    assert 0.8 <= group.similarity < 1
+
+    [identical] = find_duplicates(repo, threshold=1)
+    assert identical.pages == ["Template:Original", "Template:Copy"]
+    assert identical.identical and identical.similarity == 1
+
+
+def test_duplicate_warnings(repo: Path):
+    # opt-in: not part of a default run
+    _, results = validate_repo(repo)
+    assert not [i for i in results.warnings if i.code == "page-dupes"]
+
+    rc, results = validate_repo(repo, checks=["page-dupes"])
+    assert rc == 0
+    messages = {i.page: i.message for i in results.warnings if i.code == "page-dupes"}
+    assert messages == {
+        "Template:Original": "Page 'Template:Original' (pack a) is a near-duplicate of "
+        "'Template:Copy' (pack b), 'Form:Edited' (pack b)",
+        "Template:Copy": "Page 'Template:Copy' (pack b) is a near-duplicate of "
+        "'Template:Original' (pack a), 'Form:Edited' (pack b)",
+        "Form:Edited": "Page 'Form:Edited' (pack b) is a near-duplicate of "
+        "'Template:Original' (pack a), 'Template:Copy' (pack b)",
+    }
+
+
+def test_signatures_are_cached(repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    paths = sorted((repo.parent / "pages").rglob("*.wiki"))
+    stats = {path: [path.stat().st_mtime_ns, path.stat().st_size] for path in paths}
+    cache = ValidationCache(tmp_path / "cache.json")
+    first = sign_files(paths, cache=cache, signatures=stats)
+
+    signed: list[Path] = []
+    sign = dupes._sign_file
+    monkeypatch.setattr(dupes, "_sign_file", lambda p: signed.append(p) or sign(p))
+    assert sign_files(paths, cache=cache, signatures=stats) == first
+    assert signed == []
+
+    # without a cache, files signed before in this process are remembered
+    dupes.clear_signatures()
+    assert sign_files(paths, signatures=stats) == first
+    assert sign_files(paths, signatures=stats) == first
+    assert signed == paths
+    # files without a stat signature are always read
+    assert sign_files(paths) == first
+    assert signed == paths + paths
+
+
+def test_sign_in_worker_processes(repo: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(dupes, "MIN_POOL_FILES", 1)
+    paths = sorted((repo.parent / "pages").rglob("*.wiki"))
+    assert sign_files(paths, jobs=2) == sign_files(paths)
+
+
+def test_cli_dupes(repo: Path):
+    result = CliRunner().invoke(cli_main, ["dupes", "-m", str(repo), "--threshold", "1", "--json"])
+    assert result.exit_code == 0, result.output
+    [group] = json.loads(result.output)["groups"]
+    assert group["pages"] == ["Template:Original", "Template:Copy"]
+    assert group["identical"]
+
+    result = CliRunner().invoke(cli_main, ["dupes", "-m", str(repo)])
+    assert result.exit_code == 0, result.output
+    assert "Packs 'a', 'b'" in result.output
+
+
+def test_cli_validate_dupes(repo: Path):
+    args = ["validate", str(repo), "--no-daemon", "--json"]
+    result = CliRunner().invoke(cli_main, args)
+    assert "page-dupes" not in result.output
+    result = CliRunner().invoke(cli_main, [*args, "--dupes"])
+    assert result.exit_code == 0, result.output
+    codes = [item["code"] for item in json.loads(result.output)["items"]]
+    assert codes.count("page-dupes") == 3
+
+    result = CliRunner().invoke(cli_main, ["validate", str(repo), "--dupes", "--watch"])
+    assert result.exit_code == 2
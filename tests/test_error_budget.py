@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.repo_validator import validate_repo
+
+STAMP = "2025-09-22T00:00:00Z"
+
+
+@pytest.fixture
+def broken(base_manifest):
+    """30 packs without a semantic version, and a page whose file is missing."""
+    return base_manifest(
+        {
+            "pages": {
+                "Template:Gone": {"file": "pages/templates/gone.wiki", "last_updated": STAMP}
+            },
+            "packs": {f"p{i}": {"version": "x", "pages": ["Template:Gone"]} for i in range(30)},
+        }
+    )
+
+
+def test_unlimited_run_reports_everything(broken):
+    _, results = validate_repo(broken)
+    assert results.count("error") > 30
+    assert any("Page file not found" in i.message for i in results)
+    assert not results.truncated
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_max_errors_stops_early(broken, jobs):
+    _, results = validate_repo(broken, max_errors=5, jobs=jobs)
+
+    assert results.count("error") == 5
+    assert results.truncated
+    assert {i.code for i in results} == {"schema-validation"}
+    assert "truncated" in results.summary()
+
+
+def test_structural_validators_skipped_after_schema_errors(broken, base_manifest, tmp_page):
+    _, results = validate_repo(broken, max_errors=100)
+
+    assert results.count("error") == 30
+    assert results.truncated
+    assert not any("Page file not found" in i.message for i in results)
+
+    # errors of other validators do not skip them: this manifest is valid against the schema
+    mpath = base_manifest(
+        {
+            "pages": {
+                "Template:A": tmp_page(name="A"),
+                "Template:Gone": {"file": "pages/templates/gone.wiki", "last_updated": STAMP},
+            },
+            "packs": {
+                "p": {"version": "1.0.0", "pages": ["Template:A", "Template:Missing"]},
+                "q": {"version": "1.0.0", "pages": ["Template:Gone"], "depends_on": ["ghost"]},
+            },
+        }
+    )
+    _, results = validate_repo(mpath, max_errors=50)
+
+    assert {i.code for i in results.errors} == {"pack-deps", "pack-pages", "page-file"}
+    assert not results.truncated
+
+
+def test_budget_not_reached(base_manifest, tmp_page):
+    mpath = base_manifest({"pages": {"Template:A": tmp_page(name="A")}})
+    _, results = validate_repo(mpath, max_errors=1)
+    assert not results.truncated and results.rc == 0
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cli_fail_fast(broken, stream):
+    args = ["validate", str(broken), "--fail-fast", "--format", "ndjson"]
+    result = CliRunner().invoke(cli_main, args + (["--stream"] if stream else []))
+
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert len(lines) == 2
+    assert lines[-1]["summary"]["errors"] == 1
+    assert lines[-1]["summary"]["truncated"] is True
@@ -0,0 +1,99 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.export import export_pack, pack_closure
+from labki_packs_tools.ingest import parse_export
+from labki_packs_tools.manifest import Manifest
+from labki_packs_tools.utils import PackGraph, load_yaml
+
+
+def test_pack_closure_orders_dependencies_first(fixtures_repo: Path):
+    graph = PackGraph.from_manifest(load_yaml(fixtures_repo / "manifest.yml"))
+    closure = pack_closure(graph, "app")
+
+    assert set(closure) == {"app", "shared_base", "onboarding", "publication"}
+    assert closure.index("publication") < closure.index("onboarding") < closure.index("app")
+    with pytest.raises(KeyError):
+        pack_closure(graph, "missing")
+
+
+def test_export_roundtrips_through_parse_export(fixtures_repo: Path, tmp_path: Path):
+    manifest_path = fixtures_repo / "manifest.yml"
+    out = tmp_path / "app.xml"
+    assert export_pack(manifest_path, "app", out) == [out]
+
+    manifest = Manifest.from_yaml(manifest_path)
+    pages = {page.name: page for page in parse_export(out)}
+    expected = {
+        title
+        for pack in ("app", "shared_base", "onboarding", "publication")
+        for title in manifest.packs[pack].pages
+    }
+    assert set(pages) == expected
+    for title, page in pages.items():
+        entry = manifest.pages[title]
+        assert page.content == (fixtures_repo / entry.file).read_text(encoding="utf-8")
+        assert page.last_updated == entry.last_updated
+
+
+def test_export_without_dependencies(fixtures_repo: Path, tmp_path: Path):
+    out = tmp_path / "onboarding.xml"
+    export_pack(fixtures_repo / "manifest.yml", "onboarding", out, include_dependencies=False)
+    assert [p.name for p in parse_export(out)] == ["Onboarding"]
+
+
+def test_export_splits_into_size_capped_files(fixtures_repo: Path, tmp_path: Path):
+    max_bytes = 2500
+    paths = export_pack(
+        fixtures_repo / "manifest.yml", "meta_pack", tmp_path / "meta.xml", max_bytes=max_bytes
+    )
+
+    assert len(paths) > 1
+    assert [p.name for p in paths] == [f"meta-{i:03d}.xml" for i in range(1, len(paths) + 1)]
+    titles = []
+    for path in paths:
+        assert path.stat().st_size <= max_bytes
+        titles += [p.name for p in parse_export(path)]
+    assert len(titles) == len(set(titles)) == 7
+
+
+def test_cli_export_stdout(fixtures_repo: Path):
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_main,
+        ["export", "shared_base", "-m", str(fixtures_repo / "manifest.yml")],
+    )
+    assert result.exit_code == 0, result.output
+    assert "<title>Module:Util</title>" in result.output
+    assert "<model>Scribunto</model>" in result.output
+    assert result.output.rstrip().endswith("</mediawiki>")
+
+
+def test_cli_export_unknown_pack(fixtures_repo: Path):
+    runner = CliRunner()
+    result = runner.invoke(cli_main, ["export", "nope", "-m", str(fixtures_repo / "manifest.yml")])
+    assert result.exit_code != 0
+    assert "Unknown pack: nope" in result.output
+
+
+def test_failed_export_leaves_no_partial_output(fixtures_repo: Path, tmp_path: Path):
+    repo = tmp_path / "repo"
+    shutil.copytree(fixtures_repo, repo)
+    (repo / "pages/forms/form_publication.wiki").unlink()
+    out = tmp_path / "out"
+
+    for max_bytes in (None, 1000):
+        with pytest.raises(FileNotFoundError):
+            export_pack(repo / "manifest.yml", "publication", out / "p.xml", max_bytes=max_bytes)
+        assert list(out.iterdir()) == []
+
+    result = CliRunner().invoke(
+        cli_main, ["export", "publication", "-m", str(repo / "manifest.yml")]
+    )
+    assert result.exit_code != 0
+    assert "Page file not found" in result.output
+    assert "</mediawiki>" not in result.output
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import copy
+import datetime as dt
+import json
+from typing import Callable
+
+import pytest
+from jsonschema import Draft202012Validator
+
+from labki_packs_tools.const import SCHEMA_DIR
+from labki_packs_tools.validation.fastpath import FastValidator, UnsupportedSchema
+from labki_packs_tools.validation.schema_registry import compile_schema
+from labki_packs_tools.validation.validators.manifest_schema_validator import (
+    ManifestSchemaValidator,
+)
+
+SCHEMA = json.loads((SCHEMA_DIR / "v1_0_0" / "manifest.schema.json").read_text())
+
+VALID = {
+    "schema_version": "1.0.0",
+    "name": "labki-demo",
+    "last_updated": "2025-09-22T00:00:00Z",
+    "pages": {
+        "Template:A": {"file": "pages/a.wiki", "last_updated": "2025-09-22T00:00:00Z"},
+        "Module:B": {
+            "file": "pages/modules/b.lua",
+            "last_updated": "2025-09-22T00:00:00Z",
+            "description": "b",
+        },
+    },
+    "packs": {
+        "a": {"version": "1.0.0", "pages": ["Template:A"], "tags": ["core"]},
+        "b": {"version": "1.0.0", "depends_on": ["a", "c"]},
+    },
+}
+
+
+def _set(path: str, value: object) -> Callable[[dict], None]:
+    def mutate(manifest: dict) -> None:
+        *parents, last = path.split("/")
+        target = manifest
+        for key in parents:
+            target = target[key]
+        target[last] = value
+
+    return mutate
+
+
+def _delete(path: str) -> Callable[[dict], None]:
+    def mutate(manifest: dict) -> None:
+        *parents, last = path.split("/")
+        target = manifest
+        for key in parents:
+            target = target[key]
+        del target[last]
+
+    return mutate
+
+
+MUTATIONS = {
+    "valid": lambda m: None,
+    "bad version": _set("packs/a/version", "1.0"),
+    "version not a string": _set("packs/a/version", 1),
+    "yaml date": _set("pages/Template:A/last_updated", dt.date(2025, 9, 22)),
+    "yaml datetime": _set("last_updated", dt.datetime(2025, 9, 22)),
+    "bad file": _set("pages/Template:A/file", "pages/A.wiki"),
+    "unknown page field": _set("pages/Template:A/extra", 1),
+    "unknown pack field": _set("packs/a/extra", 1),
+    "unknown top-level field": _set("extra", 1),
+    "underscore title": _set("pages/Template_A", VALID["pages"]["Template:A"]),
+    "non-string title": _set("pages/1", VALID["pages"]["Template:A"]),
+    "missing file": _delete("pages/Template:A/file"),
+    "missing name": _delete("name"),
+    "empty name": _set("name", ""),
+    "pages not a mapping": _set("pages", []),
+    "pack pages not a list": _set("packs/a/pages", "Template:A"),
+    "duplicate pack pages": _set("packs/a/pages", ["Template:A", "Template:A"]),
+    "duplicate tags": _set("packs/a/tags", ["core", "core"]),
+    "bad tag": _set("packs/a/tags", ["Core"]),
+    "anyOf violated": _set("packs/b/depends_on", ["a"]),
+    "empty pages and deps": _set("packs/a/pages", []),
+    "page entry not a mapping": _set("pages/Template:A", None),
+    "bool as string": _set("packs/a/description", True),
+}
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_fast_path_agrees_with_jsonschema(mutation):
+    manifest = copy.deepcopy(VALID)
+    mutation(manifest)
+    fast = FastValidator(SCHEMA)
+    try:
+        has_errors = any(True for _ in Draft202012Validator(SCHEMA).iter_errors(manifest))
+    except TypeError:
+        has_errors = True  # jsonschema cannot handle e.g. non-string keys
+    assert fast.is_valid(manifest) is not has_errors
+
+
+def test_subschema_validators():
+    fast = FastValidator(SCHEMA)
+    pages = fast.validator_for(SCHEMA["properties"]["pages"])
+    assert pages({"Template:A": VALID["pages"]["Template:A"]})
+    assert not pages({"Template:A": {"file": "x"}})
+    assert fast.validator_for({"type": "string"}) is None
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"enum": [1, 2]},
+        {"$ref": "https://example.org/other.json"},
+        {"prefixItems": [{"type": "string"}]},
+        {"properties": {"a": {"$id": "nested"}}},
+        # a "maybe invalid" subschema would turn into "valid" here
+        {"not": {"uniqueItems": True}},
+        {"oneOf": [{"type": "string"}, {"items": {"uniqueItems": True}}]},
+        {"if": {"additionalProperties": False}, "then": {"minProperties": 1}},
+        {"not": {"$ref": "#/$defs/unique"}, "$defs": {"unique": {"uniqueItems": True}}},
+    ],
+)
+def test_unsupported_schemas(schema):
+    with pytest.raises(UnsupportedSchema):
+        FastValidator(schema)
+    assert compile_schema(schema).fast is None
+
+
+def test_generic_keywords():
+    schema = {
+        "type": ["object", "null"],
+        "patternProperties": {"^n_": {"type": "integer", "minimum": 0}},
+        "additionalProperties": {"type": "string", "maxLength": 3},
+        "properties": {"choice": {"oneOf": [{"type": "string"}, {"minimum": 5}]}},
+        "if": {"required": ["kind"]},
+        "then": {"required": ["value"]},
+        "minProperties": 1,
+    }
+    fast = FastValidator(schema)
+    validator = Draft202012Validator(schema)
+    for instance in [
+        None,
+        {"n_a": 1, "x": "abc"},
+        {"n_a": -1},
+        {"n_a": True},
+        {"x": "abcd"},
+        {"choice": "s"},
+        {"choice": 7},
+        {"choice": 1},
+        {"kind": "k"},
+        {"kind": "k", "value": "v"},
+        {},
+        [],
+    ]:
+        assert fast.is_valid(instance) is validator.is_valid(instance), instance
+
+
+@pytest.mark.parametrize(
+    "schema, instance",
+    [
+        ({"type": "integer"}, 1.0),
+        ({"type": "integer"}, 1.5),
+        ({"not": {"type": "integer"}}, 1.0),
+        ({"not": {"type": "integer"}}, "1"),
+        ({"if": {"type": "integer"}, "then": {"minimum": 10}}, 1.0),
+        ({"if": {"type": "integer"}, "then": {"minimum": 10}}, 10.0),
+        ({"oneOf": [{"type": "integer"}, {"type": "number", "maximum": 5}]}, 2.0),
+        ({"not": {"not": {"required": ["a"]}}}, {"a": 1}),
+        ({"not": {"not": {"required": ["a"]}}}, {}),
+    ],
+)
+def test_negated_checks_agree_with_jsonschema(schema, instance):
+    assert FastValidator(schema).is_valid(instance) is Draft202012Validator(schema).is_valid(
+        instance
+    )
+
+
+def test_negated_inexact_schemas_are_validated_by_jsonschema():
+    schema = {
+        "type": "object",
+        "properties": {
+            "a": {"not": {"type": "integer"}},
+            "b": {"not": {"uniqueItems": True}},
+        },
+    }
+    instance = {"a": 1.0, "b": [1, 2]}
+    compiled = compile_schema(schema)
+    assert len(list(compiled.iter_errors(instance))) == 2
+    assert compiled.fast is None
+
+
+def test_manifest_validator_output_unchanged_by_fast_path():
+    manifest = copy.deepcopy(VALID)
+    manifest["packs"]["a"]["version"] = "x"
+    manifest["pages"]["Template:A"]["extra"] = 1
+
+    validator = ManifestSchemaValidator()
+    items = validator.validate(manifest=manifest, schema=SCHEMA)
+    errors = sorted(Draft202012Validator(SCHEMA).iter_errors(manifest), key=lambda e: e.path)
+    assert [i.message for i in items] == [i.message for i in validator.format_errors(errors)]
+    assert len(items) == 2
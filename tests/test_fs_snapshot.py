@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.snapshot import FileSnapshot
+from labki_packs_tools.validation.validators import OrphanPageValidator, PageFileValidator
+
+PAGE = {"last_updated": "2025-09-22T00:00:00Z"}
+
+
+def _tree(tmp_path: Path) -> None:
+    for rel in [
+        "pages/templates/a.wiki",
+        "pages/templates/nested/b.wiki",
+        "pages/modules/m.lua",
+        "pages/drafts/d.wiki",
+        "pages/x.wiki.swp",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x", encoding="utf-8")
+
+
+def _walk(root: Path) -> list[str]:
+    return sorted(
+        (Path(d) / f).relative_to(root).as_posix()
+        for d, _dirs, files in os.walk(root / "pages")
+        for f in files
+    )
+
+
+def test_scan_matches_os_walk(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / "pages" / "linked").symlink_to(tmp_path / "pages" / "templates")
+    (tmp_path / "pages" / "alias.wiki").symlink_to(tmp_path / "pages" / "templates" / "a.wiki")
+
+    serial = FileSnapshot.scan(tmp_path)
+    assert list(serial.walk_files()) == _walk(tmp_path)
+
+    concurrent = FileSnapshot.scan(tmp_path, jobs=4)
+    assert concurrent.files == serial.files
+    assert concurrent.dirs == serial.dirs
+
+    # symlinks resolve to the same file; paths through a symlinked directory still exist
+    assert serial.canonical("pages/alias.wiki") == "pages/templates/a.wiki"
+    assert serial.canonical("pages/linked/nested/b.wiki") == "pages/templates/nested/b.wiki"
+    assert serial.exists("pages/linked/nested/b.wiki")
+    assert not serial.exists("pages/missing/b.wiki")
+    assert serial.stat_signature("pages/./templates/a.wiki") == [
+        (tmp_path / "pages/templates/a.wiki").stat().st_mtime_ns,
+        1,
+    ]
+
+
+def test_ignore_rules(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / ".labkiignore").write_text("# editor files\n*.swp\npages/drafts\n")
+
+    snapshot = FileSnapshot.scan(tmp_path)
+    assert list(snapshot.walk_files()) == [
+        "pages/modules/m.lua",
+        "pages/templates/a.wiki",
+        "pages/templates/nested/b.wiki",
+    ]
+    assert "pages/drafts" not in snapshot.dirs
+    # ignored paths are not listed, but still found when referenced
+    assert snapshot.exists("pages/drafts/d.wiki")
+    assert not snapshot.exists("pages/drafts/missing.wiki")
+
+    assert FileSnapshot.scan(tmp_path, ignore=["nested"]).ignore == ("nested",)
+
+
+def test_validators_answer_from_snapshot(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    pages = {
+        "Template:A": {"file": "pages/templates/a.wiki", **PAGE},
+        "Template:Gone": {"file": "pages/templates/gone.wiki", **PAGE},
+        "Module:M": {"file": "pages/modules/m.lua", **PAGE},
+    }
+    manifest_path = tmp_path / "manifest.yml"
+    snapshot = FileSnapshot.scan(tmp_path)
+
+    def no_syscalls(*args: object, **kwargs: object) -> None:
+        raise AssertionError("filesystem accessed")
+
+    for name in ("stat", "lstat", "scandir", "walk"):
+        monkeypatch.setattr(os, name, no_syscalls)
+    monkeypatch.setattr(Path, "resolve", no_syscalls)
+    monkeypatch.setattr(Path, "exists", no_syscalls)
+
+    context = {"manifest_path": manifest_path, "pages": pages, "snapshot": snapshot}
+    try:
+        page_items = [str(i) for i in PageFileValidator().validate(**context)]
+        orphan_items = [i.file for i in OrphanPageValidator().validate(**context)]
+        OrphanPageValidator().fingerprint(**context)
+        PageFileValidator().page_fingerprint("Template:A", pages["Template:A"], **context)
+    finally:
+        monkeypatch.undo()
+
+    assert any("Page file not found: pages/templates/gone.wiki" in i for i in page_items)
+    assert any("Module files should be under pages/Modules/" in i for i in page_items)
+    assert orphan_items == ["pages/drafts/d.wiki", "pages/templates/nested/b.wiki"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cli_ignore_option(base_manifest, tmp_path, stream):
+    _tree(tmp_path)
+    mpath = base_manifest(
+        {"pages": {"Template:A": {"file": "pages/templates/a.wiki", **PAGE}}, "packs": {}}
+    )
+    args = ["validate", str(mpath), "--json", "--ignore", "drafts", "--scan-jobs", "2"]
+    result = CliRunner().invoke(cli_main, args + (["--stream"] if stream else []))
+
+    assert "pages/templates/nested/b.wiki" in result.output
+    assert "pages/drafts/d.wiki" not in result.output
+
+
+def test_validate_repo_accepts_snapshot(base_manifest, tmp_path):
+    _tree(tmp_path)
+    mpath = base_manifest({"pages": {}, "packs": {}})
+    _, full = validate_repo(mpath)
+    _, ignored = validate_repo(mpath, snapshot=FileSnapshot.scan(tmp_path, ignore=["pages/*"]))
+    assert len(full.warnings) == 3
+    assert not ignored.warnings
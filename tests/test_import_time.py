@@ -0,0 +1,53 @@
+"""
+`labki --help` should start quickly: subcommands and their dependencies are
+only imported when a command runs.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_BUDGET_MS = 250
+"""Total import time allowed for ``python -m labki_packs_tools --help``"""
+
+DEFERRED = ("jsonschema", "pydantic", "rich", "yaml", "labki_packs_tools.validation.validators")
+"""Modules that must not be imported just to print help"""
+
+
+def _import_times(*args: str) -> dict[str, int]:
+    """
+    Modules imported by ``python -m labki_packs_tools ARGS``, with their cumulative
+    import time in microseconds; modules imported by another module count as 0,
+    as their time is already included in the importing one.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "labki_packs_tools", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # nested imports are indented
+        times[name.strip()] = 0 if name.startswith("  ") else int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("args", [("--help",), ("validate", "--help"), ("graph", "--help")])
+def test_help_does_not_import_dependencies(args):
+    imported = _import_times(*args)
+    for module in DEFERRED:
+        loaded = [name for name in imported if name == module or name.startswith(module + ".")]
+        assert not loaded, f"{module} imported by: labki {' '.join(args)}"
+
+
+def test_help_import_budget():
+    # best of three, to not fail on a single slow start of a busy machine
+    total = min(sum(_import_times("--help").values()) for _ in range(3)) / 1000
+    assert total < IMPORT_BUDGET_MS, f"imports took {total:.0f} ms"
@@ -2,6 +2,7 @@ from datetime import UTC, datetime
 
 import pytest
 
+from labki_packs_tools.checksum import file_checksum
 from labki_packs_tools.ingest import update_manifest
 from labki_packs_tools.manifest import Manifest
 
@@ -46,6 +47,10 @@ def test_export_update(base_manifest, export_data, export):
     assert manifest.last_updated > old_date
     assert len(manifest.pages) == 4
     assert manifest.pages["Category:Supply"].last_updated == future_date
+    for title in ("Template:Supply", "Form:Supply"):
+        page = manifest.pages[title]
+        assert page.checksum == file_checksum(manifest_path.parent / page.file)
+    assert manifest.pages["Category:Supply"].checksum is None
 
 
 @pytest.mark.parametrize("export", ("latest.xml", "revisions.xml"))
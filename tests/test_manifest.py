@@ -3,6 +3,7 @@ from pathlib import Path
 import yaml
 
 from labki_packs_tools.manifest import Manifest
+from labki_packs_tools.utils import edit_yaml
 
 
 def test_manifest_roundtrip_yaml(fixtures_repo: Path):
@@ -16,3 +17,64 @@ def test_manifest_roundtrip_yaml(fixtures_repo: Path):
     model = Manifest.from_yaml(manifest_path)
     dumped = model.model_dump(exclude_unset=True)
     assert dumped == data
+
+
+def test_edit_yaml_only_changes_edited_values():
+    text = """\
+$schema: ./schema.json  # pinned
+pages:
+  A:
+    file: a.wiki
+  B: {file: b.wiki}
+  C:
+    file: c.wiki
+    checksum: sha256:old
+    description: |
+      two
+      lines
+packs:
+  p:
+    depends_on:
+      - x
+      - y
+    pages: [A]
+  q:
+    depends_on: [x, y]
+  r:
+    depends_on:
+    - x
+"""
+    edited = edit_yaml(
+        text,
+        {
+            ("pages", "A", "checksum"): "sha256:a",
+            ("pages", "B", "checksum"): "sha256:b",
+            ("pages", "C", "checksum"): "sha256:c",
+            ("packs", "p", "depends_on"): ["y"],
+            ("packs", "q", "depends_on"): ["y"],
+            ("packs", "r", "depends_on"): [],
+        },
+    )
+    assert edited == """\
+$schema: ./schema.json  # pinned
+pages:
+  A:
+    file: a.wiki
+    checksum: sha256:a
+  B: {file: b.wiki, checksum: sha256:b}
+  C:
+    file: c.wiki
+    checksum: sha256:c
+    description: |
+      two
+      lines
+packs:
+  p:
+    depends_on:
+      - y
+    pages: [A]
+  q:
+    depends_on: [y]
+  r:
+    depends_on: []
+"""
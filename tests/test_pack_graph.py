@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from labki_packs_tools.utils import PackGraph, extract_graph
+from labki_packs_tools.utils.common import load_yaml
+from labki_packs_tools.validation.repo_validator import validate_repo
+
+MANIFEST = {
+    "pages": {"A": {}, "B": {}, "C": {}},
+    "packs": {
+        "base": {"version": "1.0.0", "pages": ["A"]},
+        "mid": {"version": "1.0.0", "pages": ["B", "Missing"], "depends_on": ["base"]},
+        "top": {"version": "1.0.0", "pages": ["C"], "depends_on": ["mid", "base", "ghost"]},
+    },
+}
+
+
+def test_pack_graph_interns_ids():
+    g = PackGraph.from_manifest(MANIFEST)
+    assert g.pack_ids == ["base", "mid", "top"]
+    assert g.page_titles == ["A", "B", "C"]
+    assert g.pack_index["top"] == 2
+    assert g.page_index["C"] == 2
+
+
+def test_pack_graph_forward_and_reverse_adjacency():
+    g = PackGraph.from_manifest(MANIFEST)
+    base, mid, top = (g.pack_index[p] for p in ("base", "mid", "top"))
+
+    assert list(g.dependencies(top)) == [mid, base]
+    assert list(g.dependencies(base)) == []
+    assert sorted(g.dependents(base)) == [mid, top]
+    assert [g.page_titles[k] for k in g.pages_of(mid)] == ["B"]
+    assert [g.pack_ids[i] for i in g.packs_of(g.page_index["A"])] == ["base"]
+
+
+def test_pack_graph_records_unknown_references():
+    g = PackGraph.from_manifest(MANIFEST)
+    assert g.unknown_deps == [("top", "ghost")]
+    assert g.unknown_pages == [("mid", "Missing")]
+
+
+def test_pack_graph_traversal():
+    g = PackGraph.from_manifest(MANIFEST)
+    base, mid, top = (g.pack_index[p] for p in ("base", "mid", "top"))
+
+    assert sorted(g.reachable([top])) == [base, mid, top]
+    assert sorted(g.reachable([base], reverse=True)) == [base, mid, top]
+    order = g.topological_order()
+    assert order.index(base) < order.index(mid) < order.index(top)
+
+
+def test_pack_graph_topological_order_detects_cycle():
+    g = PackGraph.from_packs({"a": {"depends_on": ["b"]}, "b": {"depends_on": ["a"]}, "c": {}})
+    assert [g.pack_ids[i] for i in g.topological_order()] == ["c"]
+
+
+def test_pack_graph_strongly_connected_components():
+    g = PackGraph.from_packs(
+        {
+            "a": {"depends_on": ["b"]},
+            "b": {"depends_on": ["c", "ghost"]},
+            "c": {"depends_on": ["a", "d"]},
+            "d": {"depends_on": ["e"]},
+            "e": {"depends_on": ["d", "f"]},
+            "f": {},
+            "g": {"depends_on": ["g"]},
+        }
+    )
+    components = [[g.pack_ids[i] for i in c] for c in g.strongly_connected_components()]
+    assert components == [["f"], ["d", "e"], ["a", "b", "c"], ["g"]]
+
+    def path(*ids: str) -> list[str]:
+        return [g.pack_ids[i] for i in g.cycle_path([g.pack_index[p] for p in ids])]
+
+    assert path("a", "b", "c") == ["a", "b", "c", "a"]
+    assert path("d", "e") == ["d", "e", "d"]
+    assert path("g") == ["g", "g"]
+    assert path("f") == []
+
+
+def test_strongly_connected_components_of_a_long_chain():
+    # deeper than the recursion limit
+    n = 5000
+    packs = {f"p{i}": {"depends_on": [f"p{i + 1}"]} for i in range(n)}
+    packs[f"p{n - 1}"]["depends_on"] = ["p0"]
+    g = PackGraph.from_packs(packs)
+    [component] = g.strongly_connected_components()
+    assert len(component) == n
+    assert len(g.cycle_path(component)) == n + 1
+
+
+def test_extract_graph_keeps_manifest_order(fixtures_repo):
+    manifest = load_yaml(fixtures_repo / "manifest.yml")
+    pack_ids, page_titles, dep_edges, include_edges = extract_graph(manifest)
+
+    assert pack_ids == list(manifest["packs"])
+    assert page_titles == list(manifest["pages"])
+    assert dep_edges == [
+        (pid, dep) for pid, meta in manifest["packs"].items() for dep in meta["depends_on"]
+    ]
+    assert include_edges == [
+        (pid, title) for pid, meta in manifest["packs"].items() for title in meta["pages"]
+    ]
+
+
+def test_unknown_dependency_is_not_a_cycle(base_manifest):
+    mpath = base_manifest({"packs": {"p": {"version": "1.0.0", "depends_on": ["q", "r"]}}})
+    _, results = validate_repo(mpath)
+    messages = [i.message for i in results.errors]
+
+    assert any("depends_on unknown pack id: q" in m for m in messages)
+    assert not any("cycle" in m for m in messages)
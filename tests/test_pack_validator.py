@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import difflib
+
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
 from labki_packs_tools.validation.repo_validator import validate_repo
 
 
@@ -21,7 +27,92 @@ def test_pack_cycle_detection(base_manifest):
     errors = _messages(results, "error")
 
     assert rc != 0
-    assert any("cycle" in e for e in errors)
+    assert "Dependency cycle among packs 'a', 'b': a -> b -> a" in errors
+
+
+def test_every_pack_cycle_is_reported(base_manifest):
+    mpath = base_manifest(
+        {
+            "packs": {
+                "x": {"version": "1.0.0", "pages": [], "depends_on": ["y", "ghost"]},
+                "y": {"version": "1.0.0", "pages": [], "depends_on": ["z"]},
+                "z": {"version": "1.0.0", "pages": [], "depends_on": ["x", "y"]},
+                "w": {"version": "1.0.0", "pages": [], "depends_on": ["x", "w"]},
+            }
+        }
+    )
+    rc, results = validate_repo(mpath)
+    cycles = [(i.pack, i.message) for i in results.errors if i.code == "pack-cycles"]
+
+    assert rc != 0
+    assert cycles == [
+        ("x", "Dependency cycle among packs 'x', 'y', 'z': x -> y -> z -> x"),
+        ("w", "Pack 'w' depends on itself"),
+    ]
+
+
+def test_redundant_dependencies_are_reported_and_fixed(base_manifest, tmp_page):
+    mpath = base_manifest(
+        {
+            "pages": {f"Template:{name}": tmp_page(name=name) for name in ("A", "B", "C")},
+            "packs": {
+                "base": {"version": "1.0.0", "pages": ["Template:A"]},
+                "util": {"version": "1.0.0", "pages": ["Template:B"], "depends_on": ["base"]},
+                "app": {
+                    "version": "1.0.0",
+                    "pages": ["Template:C"],
+                    "depends_on": ["base", "util"],
+                },
+            },
+        }
+    )
+    rc, results = validate_repo(mpath)
+    redundant = [(i.pack, i.message) for i in results.warnings if i.code == "pack-redundant-deps"]
+
+    assert rc == 0
+    assert redundant == [
+        ("app", "Pack 'app' depends_on 'base', which it already depends on through 'util'")
+    ]
+
+    # only the redundant entry is removed; comments and other fields are kept
+    original = "# packs of the demo\n" + mpath.read_text()
+    mpath.write_text(original)
+    result = CliRunner().invoke(cli_main, ["validate", str(mpath), "--fix", "--json"])
+    assert result.exit_code == 0, result.output
+    fixed = mpath.read_text()
+    diff = difflib.ndiff(original.splitlines(), fixed.splitlines())
+    assert [line.split() for line in diff if line[0] in "+-"] == [["-", "-", "base"]]
+    assert yaml.safe_load(fixed)["packs"]["app"]["depends_on"] == ["util"]
+    _, results = validate_repo(mpath)
+    assert not [i for i in results.warnings if i.code == "pack-redundant-deps"]
+
+
+def test_meta_packs_keep_two_dependencies(base_manifest, tmp_page):
+    """Packs without pages must keep at least two depends_on entries to stay schema-valid."""
+    mpath = base_manifest(
+        {
+            "pages": {f"Template:{name}": tmp_page(name=name) for name in ("A", "B")},
+            "packs": {
+                "base": {"version": "1.0.0", "pages": ["Template:A"]},
+                "base2": {"version": "1.0.0", "pages": ["Template:B"]},
+                "util": {"version": "1.0.0", "depends_on": ["base", "base2"]},
+                "meta": {"version": "1.0.0", "depends_on": ["base", "util"]},
+                "all": {"version": "1.0.0", "depends_on": ["base", "base2", "util"]},
+            },
+        }
+    )
+    rc, results = validate_repo(mpath)
+    redundant = [(i.pack, i.message) for i in results.warnings if i.code == "pack-redundant-deps"]
+    assert rc == 0
+    assert redundant == [
+        ("all", "Pack 'all' depends_on 'base', which it already depends on through 'util'")
+    ]
+
+    result = CliRunner().invoke(cli_main, ["validate", str(mpath), "--fix", "--json"])
+    assert result.exit_code == 0, result.output
+    packs = yaml.safe_load(mpath.read_text())["packs"]
+    assert packs["meta"]["depends_on"] == ["base", "util"]
+    assert packs["all"]["depends_on"] == ["base2", "util"]
 
 
 def test_pack_references_unknown_page(base_manifest):
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from labki_packs_tools.validation import references
+from labki_packs_tools.validation.cache import ValidationCache
+from labki_packs_tools.validation.references import (
+    normalize_title,
+    resolve_reference,
+    scan_bytes,
+    scan_file,
+    scan_files,
+)
+from labki_packs_tools.validation.repo_validator import validate_repo
+
+
+def _refs(results) -> list[str]:
+    return [i.message for i in results if i.code == "page-refs"]
+
+
+def _manifest(base_manifest, tmp_page, tmp_path: Path, content: str) -> Path:
+    (tmp_path / "pages" / "modules").mkdir(parents=True)
+    (tmp_path / "pages" / "modules" / "util.lua").write_text("return {}\n", encoding="utf-8")
+    (tmp_path / "pages" / "modules" / "main.lua").write_text(
+        "-- require('Module:Commented')\nlocal u = require('Module:Util')\n", encoding="utf-8"
+    )
+    pages = {
+        "Form:Main": tmp_page(namespace="Form", name="Main", content=content),
+        "Template:Base": tmp_page(name="Base"),
+        "Template:Shared": tmp_page(name="Shared"),
+        "Module:Util": {"file": "pages/modules/util.lua", "last_updated": "2025-09-22T00:00:00Z"},
+        "Module:Main": {"file": "pages/modules/main.lua", "last_updated": "2025-09-22T00:00:00Z"},
+    }
+    return base_manifest(
+        {
+            "pages": pages,
+            "packs": {
+                "base": {"version": "1.0.0", "pages": ["Template:Base"]},
+                "util": {"version": "1.0.0", "pages": ["Module:Util"]},
+                "app": {
+                    "version": "1.0.0",
+                    "pages": ["Form:Main", "Module:Main"],
+                    "depends_on": ["base"],
+                },
+                "x": {"version": "1.0.0", "pages": ["Template:Shared"], "depends_on": ["app"]},
+            },
+        }
+    )
+
+
+def test_scan_wikitext():
+    data = (
+        b"{{Base|a=1}} {{ template:base }} [[Form:Main|label]] [[#Anchor]]\n"
+        b"{{#invoke:Util|main}} {{:Main Page}} {{{param}}} {{subst:Shared}}\n"
+        b"<!-- {{Commented}} --> <nowiki>{{Escaped}}</nowiki> [[Some_page#Section]]"
+    )
+    assert scan_bytes(data) == [
+        ("transclusion", "Base"),
+        ("transclusion", "template:base"),
+        ("link", "Form:Main"),
+        ("invoke", "Util"),
+        ("transclusion", ":Main Page"),
+        ("transclusion", "Shared"),
+        ("link", "Some page"),
+    ]
+
+
+def test_scan_lua():
+    data = b"""
+    --[[ require('Module:InBlock') ]]
+    local a = require('Module:A') -- require("Module:Commented")
+    local b = require "Module:B"
+    local c = mw.loadData('Module:C/data')
+    """
+    assert scan_bytes(data, lua=True) == [
+        ("require", "Module:A"),
+        ("require", "Module:B"),
+        ("require", "Module:C/data"),
+    ]
+
+
+def test_resolve_reference():
+    titles = {normalize_title(t): t for t in ["Template:Base", "Module:Util", "Form:Main", "Main"]}
+    assert resolve_reference("transclusion", "base", titles) == "Template:Base"
+    assert resolve_reference("transclusion", ":Main", titles) == "Main"
+    assert resolve_reference("transclusion", "Template:Base", titles) == "Template:Base"
+    assert resolve_reference("invoke", "Util", titles) == "Module:Util"
+    assert resolve_reference("link", ":form:Main", titles) == "Form:Main"
+    assert resolve_reference("require", "Module:Util", titles) == "Module:Util"
+    assert resolve_reference("link", "Unknown", titles) is None
+
+
+def test_large_files_are_memory_mapped(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(references, "MMAP_THRESHOLD", 1)
+    path = tmp_path / "page.wiki"
+    path.write_text("{{Base}} [[Other]]", encoding="utf-8")
+    assert scan_file(path) == [("transclusion", "Base"), ("link", "Other")]
+
+
+def test_references_outside_dependencies(base_manifest, tmp_page, tmp_path: Path):
+    content = "{{Base}} {{Shared}} {{#invoke:Util|run}} [[Template:Shared]] [[Unknown]]"
+    mpath = _manifest(base_manifest, tmp_page, tmp_path, content)
+    rc, results = validate_repo(mpath)
+
+    assert rc == 0
+    assert sorted(_refs(results)) == [
+        "Page 'Form:Main' of pack 'app' invokes 'Module:Util' of pack 'util', which 'app' "
+        "does not depend on; add 'util' to depends_on",
+        "Page 'Form:Main' of pack 'app' transcludes 'Template:Shared' of pack 'x', which 'app' "
+        "does not depend on; adding the dependency would create a cycle",
+        "Page 'Module:Main' of pack 'app' requires 'Module:Util' of pack 'util', which 'app' "
+        "does not depend on; add 'util' to depends_on",
+    ]
+    item = next(i for i in results if i.code == "page-refs" and i.page == "Form:Main")
+    assert (item.level, item.pack, item.file) == ("warning", "app", "pages/form_main.wiki")
+
+
+def test_references_within_dependencies(base_manifest, tmp_page, tmp_path: Path):
+    mpath = _manifest(base_manifest, tmp_page, tmp_path, "{{Base}} [[Module:Main]]")
+    _, results = validate_repo(mpath)
+    assert [i.page for i in results if i.code == "page-refs"] == ["Module:Main"]
+
+
+def test_scan_results_are_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"p{i}.wiki"
+        path.write_text(f"{{{{T{i}}}}}", encoding="utf-8")
+        paths.append(path)
+    cache = ValidationCache(tmp_path / "cache.json")
+    first = scan_files(paths, cache=cache)
+
+    scanned: list[Path] = []
+    scan = references._scan_or_nothing
+    monkeypatch.setattr(references, "_scan_or_nothing", lambda p: scanned.append(p) or scan(p))
+    assert scan_files(paths, cache=cache) == first
+    assert scanned == []
+
+    # same content as another file: found by hash, not scanned either
+    paths[2].write_text("{{T0}}", encoding="utf-8")
+    assert scan_files(paths, cache=cache)[paths[2]] == [("transclusion", "T0")]
+    assert scanned == []
+
+    paths[1].write_text("{{Changed}}", encoding="utf-8")
+    assert scan_files(paths, cache=cache)[paths[1]] == [("transclusion", "Changed")]
+    assert scanned == [paths[1]]
+
+
+def test_scan_in_worker_processes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(references, "MIN_POOL_FILES", 1)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"m{i}.lua"
+        path.write_text(f"require('Module:M{i}')", encoding="utf-8")
+        paths.append(path)
+    found = scan_files(paths + [tmp_path / "missing.wiki"], jobs=2)
+    assert [found[p] for p in paths] == [[("require", f"Module:M{i}")] for i in range(4)]
+    assert found[tmp_path / "missing.wiki"] == []
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
+from labki_packs_tools.validation import repo_validator
 from labki_packs_tools.validation.repo_validator import validate_repo
 
 
@@ -23,3 +26,42 @@ def test_validate_repo_end_to_end_success(base_manifest, tmp_page):
     )
     rc, results = validate_repo(mpath)
     assert rc == 0, f"expected success, got rc={rc}, errors={[i.message for i in results.errors]}"
+
+
+def _items(results) -> list[tuple[str, str]]:
+    return [(i.level, i.message) for i in results]
+
+
+@pytest.mark.parametrize("jobs", [2, 8])
+def test_parallel_validation_matches_serial_order(monkeypatch, base_manifest, tmp_page, jobs):
+    monkeypatch.setattr(repo_validator, "MIN_SHARD_SIZE", 1)
+    pages = {f"Template:T{i}": tmp_page(name=f"T{i}") for i in range(10)}
+    pages["Module:Missing"] = {"file": "pages/missing.wiki", "last_updated": "2025-09-22"}
+    pages["Template:Gone"] = {"file": "pages/gone.wiki", "last_updated": "2025-09-22T00:00:00Z"}
+    mpath = base_manifest(
+        {
+            "pages": pages,
+            "packs": {
+                "p": {"version": "1.0.0", "pages": list(pages), "depends_on": ["q"]},
+                "r": {"version": "x", "pages": ["Template:T1"]},
+            },
+        }
+    )
+
+    serial_rc, serial = validate_repo(mpath)
+    rc, parallel = validate_repo(mpath, jobs=jobs)
+    assert serial_rc == rc == 1
+    assert _items(parallel) == _items(serial)
+
+
+def test_parallel_validation_reports_shard_failure_once(monkeypatch, base_manifest, tmp_page):
+    monkeypatch.setattr(repo_validator, "MIN_SHARD_SIZE", 1)
+    pages = {f"Template:T{i}": tmp_page(name=f"T{i}") for i in range(6)}
+    pages["Template:T2"] = "not a mapping"
+    pages["Template:T4"] = ["also", "wrong"]
+    mpath = base_manifest({"pages": pages})
+
+    _, serial = validate_repo(mpath)
+    _, parallel = validate_repo(mpath, jobs=3)
+    assert _items(parallel) == _items(serial)
+    assert sum("PageFileValidator failed" in i.message for i in parallel) == 1
@@ -0,0 +1,134 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.resolve import PackResolver, RedundantDependency
+from labki_packs_tools.utils import PackGraph
+
+
+def test_resolve_orders_packs_in_waves(fixtures_repo: Path):
+    resolver = PackResolver.from_manifest(fixtures_repo / "manifest.yml")
+    resolution = resolver.resolve(["app"])
+
+    assert resolution.waves == [["publication", "shared_base"], ["onboarding"], ["app"]]
+    assert resolution.order == ["publication", "shared_base", "onboarding", "app"]
+    assert resolution.pages == [
+        "Template:Publication",
+        "Form:Publication",
+        "Category:Publication",
+        "Property:Has author",
+        "Module:Util",
+        "Help:GettingStarted",
+        "Onboarding",
+    ]
+    assert resolution.unknown_deps == []
+
+    together = resolver.resolve(["meta_pack", "onboarding", "meta_pack"])
+    assert together.packs == ["meta_pack", "onboarding"]
+    assert together.waves == [["publication", "meeting_notes"], ["onboarding", "meta_pack"]]
+    assert resolver.closure(["onboarding"]) == ["publication", "onboarding"]
+
+    with pytest.raises(KeyError):
+        resolver.resolve(["missing"])
+
+
+def test_closures_match_traversal():
+    rng = random.Random(0)
+    n = 300
+    packs = {
+        f"p{i}": {"depends_on": [f"p{j}" for j in rng.sample(range(i), min(i, 3))]}
+        for i in range(n)
+    }
+    graph = PackGraph.from_packs(packs)
+    resolver = PackResolver(graph)
+    for i in range(n):
+        reachable = sorted(graph.reachable([i]))
+        resolution = resolver.resolve([f"p{i}"])
+        assert sorted(graph.pack_index[p] for p in resolution.order) == reachable
+        wave_of = {p: w for w, wave in enumerate(resolution.waves) for p in wave}
+        for pack in resolution.order:
+            for dep in packs[pack]["depends_on"]:
+                assert wave_of[dep] < wave_of[pack]
+
+
+def test_redundant_dependencies():
+    graph = PackGraph.from_packs(
+        {
+            "base": {},
+            "util": {"depends_on": ["base"]},
+            "app": {"depends_on": ["base", "util", "ghost"], "pages": ["A"]},
+            "suite": {"depends_on": ["app", "util", "base"], "pages": ["S"]},
+            "x": {"depends_on": ["y"]},
+            "y": {"depends_on": ["x", "base"]},
+            "z": {"depends_on": ["x", "y", "base"], "pages": ["Z"]},
+        }
+    )
+    assert PackResolver(graph).redundant_dependencies() == [
+        RedundantDependency("app", "base", "util"),
+        RedundantDependency("suite", "util", "app"),
+        RedundantDependency("suite", "base", "app"),
+        # x and y are on a cycle, so they imply each other only through it
+        RedundantDependency("z", "base", "x"),
+    ]
+
+
+def test_removing_redundant_dependencies_keeps_closures():
+    rng = random.Random(1)
+    n = 200
+    packs = {
+        f"p{i}": {"depends_on": [f"p{j}" for j in rng.sample(range(i), min(i, 6))]}
+        for i in range(n)
+    }
+    before = PackResolver(PackGraph.from_packs(packs))
+    for entry in before.redundant_dependencies():
+        packs[entry.pack]["depends_on"].remove(entry.dependency)
+    after = PackResolver(PackGraph.from_packs(packs))
+
+    assert after.redundant_dependencies() == []
+    for pack in packs:
+        assert after.closure([pack]) == before.closure([pack])
+
+
+def test_resolve_refuses_cycles_and_records_unknown_dependencies():
+    graph = PackGraph.from_packs(
+        {
+            "a": {"depends_on": ["b"]},
+            "b": {"depends_on": ["a"]},
+            "c": {"depends_on": ["a"]},
+            "d": {"depends_on": ["ghost"]},
+        }
+    )
+    resolver = PackResolver(graph)
+    with pytest.raises(ValueError, match="dependency cycle a -> b -> a"):
+        resolver.resolve(["c"])
+    assert resolver.closure(["c"]) == ["a", "b", "c"]
+
+    resolution = resolver.resolve(["d"])
+    assert resolution.waves == [["d"]]
+    assert resolution.unknown_deps == [("d", "ghost")]
+
+
+def test_cli_resolve(fixtures_repo: Path):
+    manifest = str(fixtures_repo / "manifest.yml")
+    result = CliRunner().invoke(cli_main, ["resolve", "app", "-m", manifest, "--json"])
+    assert result.exit_code == 0, result.output
+    [resolution] = json.loads(result.output)["resolutions"]
+    assert resolution["waves"] == [["publication", "shared_base"], ["onboarding"], ["app"]]
+
+    result = CliRunner().invoke(cli_main, ["resolve", "-m", manifest, "--each", "--json"])
+    assert result.exit_code == 0, result.output
+    resolutions = json.loads(result.output)["resolutions"]
+    pack_ids = PackResolver.from_manifest(manifest).graph.pack_ids
+    assert [r["packs"] for r in resolutions] == [[pack] for pack in pack_ids]
+
+    result = CliRunner().invoke(cli_main, ["resolve", "-m", manifest])
+    assert result.exit_code == 0, result.output
+    assert "6 packs in 3 waves" in result.output
+
+    result = CliRunner().invoke(cli_main, ["resolve", "missing", "-m", manifest])
+    assert result.exit_code != 0
+    assert "Unknown pack: missing" in result.output
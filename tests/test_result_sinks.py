@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+from labki_packs_tools.validation.sinks import NdjsonSink, SarifSink
+
+
+def _items() -> list[ValidationItem]:
+    return [
+        ValidationItem(level="error", message="missing", page="Template:A", code="page-file"),
+        ValidationItem(level="warning", message="orphan", file="pages/x.wiki", code="page-orphan"),
+        ValidationItem(level="warning", message="orphan", file="pages/y.wiki", code="page-orphan"),
+        ValidationItem(level="info", message="note", pack="base"),
+    ]
+
+
+def test_counters_follow_added_items():
+    results = ValidationResults(_items()[:1])
+    results.extend(_items()[1:3])
+    other = ValidationResults()
+    other.add(_items()[3])
+    results.merge(other)
+
+    assert (results.count("error"), results.count("warning"), results.count("info")) == (1, 2, 1)
+    assert results.codes == {"page-file": 1, "page-orphan": 2, None: 1}
+    assert results.summary() == "1 error(s), 2 warning(s), 1 info(s)"
+    assert len(results) == 4 and results.rc == 1 and not results
+    assert [i.message for i in results.warnings] == ["orphan", "orphan"]
+
+
+def test_items_can_be_streamed_without_keeping_them():
+    out = io.StringIO()
+    results = ValidationResults(sinks=[NdjsonSink(out)], keep_items=False)
+    results.extend(_items())
+    results.close()
+
+    assert list(results) == [] and results.errors == []
+    assert results.rc == 1
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[:-1] == [item.to_dict() for item in _items()]
+    assert lines[-1] == {"summary": {"errors": 1, "warnings": 2, "infos": 1, "exit_code": 1}}
+
+
+def test_items_are_slotted():
+    item = _items()[0]
+    assert not hasattr(item, "__dict__")
+    assert ValidationItem(**item.to_dict()) == item
+
+
+@pytest.mark.parametrize("count", [0, 4])
+def test_sarif_log(count):
+    out = io.StringIO()
+    results = ValidationResults(sinks=[SarifSink(out)])
+    results.extend(_items()[:count])
+    results.close()
+
+    log = json.loads(out.getvalue())
+    assert log["version"] == "2.1.0"
+    [run] = log["runs"]
+    assert len(run["results"]) == count
+    if count:
+        assert [r["level"] for r in run["results"]] == ["error", "warning", "warning", "note"]
+        assert [r["id"] for r in run["tool"]["driver"]["rules"]] == [
+            "page-file",
+            "page-orphan",
+            "labki",
+        ]
+        first, orphan = run["results"][:2]
+        assert first["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] == (
+            "manifest.yml"
+        )
+        assert first["locations"][0]["logicalLocations"] == [
+            {"name": "Template:A", "kind": "page"},
+        ]
+        assert orphan["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] == (
+            "pages/x.wiki"
+        )
+
+
+@pytest.fixture
+def broken_repo(base_manifest, tmp_page, tmp_path):
+    page = tmp_page(name="A")
+    (tmp_path / page["file"]).unlink()
+    (tmp_path / "pages" / "stray.wiki").write_text("x")
+    return base_manifest({"pages": {"Template:A": page}})
+
+
+def _canonical(data: dict) -> str:
+    return json.dumps(data, sort_keys=True)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cli_formats(broken_repo, stream):
+    extra = ["--stream"] if stream else []
+    runner = CliRunner()
+    expected = validate_repo(broken_repo)[1]
+
+    result = runner.invoke(cli_main, ["validate", str(broken_repo), "--format", "ndjson", *extra])
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert sorted(lines[:-1], key=_canonical) == sorted(
+        (i.to_dict() for i in expected), key=_canonical
+    )
+    assert lines[-1]["summary"]["errors"] == 1
+
+    result = runner.invoke(cli_main, ["validate", str(broken_repo), "--format", "sarif", *extra])
+    assert result.exit_code == 1
+    assert len(json.loads(result.output)["runs"][0]["results"]) == len(expected)
+
+
+def test_cli_rejects_conflicting_formats(broken_repo):
+    args = ["validate", str(broken_repo), "--json", "--format", "sarif"]
+    result = CliRunner().invoke(cli_main, args)
+    assert result.exit_code == 2
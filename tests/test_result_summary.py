@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from click.testing import CliRunner
+from rich.console import Console
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation import result_formatter
+from labki_packs_tools.validation.result_formatter import print_results
+from labki_packs_tools.validation.result_types import ValidationItem, ValidationResults
+
+
+@pytest.fixture
+def results() -> ValidationResults:
+    results = ValidationResults()
+    results.add(ValidationItem(level="error", message="broken", code="page-file"))
+    results.extend(
+        ValidationItem(level="warning", message=f"orphan {i}", file=f"p/{i}", code="page-orphan")
+        for i in range(50)
+    )
+    results.add(ValidationItem(level="warning", message="odd", code="page-module-location"))
+    return results
+
+
+def test_plain_output_is_grouped_by_code(results, capsys):
+    report = io.StringIO()
+    print_results(results, title="T", max_examples=3, full_report=report)
+    out = capsys.readouterr().out
+
+    assert out.splitlines()[:3] == ["== T ==", "Errors (1)", "  page-file: 1"]
+    assert "Warnings (51)\n  page-orphan: 50\n" in out
+    assert "orphan 2" in out and "orphan 3" not in out
+    assert "... and 47 more (see the full report)" in out
+    # smaller groups follow larger ones
+    assert out.index("page-module-location: 1") > out.index("page-orphan: 50")
+    assert out.rstrip().endswith("Validation completed: 1 error(s), 51 warning(s), 0 info(s)")
+    assert report.getvalue().splitlines() == [str(item) for item in results]
+
+
+def test_terminal_output_uses_tables(results, monkeypatch):
+    buffer = io.StringIO()
+    monkeypatch.setattr(
+        result_formatter, "_console", Console(file=buffer, force_terminal=True, width=120)
+    )
+    print_results(results, max_examples=5)
+    out = buffer.getvalue()
+
+    assert "Warnings (51)" in out
+    assert "orphan 4" in out and "orphan 5" not in out
+    assert "... and 45 more" in out
+    assert "Validation completed" in out
+
+
+def test_cli_full_report(base_manifest, tmp_path):
+    (tmp_path / "pages").mkdir()
+    for i in range(15):
+        (tmp_path / "pages" / f"stray{i:02}.wiki").write_text("x")
+    mpath = base_manifest()
+    report = tmp_path / "report.txt"
+
+    runner = CliRunner()
+    result = runner.invoke(cli_main, ["validate", str(mpath), "--full-report", str(report)])
+    assert result.exit_code == 0
+    assert "page-orphan: 15" in result.output
+    assert "... and 5 more (see the full report)" in result.output
+    assert len(report.read_text().splitlines()) == 15
+
+    result = runner.invoke(cli_main, ["validate", str(mpath), "--max-examples", "0"])
+    assert "stray14.wiki" in result.output and "more" not in result.output
+
+    result = runner.invoke(cli_main, ["validate", str(mpath), "--json", "--full-report", "-"])
+    assert result.exit_code == 2
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.const import SCHEMA_DIR
+from labki_packs_tools.validation import schema_registry
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.schema_registry import compile_schema, load_schema
+
+SCHEMA = SCHEMA_DIR / "v1_0_0" / "manifest.schema.json"
+
+
+def _strict_schema(tmp_path: Path) -> Path:
+    """The v1 schema, additionally requiring a description on every pack."""
+    schema = json.loads(SCHEMA.read_text())
+    schema["$defs"]["packRegistry"]["additionalProperties"]["required"].append("description")
+    path = tmp_path / "strict.schema.json"
+    path.write_text(json.dumps(schema))
+    return path
+
+
+def test_load_schema_compiles_once(tmp_path, monkeypatch):
+    path = tmp_path / "s.json"
+    path.write_text(json.dumps({"type": "object"}))
+    first = load_schema(path)
+
+    monkeypatch.setattr(schema_registry, "compile_schema", None)  # would fail if called
+    assert load_schema(path) is first
+    assert load_schema(str(path)) is first
+
+
+def test_load_schema_recompiles_changed_file(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_text(json.dumps({"type": "object"}))
+    first = load_schema(path)
+
+    path.write_text(json.dumps({"type": "array"}))
+    os.utime(path, ns=(0, 0))
+    second = load_schema(path)
+    assert second is not first
+    assert second.schema == {"type": "array"}
+    assert not second.validator.is_valid({})
+
+
+def test_compile_schema_is_keyed_by_content():
+    schema = {"type": "object", "required": ["x"]}
+    compiled = compile_schema(schema)
+    assert compile_schema(json.loads(json.dumps(schema))) is compiled
+
+    schema["required"].append("y")  # caller's dict is not shared with the registry
+    assert compiled.schema == {"type": "object", "required": ["x"]}
+    assert compile_schema(schema) is not compiled
+
+
+def test_validate_repo_with_pinned_schema(base_manifest, tmp_path):
+    mpath = base_manifest({"packs": {"p": {"version": "1.0.0", "depends_on": ["a", "b"]}}})
+    strict = _strict_schema(tmp_path)
+
+    _, default = validate_repo(mpath)
+    _, pinned = validate_repo(mpath, strict)
+    assert "Schema validation: Pack 'p' is missing required field(s)" not in [
+        i.message for i in default
+    ]
+    assert "Schema validation: Pack 'p' is missing required field(s)" in [i.message for i in pinned]
+
+
+def test_cli_schema_argument(base_manifest, tmp_path):
+    mpath = base_manifest({"packs": {"p": {"version": "1.0.0", "depends_on": ["a", "b"]}}})
+    strict = _strict_schema(tmp_path)
+    runner = CliRunner()
+
+    for extra in ([], ["--stream"]):
+        result = runner.invoke(cli_main, ["validate", str(mpath), str(strict), "--json", *extra])
+        assert result.exit_code == 1
+        assert "Pack 'p' is missing required field(s)" in result.output
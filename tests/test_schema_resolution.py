@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import functools
+import json
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
+from click.testing import CliRunner
 
+from labki_packs_tools.cli.main import main as cli_main
 from labki_packs_tools.validation.repo_validator import validate_repo
-from labki_packs_tools.validation.schema_resolver import resolve_schema
+from labki_packs_tools.validation.schema_resolver import (
+    fetch_schema,
+    packaged_schemas,
+    resolve_schema,
+    schema_cache_dir,
+)
 
 
 def test_schema_version_resolves_correctly(tmp_path: Path, base_manifest, tmp_page):
@@ -54,3 +65,111 @@ def test_validate_repo_handles_unknown_schema_version(tmp_path: Path, base_manif
     rc, results = validate_repo(mpath)
     assert rc != 0
     assert any("schema_version" in e.message or "not found" in e.message for e in results.errors)
+
+
+def _pack_schema_with_ref(directory: Path) -> Path:
+    """The packaged schema, with pack entries replaced by a $ref to a sibling file."""
+    schema = json.loads(packaged_schemas()[0].read_text())
+    del schema["$id"]  # a copy, with references relative to its own location
+    pack = schema["$defs"]["packRegistry"]["additionalProperties"]
+    pack["required"].append("description")
+    (directory / "defs.json").write_text(json.dumps({"$defs": {"pack": pack}}))
+    schema["$defs"]["packRegistry"]["additionalProperties"] = {"$ref": "defs.json#/$defs/pack"}
+    path = directory / "manifest.schema.json"
+    path.write_text(json.dumps(schema))
+    return path
+
+
+def test_explicit_schema_path(tmp_path: Path, base_manifest):
+    """A relative $schema is relative to the manifest, and its $refs to its own file."""
+    (tmp_path / "schemas").mkdir()
+    schema = _pack_schema_with_ref(tmp_path / "schemas")
+    mpath = base_manifest(
+        {"$schema": "schemas/manifest.schema.json", "packs": {"p": {"version": "1.0.0"}}}
+    )
+
+    assert resolve_schema(mpath) == schema.resolve()
+    _, results = validate_repo(mpath)
+    assert any("missing required field(s)" in e.message for e in results.errors)
+
+    with pytest.raises(ValueError, match="not found"):
+        resolve_schema({"$schema": "missing.json"}, base_dir=tmp_path)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def schema_server(tmp_path: Path):
+    served = tmp_path / "served"
+    served.mkdir()
+    handler = functools.partial(_QuietHandler, directory=str(served))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield served, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_explicit_schema_url_is_cached(schema_server, monkeypatch):
+    served, url = schema_server
+    _pack_schema_with_ref(served)
+    manifest = {"$schema": f"{url}/manifest.schema.json"}
+
+    # offline unless downloads are asked for
+    monkeypatch.delenv("LABKI_FETCH_SCHEMAS", raising=False)
+    with pytest.raises(ValueError, match="not in the schema cache"):
+        resolve_schema(manifest)
+    monkeypatch.setenv("LABKI_FETCH_SCHEMAS", "1")
+    path = resolve_schema(manifest)
+    assert path.parent == schema_cache_dir()
+
+    # no network access once cached
+    for doc in served.iterdir():
+        doc.unlink()
+    monkeypatch.delenv("LABKI_FETCH_SCHEMAS")
+    assert resolve_schema(manifest) == path
+    with pytest.raises(ValueError, match="--fetch-schemas"):
+        resolve_schema({"$schema": f"{url}/other.schema.json"})
+
+
+def test_fetch_schemas_beforehand(schema_server, base_manifest, monkeypatch):
+    served, url = schema_server
+    _pack_schema_with_ref(served)
+    monkeypatch.delenv("LABKI_FETCH_SCHEMAS", raising=False)
+    mpath = base_manifest(
+        {"$schema": f"{url}/manifest.schema.json", "packs": {"p": {"version": "1.0.0"}}}
+    )
+
+    _, results = validate_repo(mpath)
+    assert any("not in the schema cache" in e.message for e in results.errors)
+    fetch_schema(f"{url}/manifest.schema.json")
+    fetch_schema(f"{url}/defs.json")
+    _, results = validate_repo(mpath)
+    assert any("missing required field(s)" in e.message for e in results.errors)
+
+
+def test_cli_fetch_schemas(schema_server, base_manifest, monkeypatch):
+    served, url = schema_server
+    _pack_schema_with_ref(served)
+    monkeypatch.delenv("LABKI_FETCH_SCHEMAS", raising=False)
+    mpath = base_manifest(
+        {"$schema": f"{url}/manifest.schema.json", "packs": {"p": {"version": "1.0.0"}}}
+    )
+
+    args = ["validate", str(mpath), "--no-cache", "--no-daemon"]
+    result = CliRunner().invoke(cli_main, args)
+    assert "not in the schema cache" in result.output
+    result = CliRunner().invoke(cli_main, [*args, "--fetch-schemas"])
+    assert "missing required field(s)" in result.output
+
+
+def test_packaged_schema_url_resolves_offline(monkeypatch):
+    monkeypatch.delenv("LABKI_FETCH_SCHEMAS", raising=False)
+    [packaged] = packaged_schemas()
+    manifest = {"$schema": json.loads(packaged.read_text())["$id"]}
+    assert resolve_schema(manifest) == packaged
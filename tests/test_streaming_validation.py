@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.validate import validate as cli_validate
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.streaming import iter_validate_repo, validate_repo_streaming
+
+
+def _counter(results) -> Counter:
+    return Counter((i.level, i.message) for i in results)
+
+
+def test_streaming_matches_full_run_on_fixture(fixtures_repo):
+    manifest = fixtures_repo / "manifest.yml"
+    _, full = validate_repo(manifest)
+    rc, streamed = validate_repo_streaming(manifest)
+    assert rc == 0
+    assert _counter(streamed) == _counter(full)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {
+            "packs": {
+                "a": {"version": "1.0.0", "pages": [], "depends_on": ["b"]},
+                "b": {"version": "1.0.0", "pages": [], "depends_on": ["a"]},
+            }
+        },
+        {"packs": {"x": {"version": "v1", "pages": ["Template:Missing"], "depends_on": ["q"]}}},
+        {
+            "pages": {
+                "Template:Bad_Key": {"file": "pages/nope.wiki", "last_updated": "2025-09-22"},
+                "Module:M": {"file": "pages/m.wiki", "last_updated": "2025-09-22T00:00:00Z"},
+            },
+            "packs": {"p": {"version": "1.0.0", "pages": ["Module:M", "Template:Bad_Key"]}},
+        },
+        {"name": "", "extra": True},
+    ],
+)
+def test_streaming_matches_full_run(base_manifest, overrides):
+    mpath = base_manifest(overrides)
+    full_rc, full = validate_repo(mpath)
+    rc, streamed = validate_repo_streaming(mpath)
+    assert rc == full_rc
+    assert _counter(streamed) == _counter(full)
+
+
+def test_streaming_packs_before_pages(tmp_path, tmp_page):
+    page = tmp_page(name="Shared")
+    manifest = {
+        "schema_version": "1.0.0",
+        "name": "reordered",
+        "packs": {
+            "a": {"version": "1.0.0", "pages": ["Template:Shared", "Template:Missing"]},
+            "b": {"version": "1.0.0", "pages": ["Template:Shared"]},
+        },
+        "pages": {"Template:Shared": page},
+    }
+    mpath = tmp_path / "manifest.yml"
+    mpath.write_text(yaml.safe_dump(manifest, sort_keys=False), encoding="utf-8")
+
+    rc, results = validate_repo_streaming(mpath)
+    messages = [i.message for i in results.errors]
+    assert rc == 1
+    assert any("references unknown page title: Template:Missing" in m for m in messages)
+    assert any("included in multiple packs" in m for m in messages)
+
+
+def test_streaming_yields_entries_before_parse_failure(tmp_path):
+    mpath = tmp_path / "manifest.yml"
+    mpath.write_text(
+        "schema_version: 1.0.0\n"
+        "name: broken\n"
+        "pages:\n"
+        "  Template:A:\n"
+        "    file: pages/a.wiki\n"
+        '    last_updated: "2025-09-22T00:00:00Z"\n'
+        "  Template:B: [unclosed\n",
+        encoding="utf-8",
+    )
+    items = list(iter_validate_repo(mpath))
+    assert "Page file not found: pages/a.wiki" in items[0].message
+    assert items[-1].message.startswith("Failed to read manifest")
+
+
+def test_streaming_reports_duplicate_entries(base_manifest):
+    mpath = base_manifest()
+    mpath.write_text(
+        mpath.read_text(encoding="utf-8").replace(
+            "pages: {}",
+            "pages:\n  A:\n    file: pages/a.wiki\n  A:\n    file: pages/b.wiki",
+        ),
+        encoding="utf-8",
+    )
+    _, results = validate_repo_streaming(mpath)
+    assert any("duplicate key: A" in i.message for i in results.errors)
+
+
+def test_cli_validate_stream_json(base_manifest):
+    mpath = base_manifest({"packs": {"p": {"version": "1.0.0", "depends_on": ["q"]}}})
+    result = CliRunner().invoke(cli_validate, [str(mpath), "--stream", "--json"])
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert lines[-1]["summary"]["errors"] == len(lines) - 1
+    assert any("depends_on unknown pack id: q" in line.get("message", "") for line in lines)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation.cache import ValidationCache
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.result_types import ValidationResults
+
+
+def _items(results) -> list[tuple[str, str]]:
+    return [(i.level, i.message) for i in results]
+
+
+def _manifest(base_manifest, tmp_page, n: int = 5) -> Path:
+    pages = {f"Template:T{i}": tmp_page(name=f"T{i}") for i in range(n)}
+    pages["Template:Gone"] = {"file": "pages/gone.wiki", "last_updated": "2025-09-22T00:00:00Z"}
+    pages["Template:Bad"] = {"file": "pages/Template_T0.wiki", "last_updated": "yesterday"}
+    return base_manifest(
+        {
+            "pages": pages,
+            "packs": {
+                "p": {"version": "1.0.0", "pages": list(pages), "depends_on": ["q"]},
+                "r": {"version": "x", "pages": ["Template:T1"]},
+            },
+        }
+    )
+
+
+def _run(mpath: Path, tmp_path: Path) -> tuple[int, ValidationResults, ValidationCache]:
+    cache = ValidationCache.for_manifest(mpath, tmp_path / "cache")
+    rc, results = validate_repo(mpath, cache=cache)
+    cache.save()
+    return rc, results, cache
+
+
+def test_cached_results_match_uncached(base_manifest, tmp_page, tmp_path):
+    mpath = _manifest(base_manifest, tmp_page)
+    expected_rc, expected = validate_repo(mpath)
+    assert expected.has_errors
+
+    for _ in range(2):
+        rc, results, _ = _run(mpath, tmp_path)
+        assert rc == expected_rc
+        assert _items(results) == _items(expected)
+
+
+def test_second_run_is_served_from_cache(base_manifest, tmp_page, tmp_path):
+    mpath = _manifest(base_manifest, tmp_page)
+    _, _, first = _run(mpath, tmp_path)
+    assert first.hits == 0
+
+    _, _, second = _run(mpath, tmp_path)
+    assert second.misses == 0
+    assert second.hits == first.misses
+
+
+def test_only_changed_entries_are_rechecked(base_manifest, tmp_page, tmp_path):
+    mpath = _manifest(base_manifest, tmp_page)
+    _run(mpath, tmp_path)
+
+    data = yaml.safe_load(mpath.read_text())
+    data["pages"]["Template:T3"]["last_updated"] = "not a date"
+    mpath.write_text(yaml.safe_dump(data, sort_keys=False))
+
+    rc, results, cache = _run(mpath, tmp_path)
+    # the page's schema segment and its page file and checksum checks
+    assert cache.misses == 3
+    assert _items(results) == _items(validate_repo(mpath)[1])
+
+
+def test_touched_page_file_is_rechecked(base_manifest, tmp_page, tmp_path):
+    mpath = _manifest(base_manifest, tmp_page)
+    _run(mpath, tmp_path)
+
+    (mpath.parent / "pages" / "templates" / "template_t2.wiki").unlink()
+
+    rc, results, cache = _run(mpath, tmp_path)
+    # the page file and checksum checks of that page, and the orphan check (its directory changed)
+    assert cache.misses == 3
+    assert "Page file not found: pages/templates/template_t2.wiki (for Template:T2)" in [
+        i.message for i in results.errors
+    ]
+
+    # a new file changes its directory, so only the orphan check re-runs
+    (mpath.parent / "pages" / "stray.wiki").write_text("x")
+    os.utime(mpath.parent / "pages", ns=(0, 0))
+    rc, results, cache = _run(mpath, tmp_path)
+    assert cache.misses == 1
+    assert any("stray.wiki" in i.message for i in results.warnings)
+
+
+def test_cache_is_bounded_lru(tmp_path):
+    cache = ValidationCache(tmp_path / "c.json", max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.memoize("ns", name, lambda name=name: name)
+    cache.save()
+
+    reloaded = ValidationCache.load(tmp_path / "c.json", max_entries=2)
+    assert len(reloaded) == 2
+    reloaded.memoize("ns", "b", lambda: "recomputed")
+    reloaded.memoize("ns", "d", lambda: "d")
+    reloaded.save()
+
+    final = ValidationCache.load(tmp_path / "c.json", max_entries=2)
+    assert final.memoize("ns", "b", lambda: "recomputed") == "b"
+    assert final.memoize("ns", "d", lambda: "recomputed") == "d"
+    assert final.memoize("ns", "c", lambda: "recomputed") == "recomputed"
+
+
+def test_corrupt_cache_file_is_ignored(base_manifest, tmp_page, tmp_path):
+    mpath = _manifest(base_manifest, tmp_page)
+    cache = ValidationCache.for_manifest(mpath, tmp_path / "cache")
+    cache.path.parent.mkdir(parents=True)
+    cache.path.write_text("{not json")
+
+    rc, results, _ = _run(mpath, tmp_path)
+    assert _items(results) == _items(validate_repo(mpath)[1])
+
+
+def test_cli_cache_options(base_manifest, tmp_page, tmp_path):
+    mpath = _manifest(base_manifest, tmp_page)
+    runner = CliRunner()
+    cache_dir = tmp_path / "cli-cache"
+
+    result = runner.invoke(
+        cli_main, ["validate", str(mpath), "--no-cache", "--cache-dir", str(cache_dir)]
+    )
+    assert result.exit_code == 1
+    assert not cache_dir.exists()
+
+    for _ in range(2):
+        cached = runner.invoke(cli_main, ["validate", str(mpath), "--cache-dir", str(cache_dir)])
+        assert cached.exit_code == 1
+        assert cached.output == result.output
+    assert len(list(cache_dir.glob("validate-*.json"))) == 1
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from labki_packs_tools.cli.main import main as cli_main
+from labki_packs_tools.validation import watch as watch_module
+from labki_packs_tools.validation.repo_validator import validate_repo
+from labki_packs_tools.validation.result_types import ValidationResults
+from labki_packs_tools.validation.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    watch,
+)
+
+STAMP = "2025-09-22T00:00:00Z"
+
+
+def _page(tmp_path: Path, name: str) -> dict:
+    path = tmp_path / "pages" / "templates" / f"template_{name}.wiki"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"== {name} ==\n", encoding="utf-8")
+    return {"file": path.relative_to(tmp_path).as_posix(), "last_updated": STAMP}
+
+
+def _key(results: ValidationResults) -> list[tuple]:
+    return sorted((i.level, i.message, i.page, i.pack, i.file) for i in results)
+
+
+def _rewrite(mpath: Path, edit: callable) -> None:
+    data = yaml.safe_load(mpath.read_text())
+    edit(data)
+    mpath.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+@pytest.fixture
+def repo(base_manifest, tmp_path) -> Path:
+    return base_manifest(
+        {
+            "pages": {f"Template:{n}": _page(tmp_path, n) for n in ("a", "b", "c")},
+            "packs": {
+                "base": {"version": "1.0.0", "pages": ["Template:a", "Template:b"]},
+                "extra": {"version": "1.0.0", "pages": ["Template:c"], "depends_on": ["base"]},
+            },
+        }
+    )
+
+
+def test_updates_match_full_runs(repo, tmp_path):
+    session = WatchSession(repo)
+    assert _key(session.results) == _key(validate_repo(repo)[1])
+
+    def check(changed: set[str]) -> None:
+        assert session.update(changed)
+        assert _key(session.results) == _key(validate_repo(repo)[1])
+
+    (tmp_path / "pages/templates/template_a.wiki").unlink()
+    check({"pages/templates/template_a.wiki"})
+    (tmp_path / "pages/stray.wiki").write_text("x")
+    check({"pages/stray.wiki"})
+    (tmp_path / "pages/new").mkdir()
+    (tmp_path / "pages/new/one.wiki").write_text("x")
+    check({"pages/new"})
+    (tmp_path / "pages/new/one.wiki").unlink()
+    (tmp_path / "pages/new").rmdir()
+    check({"pages/new", "pages/new/one.wiki"})
+
+    _rewrite(repo, lambda m: m["pages"].pop("Template:b"))
+    check({"manifest.yml"})
+    _rewrite(repo, lambda m: m["packs"]["base"].update(depends_on=["missing"]))
+    check({"manifest.yml"})
+    _rewrite(repo, lambda m: m["packs"]["base"].update(depends_on=["extra"]))
+    check({"manifest.yml"})
+    _rewrite(repo, lambda m: m.update(name="Renamed"))
+    check({"manifest.yml"})
+
+    repo.write_text("pages: [unclosed\n")
+    assert session.update({"manifest.yml"})
+    assert any("Failed to read manifest" in i.message for i in session.results)
+    repo.write_text(yaml.safe_dump({"schema_version": "1.0.0", "name": "x"}))
+    check({"manifest.yml"})
+
+    assert not session.update({"README.md"})
+
+
+def test_page_file_change_only_reruns_file_validators(repo, tmp_path, monkeypatch):
+    session = WatchSession(repo)
+    ran = []
+
+    def spy(validator_cls: type, context: dict) -> list:
+        ran.append((validator_cls.__name__, context["scope"]))
+        return real(validator_cls, context)
+
+    real = watch_module.run_validator
+    monkeypatch.setattr(watch_module, "run_validator", spy)
+    (tmp_path / "pages/templates/template_c.wiki").unlink()
+    session.update({"pages/templates/template_c.wiki"})
+
+    assert sorted(name for name, _ in ran) == [
+        "OrphanPageValidator",
+        "PageChecksumValidator",
+        "PageFileValidator",
+        "PageReferenceValidator",
+    ]
+    scope = ran[0][1]
+    assert scope.pages == {"Template:c"}
+    assert scope.files == {"pages/templates/template_c.wiki"}
+    assert any("Page file not found" in i.message for i in session.results)
+
+
+def test_polling_watcher_reports_changes(repo, tmp_path):
+    session = WatchSession(repo)
+    watcher = PollingWatcher(session.snapshot, session.watched_files, interval=0.01)
+    assert watcher.wait(timeout=0.05) == set()
+
+    (tmp_path / "pages/templates/template_new.wiki").write_text("x")
+    repo.write_text(repo.read_text() + "\n# edited\n")
+    changed = watcher.wait(timeout=1)
+    assert changed == {"pages/templates/template_new.wiki", "manifest.yml"}
+
+
+def test_inotify_watcher_reports_changes(repo, tmp_path):
+    session = WatchSession(repo)
+    try:
+        watcher = InotifyWatcher(session.snapshot, session.watched_files)
+    except OSError:
+        pytest.skip("inotify not available")
+    try:
+        (tmp_path / "pages/templates/template_a.wiki").write_text("changed")
+        assert watcher.wait(timeout=2) == {"pages/templates/template_a.wiki"}
+
+        (tmp_path / "pages/new").mkdir()
+        assert watcher.wait(timeout=2) == {"pages/new"}
+        session.update({"pages/new"})
+        watcher.sync(session.snapshot)
+        (tmp_path / "pages/new/x.wiki").write_text("x")
+        assert watcher.wait(timeout=2) == {"pages/new/x.wiki"}
+
+        repo.write_text(repo.read_text())
+        assert "manifest.yml" in watcher.wait(timeout=2)
+    finally:
+        watcher.close()
+
+
+def test_watch_redraws_after_edits(repo, tmp_path):
+    seen: list[ValidationResults] = []
+    edited = threading.Event()
+
+    def on_results(results: ValidationResults, elapsed: float) -> None:
+        seen.append(results)
+        if len(seen) == 1:
+            (tmp_path / "pages/templates/template_b.wiki").unlink()
+            edited.set()
+
+    final = watch(repo, on_results=on_results, poll=True, interval=0.01, stop=lambda: len(seen) > 1)
+    assert edited.is_set()
+    assert not seen[0].has_errors
+    assert any("template_b.wiki" in i.message for i in final.errors)
+
+
+def test_cli_watch_rejects_stream(repo):
+    result = CliRunner().invoke(cli_main, ["validate", str(repo), "--watch", "--stream"])
+    assert result.exit_code == 2
+    assert "--watch cannot be combined" in result.output